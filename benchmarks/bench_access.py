@@ -0,0 +1,37 @@
+"""Reads typed values from a config in a loop, as a flow would
+
+Usage: python -m benchmarks.bench_access [n_reads]
+"""
+
+import sys
+
+from src.model.config import Config
+
+from .common import best_of, make_schema, report
+
+
+def parse_each_time(config: Config, names: list) -> None:
+    for name in names:
+        item = config.get_item(name)
+        int(item.value)
+
+
+def main(n_reads: int) -> None:
+    config = Config("bench", "Benchmark config", "", schema=make_schema(1_000))
+    config.generate_items()
+    ints = [item.schema_item.name for item in config.items if item.value == "10"]
+    names = [ints[i % len(ints)] for i in range(n_reads)]
+
+    print(f"{n_reads} reads of Integer items")
+    baseline = best_of(lambda: parse_each_time(config, names))
+    report("get_item + int()", baseline)
+    report("config[name]", best_of(lambda: [config[name] for name in names]), baseline)
+    report(
+        "config.get_int",
+        best_of(lambda: [config.get_int(name) for name in names]),
+        baseline,
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
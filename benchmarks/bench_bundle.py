@@ -0,0 +1,60 @@
+"""Compares loading a config with loading its compiled bundle
+
+Usage: python -m benchmarks.bench_bundle [n_items]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+import src.model.bundle as bundle
+import src.model.config as config_factory
+import src.runtime.bundle as bundle_reader
+from src.model.config import Config
+
+from .common import best_of, make_schema, report
+
+
+def import_time(module: str) -> float:
+    """Seconds to start a python process that imports `module`"""
+    return best_of(
+        lambda: subprocess.run([sys.executable, "-c", f"import {module}"], check=True)
+    )
+
+
+def main(n_items: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        schema_fn = os.path.join(tmp, "schema.json")
+        config_fn = os.path.join(tmp, "config.json")
+        delta_fn = os.path.join(tmp, "delta.json")
+        bundle_fn = os.path.join(tmp, "config.bundle")
+
+        assert make_schema(n_items).save(schema_fn)
+        config = Config("bench", "Benchmark config", schema_fn)
+        config.generate_items()
+        assert config.save(config_fn)
+        assert config.save_delta(delta_fn)
+        bundle.save(config, bundle_fn)
+
+        print(f"{n_items} items")
+        baseline = best_of(lambda: config_factory.load(config_fn))
+        report("load config", baseline)
+        report(
+            "load delta config",
+            best_of(lambda: config_factory.load(delta_fn)),
+            baseline,
+        )
+        report("load bundle", best_of(lambda: bundle_reader.load(bundle_fn)), baseline)
+
+        baseline = import_time("src.model.config")
+        report("start + import src.model.config", baseline)
+        report(
+            "start + import src.runtime.bundle",
+            import_time("src.runtime.bundle"),
+            baseline,
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000)
@@ -0,0 +1,48 @@
+"""Loads many delta configs that share one schema, with and without the cache
+
+Usage: python -m benchmarks.bench_cache [n_configs] [n_items]
+"""
+
+import os
+import sys
+import tempfile
+
+import src.model.cache as schema_cache
+import src.model.config as config_factory
+from src.model.config import Config
+
+from .common import best_of, make_schema, report
+
+
+def load_all(filename: str, n_configs: int, cached: bool) -> None:
+    for _ in range(n_configs):
+        if not cached:
+            schema_cache.clear()
+        config_factory.load(filename)
+
+
+def main(n_configs: int, n_items: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        schema_fn = os.path.join(tmp, "schema.json")
+        delta_fn = os.path.join(tmp, "delta.json")
+
+        assert make_schema(n_items).save(schema_fn)
+        config = Config("bench", "Benchmark config", schema_fn)
+        config.generate_items()
+        assert config.save_delta(delta_fn)
+
+        print(f"{n_configs} configs sharing a schema of {n_items} items")
+        baseline = best_of(lambda: load_all(delta_fn, n_configs, False), repeat=1)
+        report("parse schema per config", baseline)
+        schema_cache.clear()
+        report(
+            "schema cache",
+            best_of(lambda: load_all(delta_fn, n_configs, True), repeat=1),
+            baseline,
+        )
+        print(schema_cache.info())
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*(args + [5_000, 1_000][len(args) :]))
@@ -0,0 +1,44 @@
+"""Validates a tree of configs with an increasing number of worker processes
+
+Usage: python -m benchmarks.bench_cli [n_configs] [n_items]
+"""
+
+import io
+import os
+import sys
+import tempfile
+
+import src.cli as cli
+from src.model.config import Config
+
+from .common import best_of, make_schema, report
+
+N_SCHEMAS = 4
+
+
+def main(n_configs: int, n_items: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(N_SCHEMAS):
+            schema_fn = os.path.join(tmp, f"schema{i}.json")
+            assert make_schema(n_items).save(schema_fn)
+            config = Config("bench", "Benchmark config", schema_fn)
+            config.generate_items()
+            for j in range(n_configs // N_SCHEMAS):
+                assert config.save_delta(os.path.join(tmp, f"config{i}_{j}.json"))
+
+        print(f"{n_configs} configs of {N_SCHEMAS} schemas with {n_items} items")
+        baseline = None
+        jobs = 1
+        while jobs <= (os.cpu_count() or 1):
+            seconds = best_of(
+                lambda: cli.main(["validate", tmp, "-j", str(jobs)], io.StringIO()),
+                repeat=1,
+            )
+            report(f"{jobs} jobs", seconds, baseline)
+            baseline = baseline or seconds
+            jobs *= 2
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*(args + [1_000, 1_000][len(args) :]))
@@ -0,0 +1,54 @@
+"""Compares the compiled codec with the JSONWizard path for load and save
+
+Usage: python -m benchmarks.bench_codec [n_items]
+"""
+
+import json
+import sys
+
+import src.model.codec as codec
+from src.model.config import Config
+from src.model.schema import Schema
+
+from .common import best_of, make_schema, report
+
+
+def main(n_items: int) -> None:
+    schema = make_schema(n_items)
+    text = json.dumps(schema.to_dict(), indent=4)
+    assert codec.dumps(schema) == text
+
+    config = Config("bench", "Benchmark config", "", schema=schema)
+    config.generate_items()
+    config_text = json.dumps(config.to_dict(), indent=4)
+    assert codec.dumps(config) == config_text
+
+    print(f"{n_items} items, {len(text) / 1e6:.1f} MB schema")
+
+    baseline = best_of(lambda: Schema.from_json(text))
+    report("schema load (JSONWizard)", baseline)
+    report(
+        "schema load (codec)",
+        best_of(lambda: codec.decode(Schema, json.loads(text))),
+        baseline,
+    )
+
+    baseline = best_of(lambda: json.dumps(schema.to_dict(), indent=4))
+    report("schema save (JSONWizard)", baseline)
+    report("schema save (codec)", best_of(lambda: codec.dumps(schema)), baseline)
+
+    baseline = best_of(lambda: Config.from_json(config_text))
+    report("config load (JSONWizard)", baseline)
+    report(
+        "config load (codec)",
+        best_of(lambda: codec.decode(Config, json.loads(config_text))),
+        baseline,
+    )
+
+    baseline = best_of(lambda: json.dumps(config.to_dict(), indent=4))
+    report("config save (JSONWizard)", baseline)
+    report("config save (codec)", best_of(lambda: codec.dumps(config)), baseline)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 40_000)
@@ -0,0 +1,43 @@
+"""Compares Schema.copy snapshots with a full deepcopy
+
+Usage: python -m benchmarks.bench_copy [n_items ...]
+"""
+
+import sys
+import tracemalloc
+from copy import deepcopy
+
+from src.model.schema import Schema
+
+from .common import best_of, make_schema, report
+
+
+def copy_and_edit(schema: Schema) -> Schema:
+    snapshot = schema.copy()
+    snapshot.update_item(snapshot.items[len(snapshot.items) // 2], desc="edited")
+    return snapshot
+
+
+def retained(fn, schema: Schema) -> float:
+    tracemalloc.start()
+    snapshot = fn(schema)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del snapshot
+    return size / 1e6
+
+
+def main(sizes: list[int]) -> None:
+    for n_items in sizes:
+        schema = make_schema(n_items)
+        print(f"{n_items} items")
+        baseline = best_of(lambda: deepcopy(schema))
+        report("deepcopy", baseline)
+        report("copy", best_of(lambda: schema.copy()), baseline)
+        report("copy + edit one item", best_of(lambda: copy_and_edit(schema)), baseline)
+        print(f"{'memory deepcopy':<40} {retained(deepcopy, schema):10.2f} MB")
+        print(f"{'memory copy + edit':<40} {retained(copy_and_edit, schema):10.2f} MB")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 100_000])
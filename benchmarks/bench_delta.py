@@ -0,0 +1,42 @@
+"""Compares file size and load time of the full and delta config formats
+
+Usage: python -m benchmarks.bench_delta [n_items]
+"""
+
+import os
+import sys
+import tempfile
+
+import src.model.config as config_factory
+from src.model.config import Config
+
+from .common import best_of, make_schema, report
+
+
+def main(n_items: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        schema_fn = os.path.join(tmp, "schema.json")
+        full_fn = os.path.join(tmp, "full.json")
+        delta_fn = os.path.join(tmp, "delta.json")
+
+        assert make_schema(n_items).save(schema_fn)
+        config = Config("bench", "Benchmark config", schema_fn)
+        config.generate_items()
+        for item in config.items[:3]:
+            item.value = "changed"
+        assert config.save(full_fn)
+        assert config.save_delta(delta_fn)
+
+        full_size = os.path.getsize(full_fn)
+        delta_size = os.path.getsize(delta_fn)
+        print(f"{n_items} items, 3 changed values")
+        print(f"{'full size':<40} {full_size:10d} B")
+        print(f"{'delta size':<40} {delta_size:10d} B  ({full_size / delta_size:.0f}x)")
+
+        baseline = best_of(lambda: config_factory.load(full_fn))
+        report("full load", baseline)
+        report("delta load", best_of(lambda: config_factory.load(delta_fn)), baseline)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
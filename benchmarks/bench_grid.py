@@ -0,0 +1,136 @@
+"""Upper bound of the latency of a cell edit in the schema and config grids
+
+Each edit is timed from the JSON body of the callback request to the dirty check
+of the save button, with the rowData round trip the editors used to do and with
+the cellValueChanged payload they use now. The worst of `EDITS` edits is the
+upper bound.
+
+Usage: python -m benchmarks.bench_grid [n_rows]
+"""
+
+import json
+import statistics
+import sys
+import time
+from typing import Callable, List
+
+import src.components.config_editor.item_editor as config_item_editor
+import src.components.schema_editor.item_editor as schema_item_editor
+from src.app_state import Root
+from src.model.config import Config, ConfigItem
+from src.model.schema import SchemaItem
+
+from .common import make_schema
+
+EDITS = 20
+
+
+def rows_update(rows: List[dict]) -> None:
+    """The schema item editor before, rebuilding every item from rowData"""
+    Root.next_schema.items.clear()
+    for row in rows:
+        Root.next_schema.items.append(SchemaItem.from_dict(row))
+
+
+def config_rows_update(rows: List[dict]) -> None:
+    """The config item editor before, setting every value from rowData"""
+    for row in rows:
+        Root.next_config.set_value(row["name"], row["value"])
+
+
+def latencies(edit: Callable[[int], bytes], handle: Callable[[bytes], None]) -> None:
+    times = []
+    for i in range(EDITS):
+        body = edit(i)
+        start = time.perf_counter()
+        handle(body)
+        times.append(time.perf_counter() - start)
+    print(
+        f"{'':<4}{len(body) / 1e3:10.1f} kB request"
+        f"  median {statistics.median(times) * 1000:8.2f} ms"
+        f"  max {max(times) * 1000:8.2f} ms"
+    )
+
+
+def schema_edits(n_rows: int) -> None:
+    schema = make_schema(n_rows)
+    schema.build_indexes()
+    schema.build_hashes()
+    rows = [item.to_dict() for item in schema.items]
+
+    def change(i: int) -> dict:
+        row = rows[(i * 7919) % n_rows]
+        row["desc"] = f"edit {i}"
+        return {"colId": "desc", "oldValue": "", "data": row}
+
+    def check() -> None:
+        Root.schema.tree_hash() == Root.next_schema.tree_hash()
+
+    def handle_rows(body: bytes) -> None:
+        data = json.loads(body)
+        rows_update(data["rowData"])
+        check()
+
+    def handle_changes(body: bytes) -> None:
+        data = json.loads(body)
+        schema_item_editor.update(data["cellValueChanged"])
+        check()
+
+    print(f"schema item grid, {n_rows} rows")
+    for label, handle, payload in (
+        ("rowData", handle_rows, lambda i: {"rowData": rows, "edit": change(i)}),
+        (
+            "cellValueChanged",
+            handle_changes,
+            lambda i: {"cellValueChanged": [change(i)]},
+        ),
+    ):
+        Root.schema = schema
+        Root.next_schema = schema.copy()
+        print(label)
+        latencies(lambda i: json.dumps(payload(i)).encode(), handle)
+
+
+def config_edits(n_rows: int) -> None:
+    schema = make_schema(n_rows)
+    config = Config("bench", "Benchmark config", "")
+    config.items = [ConfigItem(item, item.default) for item in schema.items]
+    config.build_indexes()
+    config.build_hashes()
+    rows = [item.to_dict() for item in config.items]
+
+    def change(i: int) -> dict:
+        row = rows[(i * 7919) % n_rows]
+        row["value"] = f"{i}"
+        return {"colId": "value", "oldValue": "", "data": row}
+
+    def handle_rows(body: bytes) -> None:
+        config_rows_update(json.loads(body)["rowData"])
+        Root.config.tree_hash() == Root.next_config.tree_hash()
+
+    def handle_changes(body: bytes) -> None:
+        config_item_editor.update(json.loads(body)["cellValueChanged"])
+        Root.config.tree_hash() == Root.next_config.tree_hash()
+
+    print(f"config item grid, {n_rows} rows")
+    for label, handle, payload in (
+        ("rowData", handle_rows, lambda i: {"rowData": rows, "edit": change(i)}),
+        (
+            "cellValueChanged",
+            handle_changes,
+            lambda i: {"cellValueChanged": [change(i)]},
+        ),
+    ):
+        Root.config = config
+        Root.next_config = config.copy()
+        print(label)
+        latencies(lambda i: json.dumps(payload(i)).encode(), handle)
+
+
+def main(n_rows: int) -> None:
+    schema_edits(n_rows)
+    config_edits(n_rows)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
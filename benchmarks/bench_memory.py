@@ -0,0 +1,75 @@
+"""Measures the memory used by schema items: as dict records, the unslotted
+dataclasses SchemaItem used to be, as slotted records and as an ItemTable
+
+Usage: python -m benchmarks.bench_memory [n_items ...]
+"""
+
+import gc
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, List
+
+from src.model.schema import SchemaItem, SchemaItemType
+from src.model.table import ItemTable
+
+from .common import TYPES
+
+
+@dataclass
+class DictItem:
+    """A SchemaItem before records were slotted, with a __dict__ per item"""
+
+    name: str
+    desc: str
+    group: str
+    default: Any
+    type: SchemaItemType
+    options: str = ""
+    errors: List[Any] = field(default_factory=list)
+
+
+def iter_items(
+    n_items: int, n_groups: int = 100, record: Callable[..., Any] = SchemaItem
+) -> Iterator[Any]:
+    """Yields freshly built items, as if they were decoded from a file"""
+    for i in range(n_items):
+        item_type, default, options = TYPES[i % len(TYPES)]
+        yield record(
+            f"item_{i}",
+            f"Description of item {i}",
+            f"group_{i % n_groups}",
+            "".join(default),
+            item_type,
+            "".join(options),
+        )
+
+
+def retained(build: Callable[[], Any]) -> float:
+    """Returns the memory held by the result of `build`, in MB"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size / 1e6
+
+
+def main(sizes: list[int]) -> None:
+    for n_items in sizes:
+        print(f"{n_items} items")
+        dict_records = retained(lambda: list(iter_items(n_items, record=DictItem)))
+        records = retained(lambda: list(iter_items(n_items)))
+        table = retained(lambda: ItemTable(iter_items(n_items)))
+        for label, size in [
+            ("dict records", dict_records),
+            ("slotted records", records),
+            ("table", table),
+        ]:
+            per_item = size * 1e6 / n_items
+            print(f"{label:<40} {size:10.1f} MB  ({per_item:5.0f} bytes/item)")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000])
@@ -0,0 +1,59 @@
+"""Compares dirty checks by equality with comparing tree hashes
+
+Usage: python -m benchmarks.bench_merkle [n_items]
+"""
+
+import sys
+
+import src.model.schema as schema_factory
+
+from .common import best_of, make_schema, report
+
+# operations per timed run, for the fast ones
+OPS = 1000
+
+
+def main(n_items: int) -> None:
+    schema = make_schema(n_items)
+    print(f"{n_items} items")
+    report("build hashes", best_of(lambda: schema.copy().build_hashes()))
+    schema.build_hashes()
+
+    # an item edited and changed back: the snapshot no longer shares the item
+    # list, but saves the same file
+    snapshot = schema.copy()
+    middle = n_items // 2
+    item = snapshot.update_item(snapshot.items[middle], desc="edited")
+    snapshot.update_item(item, desc=schema.items[middle].desc)
+
+    for label, other in (
+        ("edited snapshot", snapshot),
+        ("same file loaded twice", schema_factory.from_dict(schema.to_dict())),
+    ):
+        other.build_hashes()
+        baseline = best_of(lambda: schema == other)
+        print(label)
+        report("needs_save, equality", baseline)
+        seconds = best_of(
+            lambda: [schema.tree_hash() == other.tree_hash() for _ in range(OPS)]
+        )
+        print(
+            f"{'needs_save, tree hash':<40} {seconds / OPS * 1e6:10.1f} us"
+            f"  ({baseline * OPS / seconds:5.0f}x)"
+        )
+
+    def edit() -> None:
+        for i in range(OPS):
+            item = snapshot.items[middle]
+            snapshot.update_item(item, desc=f"edit {i}")
+            snapshot.tree_hash()
+
+    seconds = best_of(edit) / OPS
+    print(f"{'edit one item + tree hash':<40} {seconds * 1e6:10.1f} us")
+    seconds = best_of(lambda: [snapshot.changed_items(schema) for _ in range(OPS)])
+    print(f"{'changed items':<40} {seconds / OPS * 1e6:10.1f} us")
+    assert snapshot.changed_items(schema) == [middle]
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,56 @@
+"""Measures diffing and patching large schemas
+
+Usage: python -m benchmarks.bench_patch [n_items]
+"""
+
+import json
+import sys
+
+import src.model.patch as patch_factory
+import src.model.schema as schema_factory
+from src.model.schema import Schema
+
+from .common import best_of, make_schema, report
+
+EDITS = 100
+
+
+def edit(schema: Schema) -> Schema:
+    snapshot = schema.copy()
+    step = len(schema.items) // EDITS
+    for i in range(0, len(schema.items), step):
+        snapshot.update_item(snapshot.items[i], desc="edited")
+    snapshot.update_item(snapshot.items[1], name="renamed")
+    snapshot.remove_items([snapshot.items[2].name])
+    return snapshot
+
+
+def main(n_items: int) -> None:
+    schema = make_schema(n_items)
+    # like the schemas of the schema cache
+    schema.build_indexes()
+    edited = edit(schema)
+    # the same documents, loaded separately: no record is shared
+    loaded = schema_factory.from_dict(schema.to_dict())
+    loaded_edited = schema_factory.from_dict(edited.to_dict())
+    print(f"{n_items} items, {EDITS} edits")
+
+    report("diff of snapshots", best_of(lambda: patch_factory.diff(schema, edited)))
+    report(
+        "diff of separate loads",
+        best_of(lambda: patch_factory.diff(loaded, loaded_edited)),
+    )
+
+    patch = patch_factory.diff(schema, edited)
+    text = json.dumps(patch.to_dict())
+    print(f"{'':<40} {len(patch.items)} changes, {len(text) / 1e3:.1f} kB patch")
+    print(f"{'':<40} {len(schema.to_json()) / 1e6:.1f} MB schema")
+    report("apply", best_of(lambda: patch_factory.apply(schema, patch)))
+    report(
+        "apply, strict",
+        best_of(lambda: patch_factory.apply(schema, patch, strict=True)),
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
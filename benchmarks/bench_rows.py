@@ -0,0 +1,84 @@
+"""First paint and scrolling of the schema item grid, client side or infinite
+
+The client side grid ships every row in the layout. The infinite grid ships
+none, then answers a getRowsRequest per block of rows. Block requests are timed
+cold, right after an edit changed the version of the records, and warm, for the
+next block of the same query.
+
+Usage: python -m benchmarks.bench_rows [n_rows]
+"""
+
+import json
+import sys
+import time
+
+import src.components.schema_editor.item_editor as item_editor
+from src.app_state import Root
+from src.helpers.grid import BLOCK_SIZE
+
+from .common import best_of, make_schema, report
+
+QUERIES = {
+    "unsorted": {},
+    "sorted by name": {"sortModel": [{"colId": "name", "sort": "desc"}]},
+    "filtered, startsWith": {
+        "filterModel": {
+            "name": {"filterType": "text", "type": "startsWith", "filter": "item_4"}
+        }
+    },
+    "filtered, contains": {
+        "filterModel": {
+            "desc": {"filterType": "text", "type": "contains", "filter": "99"}
+        }
+    },
+    "sorted by 2 columns": {
+        "sortModel": [
+            {"colId": "group", "sort": "asc"},
+            {"colId": "name", "sort": "desc"},
+        ]
+    },
+}
+
+
+def main(n_rows: int) -> None:
+    schema = make_schema(n_rows)
+    schema.build_indexes()
+    schema.build_hashes()
+    Root.schema = schema
+    Root.next_schema = schema.copy()
+
+    print(f"schema item grid, {n_rows} rows")
+    rows = [item.to_dict() for item in schema.items]
+    full = best_of(lambda: json.dumps([item.to_dict() for item in schema.items]))
+    print(f"{'client side rowData':<40} {len(json.dumps(rows)) / 1e3:10.1f} kB")
+    report("client side rowData", full)
+
+    first = item_editor.get_rows({"startRow": 0, "endRow": BLOCK_SIZE})
+    print(f"{'infinite first block':<40} {len(json.dumps(first)) / 1e3:10.1f} kB")
+    report(
+        "infinite first block",
+        best_of(
+            lambda: json.dumps(
+                item_editor.get_rows({"startRow": 0, "endRow": BLOCK_SIZE})
+            )
+        ),
+        full,
+    )
+
+    for label, query in QUERIES.items():
+        # a new version of the records, as after an edit
+        Root.next_schema.update_item(Root.next_schema.items[0], desc=label)
+        start = time.perf_counter()
+        item_editor.get_rows(dict(query, startRow=0, endRow=BLOCK_SIZE))
+        cold = time.perf_counter() - start
+        warm = best_of(
+            lambda: item_editor.get_rows(
+                dict(query, startRow=BLOCK_SIZE, endRow=2 * BLOCK_SIZE)
+            )
+        )
+        report(f"{label}, cold", cold)
+        report(f"{label}, next block", warm)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
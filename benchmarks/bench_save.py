@@ -0,0 +1,45 @@
+"""Compares writing a schema in place with the atomic, skip-if-unchanged save
+
+Usage: python -m benchmarks.bench_save [n_items]
+"""
+
+import os
+import sys
+import tempfile
+
+import src.helpers.files as files
+import src.model.codec as codec
+
+from .common import best_of, make_schema, report
+
+
+def main(n_items: int) -> None:
+    schema = make_schema(n_items)
+    text = codec.dumps(schema)
+    with tempfile.TemporaryDirectory() as tmp:
+        fn = os.path.join(tmp, "schema.json")
+
+        def write_in_place() -> None:
+            with open(fn, "w") as f:
+                f.write(text)
+
+        def write_changed() -> None:
+            files.write_atomic(fn, text.encode())
+
+        print(f"{n_items} items, {len(text) / 1e6:.1f} MB, writing only")
+        baseline = best_of(write_in_place)
+        report("write in place", baseline)
+        report("write atomically, with fsync", best_of(write_changed), baseline)
+        files.save_text(fn, text)
+        report("save unchanged", best_of(lambda: files.save_text(fn, text)), baseline)
+
+        report(
+            "schema.save, changed", best_of(lambda: (os.remove(fn), schema.save(fn)))
+        )
+        stats = schema.last_save
+        print(f"{'':<40} {stats.bytes_written} bytes, {stats.elapsed * 1000:.1f} ms")
+        report("schema.save, unchanged", best_of(lambda: schema.save(fn)))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,188 @@
+"""Load test of the editor: the config editor page of a large config
+
+Starts the editor in its own process, as `python main.py` runs it (debug
+server) and as `python main.py --production` does, and has `n_clients` threads
+open the config editor page of a config with `n_items` items for `seconds`,
+each as a new browser session. Opening the page is the requests a browser
+sends for it:
+
+- the page itself, the index HTML
+- the pages callback, which renders the editor layout
+- the first block of rows of the item grid
+
+Prints the latency percentiles of each request and of the whole page, and the
+bytes received per page, with `Accept-Encoding: gzip, br` like a browser.
+
+Usage: python -m benchmarks.bench_serve [n_items] [n_clients] [seconds]
+"""
+
+import http.client
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+from src.model.config import Config
+
+from .bench_service import HOST, free_port, wait_for_server
+from .common import make_schema
+
+# in the working directory, where the editor looks for the files of its URLs
+CONFIG_FN = "delete_me_bench_serve.json"
+
+SERVERS = {
+    "python main.py": (
+        "import main, sys; "
+        "main.create_app().run(debug=True, use_reloader=False, port=int(sys.argv[1]))"
+    ),
+    "python main.py --production": (
+        "import main, sys; "
+        "main.main(['--production', '--port', sys.argv[1], '--preload', sys.argv[2]])"
+    ),
+}
+
+
+def callback(output: str, outputs: Any, inputs: List[Dict[str, Any]]) -> bytes:
+    body = {
+        "output": output,
+        "outputs": outputs,
+        "inputs": inputs,
+        "changedPropIds": [f"{inputs[0]['id']}.{inputs[0]['property']}"],
+        "state": [],
+    }
+    return json.dumps(body).encode()
+
+
+PAGE_CALLBACK = callback(
+    ".._pages_content.children..._pages_store.data..",
+    [
+        {"id": "_pages_content", "property": "children"},
+        {"id": "_pages_store", "property": "data"},
+    ],
+    [
+        {
+            "id": "_pages_location",
+            "property": "pathname",
+            "value": f"/config/{CONFIG_FN}",
+        },
+        {"id": "_pages_location", "property": "search", "value": ""},
+    ],
+)
+ROWS_CALLBACK = callback(
+    "config-item-data-grid.getRowsResponse",
+    {"id": "config-item-data-grid", "property": "getRowsResponse"},
+    [
+        {
+            "id": "config-item-data-grid",
+            "property": "getRowsRequest",
+            "value": {"startRow": 0, "endRow": 100, "sortModel": [], "filterModel": {}},
+        }
+    ],
+)
+REQUESTS: List[Tuple[str, str, str, bytes | None]] = [
+    ("page", "GET", f"/config/{CONFIG_FN}", None),
+    ("layout callback", "POST", "/_dash-update-component", PAGE_CALLBACK),
+    ("first rows", "POST", "/_dash-update-component", ROWS_CALLBACK),
+]
+TIMED = [request[0] for request in REQUESTS] + ["whole page"]
+
+
+def open_page(port: int, times: Dict[str, List[float]]) -> int:
+    """Opens the page as a new browser, returns the bytes received"""
+    cookie = None
+    received = 0
+    page_start = time.perf_counter()
+    for label, method, path, body in REQUESTS:
+        headers = {"Accept-Encoding": "gzip, br", "Content-Type": "application/json"}
+        if cookie:
+            headers["Cookie"] = cookie
+        start = time.perf_counter()
+        # the development server closes each connection after one response
+        connection = http.client.HTTPConnection(HOST, port)
+        connection.request(method, path, body, headers)
+        response = connection.getresponse()
+        data = response.read()
+        connection.close()
+        times[label].append(time.perf_counter() - start)
+        assert response.status == 200, (label, response.status, data[:200])
+        received += len(data)
+        cookie = cookie or (response.getheader("Set-Cookie") or "").split(";")[0]
+    times["whole page"].append(time.perf_counter() - page_start)
+    return received
+
+
+def load(port: int, n_clients: int, seconds: float) -> None:
+    times: Dict[str, List[float]] = {label: [] for label in TIMED}
+    received: List[int] = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def run() -> None:
+        while time.monotonic() < deadline:
+            mine: Dict[str, List[float]] = {label: [] for label in times}
+            size = open_page(port, mine)
+            with lock:
+                for label, values in mine.items():
+                    times[label].extend(values)
+                received.append(size)
+
+    threads = [threading.Thread(target=run) for _ in range(n_clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    pages = len(times["whole page"])
+    print(
+        f"{'':<4}{pages} pages, {pages / seconds:.1f} pages/s,"
+        f" {statistics.mean(received) / 1e3:.1f} kB per page"
+    )
+    for label, values in times.items():
+        q = statistics.quantiles(values, n=100) if len(values) > 1 else values * 99
+        print(
+            f"{'':<4}{label:<20} p50 {q[49] * 1000:8.1f} ms"
+            f"  p90 {q[89] * 1000:8.1f} ms  p99 {q[98] * 1000:8.1f} ms"
+        )
+
+
+def main(n_items: int, n_clients: int, seconds: float) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        schema_fn = os.path.join(tmp, "schema.json")
+        assert make_schema(n_items).save(schema_fn)
+        config = Config("bench", "Benchmark config", schema_fn)
+        config.generate_items()
+        assert config.save(CONFIG_FN)
+        print(f"config editor page, {n_items} items, {n_clients} concurrent clients")
+        try:
+            for label, code in SERVERS.items():
+                port = free_port()
+                start = time.perf_counter()
+                server = subprocess.Popen(
+                    [sys.executable, "-c", code, str(port), CONFIG_FN],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                )
+                try:
+                    wait_for_server(port, timeout=60)
+                    print(f"{label}, ready in {time.perf_counter() - start:.1f} s")
+                    # the first callbacks import the JSON encoder, once
+                    open_page(port, {label: [] for label in TIMED})
+                    load(port, n_clients, seconds)
+                finally:
+                    server.terminate()
+                    server.wait()
+        finally:
+            os.remove(CONFIG_FN)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 8,
+        float(sys.argv[3]) if len(sys.argv) > 3 else 10.0,
+    )
@@ -0,0 +1,143 @@
+"""Load test of the local config service
+
+Starts `configtree serve` in its own process and measures requests per second
+from concurrent client threads: full fetches (200) on keep-alive connections,
+and revalidations (304) through one pooled ConfigClient. Loading the config file
+in each job is the baseline.
+
+Usage: python -m benchmarks.bench_service [n_items] [n_clients] [seconds]
+"""
+
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable
+
+import src.model.config as config_factory
+from src.model.config import Config
+from src.runtime.client import ConfigClient
+
+from .common import best_of, make_schema, report
+
+HOST = "127.0.0.1"
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind((HOST, 0))
+        return s.getsockname()[1]
+
+
+def wait_for_server(port: int, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            http.client.HTTPConnection(HOST, port).connect()
+            return
+        except ConnectionRefusedError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+def load(n_clients: int, seconds: float, worker: Callable[[], Callable[[], None]]):
+    """Runs `n_clients` threads for `seconds`, returns requests per second
+
+    `worker` is called once per thread and returns the request to repeat.
+    """
+    counts = [0] * n_clients
+    stop = threading.Event()
+    ready = threading.Barrier(n_clients + 1)
+
+    def run(i: int) -> None:
+        try:
+            request = worker()
+            request()
+        except BaseException:
+            ready.abort()
+            raise
+        ready.wait()
+        while not stop.is_set():
+            request()
+            counts[i] += 1
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(n_clients)]
+    for thread in threads:
+        thread.start()
+    ready.wait()
+    start = time.perf_counter()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sum(counts) / (time.perf_counter() - start)
+
+
+def main(n_items: int, n_clients: int, seconds: float) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        schema_fn = os.path.join(tmp, "schema.json")
+        config_fn = os.path.join(tmp, "config.json")
+        assert make_schema(n_items).save(schema_fn)
+        config = Config("bench", "Benchmark config", schema_fn)
+        config.generate_items()
+        assert config.save(config_fn)
+
+        port = free_port()
+        address = f"{HOST}:{port}"
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                "configtree.py",
+                "serve",
+                "--root",
+                tmp,
+                "--listen",
+                address,
+            ],
+            stdout=subprocess.DEVNULL,
+        )
+        try:
+            wait_for_server(port)
+
+            def fetch() -> Callable[[], None]:
+                connection = http.client.HTTPConnection(HOST, port)
+
+                def request() -> None:
+                    connection.request("GET", "/configs/config.json")
+                    response = connection.getresponse()
+                    response.read()
+                    assert response.status == 200
+
+                return request
+
+            client = ConfigClient(address, pool_size=n_clients)
+
+            def revalidate() -> Callable[[], None]:
+                return lambda: client.get("config.json")
+
+            baseline = best_of(lambda: config_factory.load(config_fn))
+            print(f"{n_items} items, {n_clients} concurrent clients")
+            report("load config file per job", baseline)
+            for label, worker in [
+                ("fetch (200)", fetch),
+                ("revalidate (304)", revalidate),
+            ]:
+                rate = load(n_clients, seconds, worker)
+                print(f"{label:<40} {rate:10.0f} req/s")
+            client.close()
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 100,
+        float(sys.argv[3]) if len(sys.argv) > 3 else 5.0,
+    )
@@ -0,0 +1,81 @@
+"""Cost of per-session state on each callback, for a large schema
+
+Times a cell edit followed by the commit that ends each callback request: in
+memory, and with a session directory shared by worker processes, where the
+session is written as patches. Also times a worker reading a session it has not
+seen, and reports the memory accounted to a session after the edits.
+
+Usage: python -m benchmarks.bench_sessions [n_items]
+"""
+
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from src.app_state import EditorState
+from src.sessions import SessionStore
+
+from .common import best_of, make_schema, report
+
+EDITS = 20
+SESSION = "s" * 32
+
+
+def edits(sessions: SessionStore, filename: str) -> None:
+    state = sessions.get(SESSION)
+    times = []
+    for i in range(EDITS):
+        start = time.perf_counter()
+        schema = state.next_schema
+        schema.update_item(schema.items[(i * 7919) % len(schema.items)], desc=str(i))
+        sessions.commit(SESSION)
+        times.append(time.perf_counter() - start)
+    print(
+        f"{'':<4}edit + commit  median {statistics.median(times) * 1000:8.2f} ms"
+        f"  max {max(times) * 1000:8.2f} ms"
+    )
+
+
+def main(n_items: int) -> None:
+    directory = tempfile.mkdtemp()
+    try:
+        filename = os.path.join(directory, "schema.json")
+        schema = make_schema(n_items)
+        assert schema.save(filename)
+        print(f"session editing a schema of {n_items} items")
+
+        from src.app_state import workspace
+
+        for label, sessions in (
+            ("in memory", SessionStore(EditorState)),
+            (
+                "session directory",
+                SessionStore(EditorState, os.path.join(directory, "sessions")),
+            ),
+        ):
+            state = sessions.get(SESSION)
+            state.schema_filename = filename
+            state.schema = workspace.schema(filename)
+            state.schema.build_indexes()
+            state.schema.build_hashes()
+            state.next_schema = state.schema.copy()
+            print(label)
+            edits(sessions, filename)
+            print(f"{'':<4}accounted {sessions.memory() / 1e3:10.1f} kB")
+
+        path = os.path.join(directory, "sessions")
+        size = os.path.getsize(os.path.join(path, SESSION + ".json"))
+        print(f"{'session file':<40} {size / 1e3:10.1f} kB")
+        report(
+            "read by another worker",
+            best_of(lambda: SessionStore(EditorState, path).get(SESSION)),
+        )
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,91 @@
+"""Compares how worker processes get the values of a config
+
+Each worker either loads the config, loads its compiled bundle, or attaches to
+the bundle published once in shared memory, then reads every value.
+
+Usage: python -m benchmarks.bench_shared [n_items] [n_workers]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from multiprocessing import Pool
+
+import src.model.bundle as bundle
+import src.model.config as config_factory
+import src.runtime.bundle as bundle_reader
+import src.runtime.shared as shared
+from src.model.config import Config
+from src.runtime.shared import Publisher
+
+from .common import best_of, make_schema, report
+
+
+def from_config(path: str) -> float:
+    start = time.perf_counter()
+    config = config_factory.load(path)
+    for name in [item.schema_item.name for item in config.items]:
+        config[name]
+    return time.perf_counter() - start
+
+
+def from_bundle(path: str) -> float:
+    start = time.perf_counter()
+    values = bundle_reader.load(path)
+    for name in values:
+        values[name]
+    return time.perf_counter() - start
+
+
+def from_shared(name: str) -> float:
+    start = time.perf_counter()
+    with shared.attach(name) as values:
+        for name in values:
+            values[name]
+    return time.perf_counter() - start
+
+
+def main(n_items: int, n_workers: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        schema_fn = os.path.join(tmp, "schema.json")
+        config_fn = os.path.join(tmp, "config.json")
+        bundle_fn = os.path.join(tmp, "config.bundle")
+
+        assert make_schema(n_items).save(schema_fn)
+        config = Config("bench", "Benchmark config", schema_fn)
+        config.generate_items()
+        assert config.save(config_fn)
+        bundle.save(config, bundle_fn)
+
+        with Publisher(f"configtree_bench_{os.getpid()}") as publisher:
+            publish = best_of(lambda: bundle.publish(publisher, config))
+
+            print(f"{n_items} items, {n_workers} workers, time per worker")
+            with Pool(n_workers) as pool:
+                baseline = min(pool.map(from_config, [config_fn] * n_workers))
+                report("load config", baseline)
+                report(
+                    "load bundle",
+                    min(pool.map(from_bundle, [bundle_fn] * n_workers)),
+                    baseline,
+                )
+                report(
+                    "attach shared bundle",
+                    min(pool.map(from_shared, [publisher.name] * n_workers)),
+                    baseline,
+                )
+            report("publish once", publish)
+
+            values = shared.attach(publisher.name)
+            names = list(values)
+            reads = best_of(lambda: [values[name] for name in names])
+            print(f"{'read':<40} {reads / n_items * 1e9:10.1f} ns per value")
+            values.close()
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 4,
+    )
@@ -0,0 +1,49 @@
+"""Compares loading a schema from JSON with loading its binary sidecar copy
+
+Usage: python -m benchmarks.bench_sidecar [n_items]
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import src.model.schema as schema_factory
+import src.model.sidecar as sidecar
+
+from .common import best_of, make_schema, report
+
+STARTUP = "import src.model.cache as c; c.load({!r})"
+
+
+def main(n_items: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        fn = os.path.join(tmp, "schema.json")
+        make_schema(n_items).save(fn)
+        cache_dir = os.path.join(tmp, sidecar.CACHE_DIR)
+
+        print(f"{n_items} items, {os.path.getsize(fn) / 1e6:.1f} MB")
+        baseline = best_of(lambda: schema_factory.load(fn))
+        report("load json", baseline)
+        report(
+            "sidecar, building the cache",
+            best_of(lambda: (shutil.rmtree(cache_dir, True), sidecar.load_schema(fn))),
+            baseline,
+        )
+        report("sidecar, cached", best_of(lambda: sidecar.load_schema(fn)), baseline)
+        size = sum(entry.stat().st_size for entry in os.scandir(cache_dir))
+        print(f"{'':<40} {size / 1e6:.1f} MB cache file")
+
+        def start(cached: bool) -> None:
+            env = dict(os.environ, CONFIGTREE_CACHE="1" if cached else "0")
+            command = [sys.executable, "-c", STARTUP.format(fn)]
+            subprocess.run(command, env=env, check=True)
+
+        baseline = best_of(lambda: start(False))
+        report("new process, load json", baseline)
+        report("new process, sidecar", best_of(lambda: start(True)), baseline)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,45 @@
+"""Compares peak memory of schema.load and the streaming loader
+
+Usage: python -m benchmarks.bench_stream [n_items]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable
+
+import src.model.schema as schema_factory
+import src.model.stream as stream
+from src.model.schema import Schema
+
+from .common import make_schema
+
+
+def measure(label: str, load: Callable[[], Schema]) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    schema = load()
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label:<20} {elapsed * 1000:8.1f} ms  "
+        f"retained {retained / 1e6:7.1f} MB  peak {peak / 1e6:7.1f} MB  "
+        f"overhead {(peak - retained) / 1e6:7.1f} MB"
+    )
+    del schema
+
+
+def main(n_items: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        fn = os.path.join(tmp, "schema.json")
+        assert make_schema(n_items).save(fn)
+        print(f"{n_items} items, {os.path.getsize(fn) / 1e6:.1f} MB schema")
+        measure("schema.load", lambda: schema_factory.load(fn))
+        measure("stream.load", lambda: stream.load(fn))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
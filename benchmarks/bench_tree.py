@@ -0,0 +1,61 @@
+"""Looks values up in a site -> project -> run tree of configs
+
+Usage: python -m benchmarks.bench_tree [n_projects] [n_runs] [n_items]
+"""
+
+import sys
+
+from src.model.tree import ConfigTree
+
+from .common import best_of, make_schema, report
+
+
+def build(n_projects: int, n_runs: int, n_items: int) -> ConfigTree:
+    tree = ConfigTree(make_schema(n_items))
+    names = list(tree.defaults)
+    tree.add("site", values={name: "site" for name in names[::2]})
+    for p in range(n_projects):
+        project = f"project_{p}"
+        tree.add(project, "site", {name: project for name in names[::3]})
+        for r in range(n_runs):
+            tree.add(f"{project}_run_{r}", project, {names[r % n_items]: "run"})
+    return tree
+
+
+def walk_up(tree: ConfigTree, name: str, item: str) -> object:
+    """Looks a value up without memoization, one ancestor at a time"""
+    node: str | None = name
+    while node is not None:
+        overrides = tree.overrides(node)
+        if item in overrides:
+            return overrides[item]
+        node = tree.parent(node)
+    return tree.defaults[item]
+
+
+def main(n_projects: int, n_runs: int, n_items: int) -> None:
+    tree = build(n_projects, n_runs, n_items)
+    runs = [name for name in tree if "_run_" in name]
+    items = list(tree.defaults)
+    lookups = [(runs[i % len(runs)], items[i % len(items)]) for i in range(100_000)]
+    print(f"{len(runs)} runs of {n_items} items, 100000 lookups")
+
+    baseline = best_of(lambda: [walk_up(tree, r, i) for r, i in lookups])
+    report("walk up the tree", baseline)
+    report(
+        "first resolution of every run",
+        best_of(lambda: [tree.resolve(r) for r in runs], repeat=1),
+    )
+    report(
+        "memoized lookups",
+        best_of(lambda: [tree.get(r, i) for r, i in lookups]),
+        baseline,
+    )
+    report(
+        "edit the site config", best_of(lambda: tree.set_value("site", items[1], "x"))
+    )
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*(args + [10, 100, 1_000][len(args) :]))
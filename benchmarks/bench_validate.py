@@ -0,0 +1,43 @@
+"""Compares a full Schema.validate with revalidating after a single edit
+
+Usage: python -m benchmarks.bench_validate [n_items ...]
+"""
+
+import sys
+
+from src.model.schema import Schema
+
+from .common import best_of, make_schema, report
+
+
+def full(schema: Schema) -> None:
+    schema.items = list(schema.items)
+    schema.validate()
+
+
+def edit_and_validate(schema: Schema) -> None:
+    item = schema.items[len(schema.items) // 2]
+    schema.update_item(item, desc=item.desc + ".")
+    schema.validate()
+
+
+def edit_group_and_validate(schema: Schema) -> None:
+    group = schema.groups[0]
+    schema.update_group(group, name=group.name + "_")
+    schema.validate()
+
+
+def main(sizes: list[int]) -> None:
+    for n_items in sizes:
+        schema = make_schema(n_items)
+        print(f"{n_items} items")
+        baseline = best_of(lambda: full(schema))
+        report("full validation", baseline)
+        report("edit one item", best_of(lambda: edit_and_validate(schema)), baseline)
+        report(
+            "rename a group", best_of(lambda: edit_group_and_validate(schema)), baseline
+        )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000])
@@ -0,0 +1,41 @@
+"""Throughput of the type validators, one million values per type
+
+Usage: python -m benchmarks.bench_validators [n_values]
+"""
+
+import sys
+import time
+
+import src.helpers.validators as validators
+
+VALUES = {
+    str: ["value", "low medium high", "", "1.0.0"],
+    int: ["10", "-3", "0", "123456"],
+    float: ["0.5", "-1.25", "1e-3", "100.0"],
+    bool: ["true", "false", "1", "0"],
+}
+
+
+def throughput(check, values: list) -> float:
+    start = time.perf_counter()
+    for value in values:
+        check(value)
+    return len(values) / (time.perf_counter() - start)
+
+
+def main(n_values: int) -> None:
+    print(f"{n_values} values per type, values/s")
+    for type, samples in VALUES.items():
+        values = samples * (n_values // len(samples))
+        reference = throughput(
+            lambda value: validators._validate_by_conversion(value, type), values
+        )
+        compiled = throughput(validators.type_validator(type), values)
+        print(
+            f"{type.__name__:<10} reference {reference:12,.0f}"
+            f"  compiled {compiled:12,.0f}  ({compiled / reference:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
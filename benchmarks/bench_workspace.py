@@ -0,0 +1,65 @@
+"""Compares reloading a workspace with reloading only the changed files
+
+Usage: python -m benchmarks.bench_workspace [n_configs] [n_items]
+"""
+
+import os
+import sys
+import tempfile
+
+import src.model.config as config_factory
+from src.model.config import Config
+from src.model.workspace import Workspace
+
+from .common import best_of, make_schema, report
+
+
+def touch(path: str) -> None:
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+
+
+def main(n_configs: int, n_items: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        schema_fn = os.path.join(tmp, "schema.json")
+        assert make_schema(n_items).save(schema_fn)
+        for i in range(n_configs):
+            config = Config(f"config{i}", "Benchmark config", schema_fn)
+            config.generate_items()
+            assert config.save_delta(os.path.join(tmp, f"config{i}.json"))
+        config_fn = os.path.join(tmp, "config0.json")
+
+        print(f"{n_configs} configs of {n_items} items")
+        baseline = best_of(lambda: Workspace(tmp).scan(), repeat=1)
+        report("load every file", baseline)
+
+        workspace = Workspace(tmp)
+        workspace.scan()
+        report("refresh, nothing changed", best_of(workspace.refresh), baseline)
+
+        def change_config() -> None:
+            touch(config_fn)
+            workspace.refresh([config_fn])
+
+        report("refresh one changed config", best_of(change_config), baseline)
+
+        def change_schema() -> None:
+            touch(schema_fn)
+            workspace.refresh([schema_fn])
+
+        report("refresh a schema and its configs", best_of(change_schema, 1), baseline)
+
+        baseline = best_of(lambda: config_factory.load(config_fn))
+        report("open a config, from disk", baseline)
+        report(
+            "open a config, from the workspace",
+            best_of(lambda: workspace.config(config_fn)),
+            baseline,
+        )
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 1_000,
+    )
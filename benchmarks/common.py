@@ -0,0 +1,50 @@
+"""Shared helpers for the benchmark scripts"""
+
+import time
+from typing import Any, Callable
+
+from src.model.schema import Schema, SchemaGroup, SchemaItem, SchemaItemType
+
+TYPES = [
+    (SchemaItemType.str, "value", "low medium high"),
+    (SchemaItemType.int, "10", ""),
+    (SchemaItemType.float, "0.5", ""),
+    (SchemaItemType.bool, "true", ""),
+]
+
+
+def make_schema(n_items: int, n_groups: int = 100) -> Schema:
+    """Builds a valid schema with `n_items` items spread over `n_groups` groups"""
+    schema = Schema("bench", "Benchmark schema", "1.0.0")
+    for i in range(n_groups):
+        schema.groups.append(SchemaGroup(f"group_{i}", f"Group {i}", order=i))
+    for i in range(n_items):
+        item_type, default, options = TYPES[i % len(TYPES)]
+        schema.items.append(
+            SchemaItem(
+                f"item_{i}",
+                f"Description of item {i}",
+                f"group_{i % n_groups}",
+                default,
+                item_type,
+                options,
+            )
+        )
+    return schema
+
+
+def best_of(fn: Callable[[], Any], repeat: int = 3) -> float:
+    """Returns the fastest wall clock time of `repeat` runs, in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(label: str, seconds: float, baseline: float | None = None) -> None:
+    line = f"{label:<40} {seconds * 1000:10.1f} ms"
+    if baseline:
+        line += f"  ({baseline / seconds:5.1f}x)"
+    print(line)
@@ -0,0 +1,8 @@
+"""Command line entry point, see src/cli.py"""
+
+import sys
+
+from src.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,57 @@
-"""Web based config editor"""
+"""Web based config editor
+
+    python main.py [--production] [--host HOST] [--port PORT] [--preload PATH ...]
+
+Without --production, the Dash development server runs with debugging and hot
+reloading. With it, the app is served without debug tooling, with compressed
+responses and cached assets, by a threaded server in this process. Under a WSGI
+server with several workers, use the app factory instead, for example:
+
+    gunicorn -w 4 --threads 8 -b 0.0.0.0:8050 "main:create_server()"
+
+with CONFIGTREE_SESSION_DIR set so the workers share the editor sessions, see
+src/sessions.py. Do not use gunicorn's --preload: each worker starts its own
+file watcher.
+
+In production, the documents given with --preload, or in CONFIGTREE_PRELOAD
+separated by os.pathsep, are loaded before the first request, as are all the
+documents below CONFIGTREE_WORKSPACE when it is set. Paths may be directories.
+"""
+
+import argparse
+import os
+from typing import List, Sequence
 
-from dash import Dash
 import dash_bootstrap_components as dbc
+import flask
+from dash import Dash
+from werkzeug.serving import run_simple
 
+import src.serving as serving
+import src.watch as watch
+from src.app_state import store, workspace
 from src.components import layout
 
 BOOTSTRAP_ICONS = (
     "https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.1/" "font/bootstrap-icons.css"
 )
+HOST = "127.0.0.1"
+PORT = 8050
 
 
-def main() -> None:
+def preload_paths() -> List[str]:
+    """The documents CONFIGTREE_PRELOAD names"""
+    return [
+        path
+        for path in os.environ.get("CONFIGTREE_PRELOAD", "").split(os.pathsep)
+        if path
+    ]
+
+
+def create_app(production: bool = False, preload: Sequence[str] | None = None) -> Dash:
+    """Builds the editor app, compressed and preloaded in production"""
     app = Dash(
+        __name__,
         use_pages=True,
         pages_folder="./src/pages",
         external_stylesheets=[
@@ -25,7 +65,35 @@ def main() -> None:
     app.layout = layout.render(
         app,
     )
-    app.run(debug=True)
+    # each browser edits its own documents
+    store.init_app(app.server)
+    # pages load files through the workspace, which reloads them when they change
+    watch.start(workspace)
+    if production:
+        serving.compress(app.server)
+        serving.cache_assets(app.server)
+        serving.preload(app, workspace, preload_paths() if preload is None else preload)
+    return app
+
+
+def create_server() -> flask.Flask:
+    """The WSGI application of the production app, for a WSGI server"""
+    return create_app(production=True).server
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--production", action="store_true")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--preload", nargs="+", metavar="PATH")
+    args = parser.parse_args(argv)
+
+    if not args.production:
+        create_app().run(debug=True, host=args.host, port=args.port)
+        return
+    server = create_app(production=True, preload=args.preload).server
+    run_simple(args.host, args.port, server, threaded=True)
 
 
 if __name__ == "__main__":
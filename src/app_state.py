@@ -1,10 +1,66 @@
-"""Contains application state"""
+"""Contains application state
 
+`Root` is the editor state of the current session, see `src.sessions`. In a
+request it is the state of the browser that sent it, elsewhere, in tests and
+scripts, the state of a single local session.
+
+The sessions subscribe to the workspace: a session editing a file that changes
+on disk, other than by its own saves, is flagged so its editor can tell.
+"""
+
+import os
+import sys
+from typing import Any, Callable, Dict, List, Tuple, TypeVar, cast
+
+import src.model.patch as patch_factory
+import src.sessions as sessions
 from src.model.config import Config
 from src.model.schema import Schema
+from src.model.workspace import Change, Workspace
+
+T = TypeVar("T")
+
+# the schemas and configs the editors load, kept until their files change. With
+# CONFIGTREE_WORKSPACE set, the files below that directory, otherwise only the
+# files the editors opened, so the working directory is never walked.
+workspace = Workspace(
+    os.environ.get("CONFIGTREE_WORKSPACE") or ".",
+    discover=bool(os.environ.get("CONFIGTREE_WORKSPACE")),
+)
+
+
+KINDS = ("schema", "config")
+# how often an open editor asks whether its file changed on disk
+DISK_CHECK_SECONDS = 5
+
+
+def _file_version(filename: str | None) -> List[int] | None:
+    if filename is None:
+        return None
+    try:
+        st = os.stat(filename)
+    except OSError:
+        return None
+    # a list, as read back from a session file
+    return [st.st_mtime_ns, st.st_size]
+
 
+def _record_bytes(record: Any) -> int:
+    return sys.getsizeof(record) + sum(
+        sys.getsizeof(getattr(record, slot)) for slot in record.__slots__
+    )
+
+
+def _footprint(document: Schema | Config) -> int:
+    total = document.items.footprint(_record_bytes)  # type: ignore[attr-defined]
+    if isinstance(document, Schema):
+        total += document.groups.footprint(_record_bytes)  # type: ignore[attr-defined]
+    return total
+
+
+class EditorState:
+    """The documents a session edits: the saved snapshot and the edited one"""
 
-class Root:
     schema: Schema | None = None
     next_schema: Schema | None = None
     schema_filename: str | None = None
@@ -12,3 +68,209 @@ class Root:
     config: Config | None = None
     next_config: Config | None = None
     config_filename: str | None = None
+
+    # the version of each file when it was loaded or last saved, and whether it
+    # changed on disk since, see file_changed
+    schema_version: List[int] | None = None
+    schema_changed_on_disk: bool = False
+    config_version: List[int] | None = None
+    config_changed_on_disk: bool = False
+
+    def __init__(self) -> None:
+        # the patch from each file to its saved snapshot, see _document_to_dict
+        self._base_patches: Dict[str, Tuple[Any, Dict[str, Any]]] = {}
+        # what the pages derive from the documents, see cache
+        self._caches: Dict[str, Any] = {}
+
+    def cache(self, key: str, factory: Callable[[], T]) -> T:
+        """An object kept with this session, made by `factory` the first time
+
+        For caches of the documents of the session, like the rows of the item
+        grids. They are not written to session files.
+        """
+        value = self._caches.get(key)
+        if value is None:
+            value = self._caches.setdefault(key, factory())
+        return value
+
+    def loaded(self, kind: str) -> None:
+        """Records the version of the file of a document just loaded or saved"""
+        setattr(
+            self, f"{kind}_version", _file_version(getattr(self, f"{kind}_filename"))
+        )
+        setattr(self, f"{kind}_changed_on_disk", False)
+
+    def file_changed(self, change: Change) -> None:
+        """Flags the documents whose file changed since it was loaded or saved
+
+        A config is also flagged when the schema it is resolved against changed.
+        """
+        for kind in KINDS:
+            filename = getattr(self, f"{kind}_filename")
+            if filename is None or os.path.realpath(filename) != change.path:
+                continue
+            if change.cause is not None or _file_version(filename) != getattr(
+                self, f"{kind}_version"
+            ):
+                setattr(self, f"{kind}_changed_on_disk", True)
+
+    def fingerprint(self) -> Any:
+        """Changes whenever a document, or which document is edited, does"""
+        return (
+            self.schema_filename,
+            self.config_filename,
+            self.schema_changed_on_disk,
+            self.config_changed_on_disk,
+            *(
+                None if document is None else document.tree_hash()
+                for document in (
+                    self.schema,
+                    self.next_schema,
+                    self.config,
+                    self.next_config,
+                )
+            ),
+        )
+
+    def footprint(self) -> int:
+        """Estimated bytes of the records only this session holds"""
+        documents = {
+            id(document): document
+            for document in (
+                self.schema,
+                self.next_schema,
+                self.config,
+                self.next_config,
+            )
+            if document is not None
+        }
+        return sum(map(_footprint, documents.values()))
+
+    # -----------------------------------------------------------------------------------------------
+    # Session files
+    #
+    # A document is stored as its filename, the patch from the file to the saved
+    # snapshot, usually empty, and the patch from the saved snapshot to the edited
+    # one. Both are small next to the document, and the file is loaded through the
+    # workspace of the process that reads the session.
+    # -----------------------------------------------------------------------------------------------
+    def _document_to_dict(
+        self,
+        filename: str | None,
+        document: Schema | Config | None,
+        next_document: Schema | Config | None,
+    ) -> Dict[str, Any] | None:
+        if filename is None or document is None or next_document is None:
+            return None
+        try:
+            st = os.stat(filename)
+            # the saved snapshot changes far less often than the edited one
+            key = (st.st_mtime_ns, st.st_size, document.tree_hash())
+            base = self._base_patches.get(filename)
+            if base is None or base[0] != key:
+                if isinstance(document, Schema):
+                    loaded: Schema | Config = workspace.schema(filename)
+                else:
+                    loaded = workspace.config(filename)
+                base = (key, patch_factory.diff(loaded, document).to_dict())
+                self._base_patches[filename] = base
+        except (OSError, ValueError):
+            return None
+        return {
+            "base": base[1],
+            "next": patch_factory.diff(document, next_document).to_dict(),
+        }
+
+    @staticmethod
+    def _document_from_dict(
+        filename: str, data: Dict[str, Any], kind: str
+    ) -> Tuple[Schema | Config, Schema | Config]:
+        if kind == "schema":
+            loaded: Schema | Config = workspace.schema(filename)
+        else:
+            loaded = workspace.config(filename)
+        document = patch_factory.apply(loaded, patch_factory.from_dict(data["base"]))
+        # indexed and hashed before copying, so both snapshots share them
+        document.build_indexes()
+        document.build_hashes()
+        next_document = patch_factory.apply(
+            document, patch_factory.from_dict(data["next"])
+        )
+        return document, next_document
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "schemaVersion": self.schema_version,
+            "schemaChangedOnDisk": self.schema_changed_on_disk,
+            "configVersion": self.config_version,
+            "configChangedOnDisk": self.config_changed_on_disk,
+            "schemaFilename": self.schema_filename,
+            "schema": self._document_to_dict(
+                self.schema_filename, self.schema, self.next_schema
+            ),
+            "configFilename": self.config_filename,
+            "config": self._document_to_dict(
+                self.config_filename, self.config, self.next_config
+            ),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EditorState":
+        state = cls()
+        state.schema_filename = data["schemaFilename"]
+        state.config_filename = data["configFilename"]
+        for kind in KINDS:
+            version = data.get(f"{kind}Version")
+            setattr(state, f"{kind}_version", version)
+            # the file may have changed while no process had the session open
+            setattr(
+                state,
+                f"{kind}_changed_on_disk",
+                bool(data.get(f"{kind}ChangedOnDisk"))
+                or (
+                    version is not None
+                    and _file_version(getattr(state, f"{kind}_filename")) != version
+                ),
+            )
+        # a document whose file went away or no longer takes the patches is not
+        # restored, its page loads the file again
+        try:
+            if data["schema"] is not None and state.schema_filename is not None:
+                state.schema, state.next_schema = cls._document_from_dict(  # type: ignore[assignment]
+                    state.schema_filename, data["schema"], "schema"
+                )
+        except (OSError, ValueError, patch_factory.PatchError):
+            state.schema = state.next_schema = None
+        try:
+            if data["config"] is not None and state.config_filename is not None:
+                state.config, state.next_config = cls._document_from_dict(  # type: ignore[assignment]
+                    state.config_filename, data["config"], "config"
+                )
+        except (OSError, ValueError, patch_factory.PatchError):
+            state.config = state.next_config = None
+        return state
+
+
+class _CurrentState:
+    """Reads and writes the EditorState of the current session"""
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(store.current(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(store.current(), name, value)
+
+
+store: sessions.SessionStore[EditorState] = sessions.SessionStore(
+    EditorState, os.environ.get("CONFIGTREE_SESSION_DIR") or None
+)
+
+Root = cast(EditorState, _CurrentState())
+
+
+def _notify_sessions(change: Change) -> None:
+    for state in store.states():
+        state.file_changed(change)
+
+
+workspace.subscribe(_notify_sessions)
@@ -0,0 +1,148 @@
+"""Command line interface
+
+    configtree validate [-j JOBS] <paths...>
+    configtree compile <config> <bundle>
+    configtree serve [--root DIR] [--listen ADDRESS]
+
+Validates schema and config files, or every .json file below a directory, in a
+pool of worker processes. Configs are sorted next to the other configs of their
+schema, so a worker parses each schema once and shares it between them through
+the schema cache. Results are printed as soon as they arrive, always in the same
+order for the same files, and the exit status is 1 if any file is invalid.
+
+`compile` writes the values of a config as a bundle, see src/model/bundle.py.
+`serve` serves the bundles of the configs below a directory, see src/service.py.
+"""
+
+import argparse
+import json
+import os
+import sys
+from multiprocessing import Pool
+from typing import Iterable, Iterator, List, NamedTuple, TextIO
+
+import src.model.bundle as bundle
+import src.model.config as config_factory
+import src.model.schema as schema_factory
+import src.service as service
+from src.model.workspace import find_files, schema_path_of
+
+CHUNK_SIZE = 16
+LISTEN = "127.0.0.1:8051"
+
+
+class Result(NamedTuple):
+    path: str
+    kind: str
+    errors: List[str]
+
+
+def _read(path: str) -> dict:
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        # like schema.from_json, only the first element is used
+        data = data[0]
+    return data
+
+
+def _sort_key(path: str) -> tuple:
+    """Sorts configs next to the other configs of their schema"""
+    return (schema_path_of(path), path)
+
+
+def validate_file(path: str) -> Result:
+    """Loads and validates a schema or config file"""
+    try:
+        data = _read(path)
+        if "schemaPath" in data:
+            config = config_factory.from_dict(data)
+            if config.schema is None:
+                return Result(
+                    path, "config", [f"Schema {config.schema_path} does not exist"]
+                )
+            config.validate()
+            return Result(path, "config", [e.message for e in config.get_errors()])
+
+        schema = schema_factory.from_dict(data)
+        schema.validate()
+        return Result(path, "schema", [e.message for e in schema.get_errors()])
+    except Exception as e:
+        return Result(path, "file", [f"{type(e).__name__}: {e}"])
+
+
+def validate(files: List[str], jobs: int = 1) -> Iterator[Result]:
+    """Validates files in `jobs` processes, yielding results in input order"""
+    if jobs <= 1 or len(files) <= 1:
+        yield from map(validate_file, files)
+        return
+    chunk_size = max(1, min(CHUNK_SIZE, len(files) // (jobs * 4)))
+    with Pool(jobs) as pool:
+        yield from pool.imap(validate_file, files, chunk_size)
+
+
+def report(results: Iterable[Result], out: TextIO) -> int:
+    """Prints the errors of each file, returns the number of invalid files"""
+    checked = invalid = 0
+    for result in results:
+        checked += 1
+        if result.errors:
+            invalid += 1
+            for error in result.errors:
+                print(f"{result.path}: {error}", file=out)
+    print(f"{checked} files checked, {invalid} invalid", file=out)
+    return invalid
+
+
+def main(argv: List[str] | None = None, out: TextIO = sys.stdout) -> int:
+    parser = argparse.ArgumentParser(prog="configtree")
+    commands = parser.add_subparsers(dest="command", required=True)
+    validate_parser = commands.add_parser(
+        "validate", help="validate schema and config files"
+    )
+    validate_parser.add_argument(
+        "paths", nargs="+", help="files, or directories to search for .json files"
+    )
+    validate_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="number of worker processes (default: number of CPUs)",
+    )
+    compile_parser = commands.add_parser(
+        "compile", help="compile a config into a bundle of its values"
+    )
+    compile_parser.add_argument("config", help="config file")
+    compile_parser.add_argument("bundle", help="bundle file to write")
+    serve_parser = commands.add_parser("serve", help="serve compiled configs over HTTP")
+    serve_parser.add_argument(
+        "--root", default=".", help="directory of the configs (default: .)"
+    )
+    serve_parser.add_argument(
+        "--listen",
+        default=LISTEN,
+        help=f"host:port or Unix socket path (default: {LISTEN})",
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        print(f"Serving {args.root} on {args.listen}", file=out)
+        service.serve(args.root, args.listen)
+        return 0
+
+    if args.command == "compile":
+        try:
+            bundle.save(config_factory.load(args.config), args.bundle)
+        except (OSError, ValueError) as e:
+            print(f"{args.config}: {e}", file=out)
+            return 1
+        return 0
+
+    files = sorted(set(find_files(args.paths)), key=_sort_key)
+    invalid = report(validate(files, args.jobs), out)
+    return 1 if invalid else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
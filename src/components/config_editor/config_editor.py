@@ -1,10 +1,14 @@
 import dash_bootstrap_components as dbc
-from dash import Input, Output, callback, html
+from dash import Input, Output, State, callback, dcc, html
 
-from src.app_state import Root
-from src.helpers.form import basic_text_input, set_if_valid
-from src.helpers.validators import validate_alpha_num, validate_not_blank
-from src.model import config as config_factory
+from src.app_state import DISK_CHECK_SECONDS, Root, workspace
+from src.helpers.form import (
+    basic_text_input,
+    clientside_validation,
+    edit_finished,
+    set_if_valid,
+)
+from src.helpers.validators import ALPHA_NUM, NOT_BLANK
 
 from . import item_editor
 
@@ -22,12 +26,11 @@ def name_input(value: str) -> dbc.Row:
     )
 
 
-@callback(
-    Output("config-name", "invalid"),
-    Input("config-name", "value"),
-)
+clientside_validation("config-name", ALPHA_NUM)
+
+
 def validate_and_set_name(text: str) -> bool:
-    return not set_if_valid(Root.next_config, "name", text, validate_alpha_num)
+    return not set_if_valid(Root.next_config, "name", text, ALPHA_NUM)
 
 
 # ---------------------------------------------------------------------------------------------------
@@ -43,12 +46,11 @@ def desc_input(value: str) -> dbc.Row:
     )
 
 
-@callback(
-    Output("config-desc", "invalid"),
-    Input("config-desc", "value"),
-)
+clientside_validation("config-desc", NOT_BLANK)
+
+
 def validate_and_set_desc(text: str) -> bool:
-    return not set_if_valid(Root.next_config, "desc", text, validate_not_blank)
+    return not set_if_valid(Root.next_config, "desc", text, NOT_BLANK)
 
 
 # ---------------------------------------------------------------------------------------------------
@@ -68,16 +70,35 @@ def save_button() -> html.Div:
     )
 
 
+def needs_save() -> bool:
+    if Root.config is None or Root.next_config is None:
+        return Root.config is Root.next_config
+    # tree hashes only rehash what was edited, not the whole config
+    return Root.config.tree_hash() == Root.next_config.tree_hash()
+
+
+def set_fields(name: str | None, desc: str | None) -> None:
+    """Sets the valid fields of the form on the edited config"""
+    if name is not None:
+        validate_and_set_name(name)
+    if desc is not None:
+        validate_and_set_desc(desc)
+
+
+# the browser validates each keystroke, the config is only updated once a field
+# has been edited
 @callback(
     Output("config-save-button", "disabled"),
-    [Input("config-name", "value"), Input("config-desc", "value")],
+    inputs=dict(
+        edited=edit_finished("config-name") + edit_finished("config-desc"),
+        name=State("config-name", "value"),
+        desc=State("config-desc", "value"),
+    ),
     prevent_initial_call=True,
 )
-def needs_save(name: str, desc: str) -> bool:
-    if Root.config == Root.next_config:
-        return True
-    else:
-        return False
+def sync_fields(edited: list, name: str, desc: str) -> bool:
+    set_fields(name, desc)
+    return needs_save()
 
 
 @callback(
@@ -90,9 +111,11 @@ def needs_save(name: str, desc: str) -> bool:
     Output("config-alert-error", "is_open"),
     Output("config-alert-error", "children"),
     Input("config-save-button", "n_clicks"),
+    State("config-name", "value"),
+    State("config-desc", "value"),
     prevent_initial_call=True,
 )
-def save(n_clicks: bool):
+def save(n_clicks: bool, name: str | None = None, desc: str | None = None):
     if Root.config_filename is None:
         alert = html.Div(
             [
@@ -123,6 +146,8 @@ def save(n_clicks: bool):
             alert,
         )
 
+    # the click may come before the sync of the field just edited
+    set_fields(name, desc)
     if not Root.next_config.save(Root.config_filename):
         alert = html.Div(
             [html.I(className="bi bi-exclamation-triangle me-2 error-icon")]
@@ -140,6 +165,7 @@ def save(n_clicks: bool):
         )
     else:
         Root.config = Root.next_config.copy()
+        Root.loaded("config")
         return True, True, False, []
 
 
@@ -176,17 +202,37 @@ def alerts() -> html.Div:
                 is_open=False,
                 duration=4000,
             ),
+            dbc.Alert(
+                [
+                    html.I(className="bi bi-exclamation-triangle me-2"),
+                    f"Config file {Root.config_filename} changed on disk. Reload"
+                    " the page to edit the new version, saving overwrites it.",
+                ],
+                id="config-alert-disk",
+                is_open=False,
+                color="warning",
+            ),
+            dcc.Interval(id="config-disk-check", interval=DISK_CHECK_SECONDS * 1000),
         ]
     )
 
 
+@callback(
+    Output("config-alert-disk", "is_open"),
+    Input("config-disk-check", "n_intervals"),
+    prevent_initial_call=True,
+)
+def check_disk(n_intervals: int) -> bool:
+    return Root.config_changed_on_disk
+
+
 # ---------------------------------------------------------------------------------------------------
 # Main Page Layout
 # ---------------------------------------------------------------------------------------------------
 def layout(fn: str) -> dbc.Form:
     Root.config_filename = fn
     try:
-        Root.config = config_factory.load(Root.config_filename)
+        Root.config = workspace.config(Root.config_filename)
     except FileNotFoundError:
         return dbc.Form(
             dbc.Alert(
@@ -198,7 +244,11 @@ def layout(fn: str) -> dbc.Form:
             )
         )
 
+    # indexed and hashed before copying, so both snapshots share them
+    Root.config.build_indexes()
+    Root.config.build_hashes()
     Root.next_config = Root.config.copy()
+    Root.loaded("config")
 
     return dbc.Form(
         [
@@ -1,9 +1,31 @@
 from typing import Literal
 
 import dash_ag_grid as dag
-from dash import Input, Output, State, callback, html
+from dash import Input, Output, callback, html
 
+import src.helpers.grid as grid_helpers
 from src.app_state import Root
+from src.helpers.grid import changed_cells
+from src.model.config import ConfigItem
+
+# the columns of the rows of large configs, see grid_helpers.RowSource
+ROW_COLUMNS = {
+    "group": lambda item: item.schema_item.group,
+    "name": lambda item: item.schema_item.name,
+    "value": lambda item: item.value,
+    "desc": lambda item: item.schema_item.desc,
+    "default": lambda item: item.schema_item.default,
+    "type": lambda item: item.schema_item.type.value,
+    "options": lambda item: item.schema_item.options,
+}
+
+
+def rows() -> grid_helpers.RowSource:
+    """The rows of the config of the current session"""
+    return Root.cache(
+        "config-item-rows",
+        lambda: grid_helpers.RowSource(ROW_COLUMNS, ConfigItem.to_dict),
+    )
 
 
 def layout() -> html.Div:
@@ -63,25 +85,24 @@ def layout() -> html.Div:
             "hide": True,
         },
     ]
-    rowData = []
-    for item in Root.next_config.items:
-        rowData.append(item.to_dict())
-
+    items = Root.next_config.items
     grid = dag.AgGrid(
         id="config-item-data-grid",
-        rowData=rowData,
         columnDefs=columnDefs,
-        dashGridOptions={
-            "undoRedoCellEditing": True,
-            "undoRedoCellEditingLimit": 20,
-            "domLayout": "autoHeight",
-            "singleClickEdit": True,
-            "animateRows": False,
-            "stopEditingWhenCellsLoseFocus": True,
-            "setSort": "group",
-        },
         className="ag-theme-alpine compact",
-        style={"height": None},
+        **grid_helpers.grid_props(
+            len(items),
+            lambda: [item.to_dict() for item in items],
+            {
+                "undoRedoCellEditing": True,
+                "undoRedoCellEditingLimit": 20,
+                "domLayout": "autoHeight",
+                "singleClickEdit": True,
+                "animateRows": False,
+                "stopEditingWhenCellsLoseFocus": True,
+                "setSort": "group",
+            },
+        ),
     )
     return html.Div(
         [
@@ -98,14 +119,26 @@ def layout() -> html.Div:
         allow_duplicate=True,
     ),
     Input("config-item-data-grid", "cellValueChanged"),
-    State("config-item-data-grid", "rowData"),
     prevent_initial_call=True,
 )
-def update(_, rows) -> Literal[False]:
+def update(changes) -> Literal[False]:
+    """Sets the edited values, items are found by name"""
     if Root.next_config is None:
         return False
-    for row in rows:
-        for item in Root.next_config.items:
-            if item.schema_item.name == row["name"] and item.value != row["value"]:
-                item.value = row["value"]
+    for name, column, value in changed_cells(changes):
+        if column == "value":
+            Root.next_config.set_value(name, value)
     return False
+
+
+@callback(
+    Output("config-item-data-grid", "getRowsResponse"),
+    Input("config-item-data-grid", "getRowsRequest"),
+    prevent_initial_call=True,
+)
+def get_rows(request):
+    """Sends a block of sorted and filtered rows to a large grid"""
+    if Root.next_config is None:
+        return {"rowData": [], "rowCount": 0}
+    config = Root.next_config
+    return rows().get_rows(config.items, config.tree_hash(), request)
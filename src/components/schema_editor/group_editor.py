@@ -3,8 +3,11 @@ import dash_bootstrap_components as dbc
 from dash import Input, Output, State, callback, dcc, html
 
 from src.app_state import Root
+from src.helpers.grid import changed_cells, new_name
 from src.model.schema import SchemaGroup
 
+GROUP_COLUMNS = ("name", "order", "desc")
+
 
 # ---------------------------------------------------------------------------------------------------
 # Group Names Store (for item_editor)
@@ -120,10 +123,7 @@ def deleted_selected(n_clicks, selection):
     if Root.next_schema is None:
         return True, False, []
 
-    for row in selection:
-        for group in Root.next_schema.groups:
-            if group.name == row["name"]:
-                Root.next_schema.groups.remove(group)
+    Root.next_schema.remove_groups(row["name"] for row in selection)
     return False, True, Root.next_schema.get_group_names()
 
 
@@ -137,8 +137,10 @@ def add_group(_):
     """Adds an empty group to the top of the table"""
     if Root.next_schema is None:
         return {}, []
-    group = SchemaGroup(name="<new group name>", desc="<add description here>")
-    Root.next_schema.groups.append(group)
+    schema = Root.next_schema
+    name = new_name("<new group name>", lambda name: schema.get_group(name) is not None)
+    group = SchemaGroup(name=name, desc="<add description here>")
+    Root.next_schema.add_group(group)
     return {"add": [group.to_dict()]}, Root.next_schema.get_group_names()
 
 
@@ -150,13 +152,14 @@ def add_group(_):
     ),
     Output("group-names-store", "data", allow_duplicate=True),
     Input("group-data-grid", "cellValueChanged"),
-    State("group-data-grid", "rowData"),
     prevent_initial_call=True,
 )
-def update(_, rows):
+def update(changes):
+    """Applies the edited cells to the groups, found by name"""
     if Root.next_schema is None:
         return True, []
-    Root.next_schema.groups.clear()
-    for row in rows:
-        Root.next_schema.groups.append(SchemaGroup.from_dict(row))
+    for name, column, value in changed_cells(changes):
+        group = Root.next_schema.get_group(name)
+        if group is not None and column in GROUP_COLUMNS:
+            Root.next_schema.update_group(group, **{column: value})
     return False, Root.next_schema.get_group_names()
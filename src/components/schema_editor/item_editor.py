@@ -1,12 +1,35 @@
 import json
+from operator import attrgetter
 
 import dash_ag_grid as dag
 import dash_bootstrap_components as dbc
-from dash import Input, Output, State, callback, html
+from dash import Input, Output, State, callback, clientside_callback, html
 
+import src.helpers.grid as grid_helpers
 from src.app_state import Root
+from src.helpers.grid import changed_cells
 from src.model.schema import Schema, SchemaItem, SchemaItemType
 
+ITEM_COLUMNS = ("name", "group", "default", "type", "options", "desc")
+
+# the columns of the rows of large schemas, see grid_helpers.RowSource
+ROW_COLUMNS = {
+    "name": attrgetter("name"),
+    "group": attrgetter("group"),
+    "default": attrgetter("default"),
+    "type": lambda item: item.type.value,
+    "options": attrgetter("options"),
+    "desc": attrgetter("desc"),
+}
+
+
+def rows() -> grid_helpers.RowSource:
+    """The rows of the schema of the current session"""
+    return Root.cache(
+        "schema-item-rows",
+        lambda: grid_helpers.RowSource(ROW_COLUMNS, SchemaItem.to_dict),
+    )
+
 
 def layout(schema: Schema) -> html.Div:
     Root.next_schema = schema
@@ -62,24 +85,23 @@ def layout(schema: Schema) -> html.Div:
             "flex": 8,
         },
     ]
-    rowData = []
-    for group in Root.next_schema.items:
-        rowData.append(group.to_dict())
-
+    items = Root.next_schema.items
     grid = dag.AgGrid(
         id="item-data-grid",
-        rowData=rowData,
         columnDefs=columnDefs,
-        dashGridOptions={
-            "undoRedoCellEditing": True,
-            "undoRedoCellEditingLimit": 20,
-            "domLayout": "autoHeight",
-            "singleClickEdit": True,
-            "animateRows": False,
-            "stopEditingWhenCellsLoseFocus": True,
-        },
         className="ag-theme-alpine compact",
-        style={"height": None},
+        **grid_helpers.grid_props(
+            len(items),
+            lambda: [item.to_dict() for item in items],
+            {
+                "undoRedoCellEditing": True,
+                "undoRedoCellEditingLimit": 20,
+                "domLayout": "autoHeight",
+                "singleClickEdit": True,
+                "animateRows": False,
+                "stopEditingWhenCellsLoseFocus": True,
+            },
+        ),
     )
     return html.Div(
         [
@@ -126,10 +148,7 @@ def layout(schema: Schema) -> html.Div:
 )
 def deleted_selected(n_clicks, selection):
     if Root.next_schema is not None:
-        for row in selection:
-            for item in Root.next_schema.items:
-                if item.name == row["name"]:
-                    Root.next_schema.items.remove(item)
+        Root.next_schema.remove_items(row["name"] for row in selection)
     return False, True
 
 
@@ -141,14 +160,17 @@ def deleted_selected(n_clicks, selection):
 def add_item(_):
     """Adds an empty item to the top of the table"""
     if Root.next_schema is not None:
+        schema = Root.next_schema
         item = SchemaItem(
-            name="<new item name>",
+            name=grid_helpers.new_name(
+                "<new item name>", lambda name: schema.get_item(name) is not None
+            ),
             desc="<add description here>",
             group="",
             default=None,
             type=SchemaItemType.str,
         )
-        Root.next_schema.items.append(item)
+        Root.next_schema.add_item(item)
         return {
             "add": [item.to_dict()],
         }
@@ -163,17 +185,43 @@ def add_item(_):
         allow_duplicate=True,
     ),
     Input("item-data-grid", "cellValueChanged"),
-    State("item-data-grid", "rowData"),
     prevent_initial_call=True,
 )
-def update(_, rows):
+def update(changes):
+    """Applies the edited cells to the items, found by name"""
     if Root.next_schema is not None:
-        Root.next_schema.items.clear()
-        for row in rows:
-            Root.next_schema.items.append(SchemaItem.from_dict(row))
+        for name, column, value in changed_cells(changes):
+            item = Root.next_schema.get_item(name)
+            if item is None or column not in ITEM_COLUMNS:
+                continue
+            if column == "type":
+                value = SchemaItemType(value)
+            Root.next_schema.update_item(item, **{column: value})
     return False
 
 
+@callback(
+    Output("item-data-grid", "getRowsResponse"),
+    Input("item-data-grid", "getRowsRequest"),
+    prevent_initial_call=True,
+)
+def get_rows(request):
+    """Sends a block of sorted and filtered rows to a large grid"""
+    if Root.next_schema is None:
+        return {"rowData": [], "rowCount": 0}
+    schema = Root.next_schema
+    return rows().get_rows(schema.items, schema.tree_hash(), request)
+
+
+# added and deleted rows only show once a large grid reloads its blocks
+clientside_callback(
+    grid_helpers.refresh_script("item-data-grid"),
+    Input("item-data-grid", "rowTransaction"),
+    Input("item-data-grid", "deleteSelectedRows"),
+    prevent_initial_call=True,
+)
+
+
 @callback(
     Output("group-names-options", "children"),
     Input("group-names-store", "data"),
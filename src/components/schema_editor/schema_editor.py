@@ -2,17 +2,17 @@ import tkinter as tk
 from tkinter import filedialog
 
 import dash_bootstrap_components as dbc
-from dash import Input, Output, callback, html
-
-from src.app_state import Root
-from src.helpers.form import basic_text_input, set_if_valid
-from src.helpers.validators import (
-    validate_alpha_num,
-    validate_not_blank,
-    validate_version_number,
+from dash import Input, Output, State, callback, dcc, html
+
+from src.app_state import DISK_CHECK_SECONDS, Root, workspace
+from src.helpers.form import (
+    basic_text_input,
+    clientside_validation,
+    edit_finished,
+    set_if_valid,
 )
+from src.helpers.validators import ALPHA_NUM, NOT_BLANK, VERSION_NUMBER
 from src.model import config as config_factory
-from src.model import schema as schema_factory
 
 from . import group_editor, item_editor
 
@@ -30,12 +30,11 @@ def name_input(value: str) -> dbc.Row:
     )
 
 
-@callback(
-    Output("name", "invalid"),
-    Input("name", "value"),
-)
+clientside_validation("name", ALPHA_NUM)
+
+
 def validate_and_set_name(text: str) -> bool:
-    return not set_if_valid(Root.next_schema, "name", text, validate_alpha_num)
+    return not set_if_valid(Root.next_schema, "name", text, ALPHA_NUM)
 
 
 # ---------------------------------------------------------------------------------------------------
@@ -51,12 +50,11 @@ def desc_input(value: str) -> dbc.Row:
     )
 
 
-@callback(
-    Output("desc", "invalid"),
-    Input("desc", "value"),
-)
+clientside_validation("desc", NOT_BLANK)
+
+
 def validate_and_set_desc(text: str) -> bool:
-    return not set_if_valid(Root.next_schema, "desc", text, validate_not_blank)
+    return not set_if_valid(Root.next_schema, "desc", text, NOT_BLANK)
 
 
 # ---------------------------------------------------------------------------------------------------
@@ -72,12 +70,11 @@ def version_input(value: str) -> dbc.Row:
     )
 
 
-@callback(
-    Output("version", "invalid"),
-    Input("version", "value"),
-)
+clientside_validation("version", VERSION_NUMBER)
+
+
 def validate_and_set_version(text: str) -> bool:
-    return not set_if_valid(Root.next_schema, "version", text, validate_version_number)
+    return not set_if_valid(Root.next_schema, "version", text, VERSION_NUMBER)
 
 
 # ---------------------------------------------------------------------------------------------------
@@ -101,16 +98,39 @@ def save_button() -> html.Div:
     )
 
 
+def needs_save() -> bool:
+    if Root.schema is None or Root.next_schema is None:
+        return Root.schema is Root.next_schema
+    # tree hashes only rehash what was edited, not the whole schema
+    return Root.schema.tree_hash() == Root.next_schema.tree_hash()
+
+
+def set_fields(name: str | None, desc: str | None, version: str | None) -> None:
+    """Sets the valid fields of the form on the edited schema"""
+    for text, set_field in (
+        (name, validate_and_set_name),
+        (desc, validate_and_set_desc),
+        (version, validate_and_set_version),
+    ):
+        if text is not None:
+            set_field(text)
+
+
+# the browser validates each keystroke, the schema is only updated once a field
+# has been edited
 @callback(
     Output("save-button", "disabled"),
-    [Input("name", "value"), Input("desc", "value"), Input("version", "value")],
+    inputs=dict(
+        edited=edit_finished("name") + edit_finished("desc") + edit_finished("version"),
+        name=State("name", "value"),
+        desc=State("desc", "value"),
+        version=State("version", "value"),
+    ),
     prevent_initial_call=True,
 )
-def needs_save(name: str, desc: str, value: str) -> bool:
-    if Root.schema == Root.next_schema:
-        return True
-    else:
-        return False
+def sync_fields(edited: list, name: str, desc: str, version: str) -> bool:
+    set_fields(name, desc, version)
+    return needs_save()
 
 
 @callback(
@@ -123,9 +143,17 @@ def needs_save(name: str, desc: str, value: str) -> bool:
     Output("alert-error", "is_open"),
     Output("alert-error", "children"),
     Input("save-button", "n_clicks"),
+    State("name", "value"),
+    State("desc", "value"),
+    State("version", "value"),
     prevent_initial_call=True,
 )
-def save(n_clicks: bool):
+def save(
+    n_clicks: bool,
+    name: str | None = None,
+    desc: str | None = None,
+    version: str | None = None,
+):
     if Root.schema_filename is None:
         alert = html.Div(
             [
@@ -156,6 +184,8 @@ def save(n_clicks: bool):
             alert,
         )
 
+    # the click may come before the sync of the field just edited
+    set_fields(name, desc, version)
     if not Root.next_schema.save(Root.schema_filename):
         alert = html.Div(
             [html.I(className="bi bi-exclamation-triangle me-2 error-icon")]
@@ -173,6 +203,7 @@ def save(n_clicks: bool):
         )
     else:
         Root.schema = Root.next_schema.copy()
+        Root.loaded("schema")
         return True, True, False, []
 
 
@@ -201,6 +232,7 @@ def click_export_config_button(n_clicks: int):
             Root.config_filename = filename
             Root.next_config = Root.config.copy()
             Root.next_config.save(Root.config_filename)
+            Root.loaded("config")
 
         return True
     return False
@@ -239,17 +271,37 @@ def alerts() -> html.Div:
                 is_open=False,
                 duration=4000,
             ),
+            dbc.Alert(
+                [
+                    html.I(className="bi bi-exclamation-triangle me-2"),
+                    f"Schema file {Root.schema_filename} changed on disk. Reload"
+                    " the page to edit the new version, saving overwrites it.",
+                ],
+                id="alert-disk",
+                is_open=False,
+                color="warning",
+            ),
+            dcc.Interval(id="disk-check", interval=DISK_CHECK_SECONDS * 1000),
         ]
     )
 
 
+@callback(
+    Output("alert-disk", "is_open"),
+    Input("disk-check", "n_intervals"),
+    prevent_initial_call=True,
+)
+def check_disk(n_intervals: int) -> bool:
+    return Root.schema_changed_on_disk
+
+
 # ---------------------------------------------------------------------------------------------------
 # Main Page Layout
 # ---------------------------------------------------------------------------------------------------
 def layout(fn: str) -> dbc.Form:
     Root.schema_filename = fn
     try:
-        Root.schema = schema_factory.load(Root.schema_filename)
+        Root.schema = workspace.schema(Root.schema_filename)
     except FileNotFoundError:
         return dbc.Form(
             dbc.Alert(
@@ -261,7 +313,10 @@ def layout(fn: str) -> dbc.Form:
             )
         )
 
+    # hashed before copying, so both snapshots share the hashes
+    Root.schema.build_hashes()
     Root.next_schema = Root.schema.copy()
+    Root.loaded("schema")
 
     return dbc.Form(
         [
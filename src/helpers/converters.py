@@ -0,0 +1,63 @@
+"""Converters from stored values to native python values
+
+Values come out of JSON files and the grid editors as strings like "1" or
+"true". Each converter accepts what the matching validator in
+`src.helpers.validators` accepts, plus values that already have the native
+type, and raises ValueError for anything else. None is left as None.
+"""
+
+from typing import Any, Callable, Dict
+
+import src.helpers.validators as validators
+
+_is_int = validators.type_validator(int)
+_is_float = validators.type_validator(float)
+
+
+def _to_str(value: Any) -> Any:
+    if type(value) is str or value is None:
+        return value
+    raise ValueError(f"{value!r} is not a String")
+
+
+def _to_int(value: Any) -> Any:
+    if type(value) is int or value is None:
+        return value
+    if type(value) is str and _is_int(value):
+        return int(value)
+    raise ValueError(f"{value!r} is not an Integer")
+
+
+def _to_float(value: Any) -> Any:
+    if type(value) is float or value is None:
+        return value
+    if type(value) is int or (type(value) is str and _is_float(value)):
+        return float(value)
+    raise ValueError(f"{value!r} is not a Float")
+
+
+def _to_bool(value: Any) -> Any:
+    if type(value) is bool or value is None:
+        return value
+    if value in ("true", "1"):
+        return True
+    if value in ("false", "0"):
+        return False
+    raise ValueError(f"{value!r} is not a Boolean")
+
+
+CONVERTERS: Dict[type, Callable[[Any], Any]] = {
+    str: _to_str,
+    int: _to_int,
+    float: _to_float,
+    bool: _to_bool,
+}
+
+
+def type_converter(type: type) -> Callable[[Any], Any]:
+    """Returns a function converting a stored value to the native type"""
+    return CONVERTERS[type]
+
+
+def to_native(value: Any, type: type) -> Any:
+    return CONVERTERS[type](value)
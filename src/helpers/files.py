@@ -0,0 +1,101 @@
+"""Atomic, skip-if-unchanged file writes
+
+`save_text` writes to a temporary file in the destination directory, flushes it
+to disk and renames it over the destination, so a crash leaves either the old
+or the new file, never a truncated one. It remembers the hash of what it wrote
+to each file, with the file's modification time and size, and writes nothing
+when asked to write the same text again to a file nobody changed since. Unchanged
+documents then keep their modification time and do not trigger reloads.
+"""
+
+import hashlib
+import os
+import secrets
+import threading
+import time
+from typing import Dict, NamedTuple, Tuple
+
+
+class SaveStats(NamedTuple):
+    filename: str
+    bytes_written: int
+    # seconds spent hashing and writing
+    elapsed: float
+    # True if the file already held the text and was not written
+    skipped: bool
+
+
+_written: Dict[str, Tuple[str, Tuple[int, int]]] = {}
+_lock = threading.Lock()
+
+
+def _version(st: os.stat_result) -> Tuple[int, int]:
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _create_temp(directory: str, name: str) -> Tuple[int, str]:
+    """Creates a temporary file next to `name`, with the mode open() would give"""
+    while True:
+        tmp = os.path.join(directory, f".{name}.{secrets.token_hex(4)}.tmp")
+        try:
+            # the kernel applies the umask, like it does for open()
+            return os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666), tmp
+        except FileExistsError:
+            continue
+
+
+def write_atomic(filename: str, data: bytes) -> os.stat_result:
+    """Replaces a file with `data`, returns the status of the new file"""
+    directory = os.path.dirname(os.path.abspath(filename))
+    try:
+        mode: int | None = os.stat(filename).st_mode & 0o7777
+    except FileNotFoundError:
+        mode = None
+    fd, tmp = _create_temp(directory, os.path.basename(filename))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            if mode is not None:
+                # the replaced file keeps its permissions
+                os.fchmod(f.fileno(), mode)
+            os.fsync(f.fileno())
+            st = os.fstat(f.fileno())
+        os.replace(tmp, filename)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    # make the rename itself durable
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return st
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+    return st
+
+
+def save_text(filename: str, text: str) -> SaveStats:
+    """Writes text atomically, unless the file already holds it"""
+    start = time.perf_counter()
+    data = text.encode()
+    digest = hashlib.sha256(data).hexdigest()
+    path = os.path.realpath(filename)
+
+    with _lock:
+        last = _written.get(path)
+    if last is not None and last[0] == digest:
+        try:
+            if _version(os.stat(path)) == last[1]:
+                return SaveStats(filename, 0, time.perf_counter() - start, True)
+        except FileNotFoundError:
+            pass
+
+    st = write_atomic(path, data)
+    with _lock:
+        _written[path] = (digest, _version(st))
+    return SaveStats(filename, len(data), time.perf_counter() - start, False)
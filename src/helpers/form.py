@@ -1,8 +1,11 @@
 """A few helpers to clean up form creation"""
 
-from typing import Any, Callable
+from typing import Any, Callable, List
 
 import dash_bootstrap_components as dbc
+from dash import Input, Output, clientside_callback
+
+from src.helpers.validators import Rule
 
 
 def basic_text_input(
@@ -42,3 +45,17 @@ def set_if_valid(
         return True
     else:
         return False
+
+
+def clientside_validation(attribute: str, rule: Rule) -> None:
+    """Marks a text input invalid in the browser, without a server round trip"""
+    clientside_callback(
+        rule.clientside(),
+        Output(attribute, "invalid"),
+        Input(attribute, "value"),
+    )
+
+
+def edit_finished(attribute: str) -> List[Input]:
+    """Inputs firing once per edit of a text input: when it loses focus or on Enter"""
+    return [Input(attribute, "n_blur"), Input(attribute, "n_submit")]
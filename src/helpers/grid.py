@@ -0,0 +1,307 @@
+"""Helpers for the AG Grid editors
+
+The grids report each edit through their `cellValueChanged` property: a list
+with, per edited cell, the column, the old and new value and the data of the
+row after the edit. Callbacks apply those cells to the model instead of reading
+back every row of the grid.
+
+Large grids use the infinite row model, see `RowSource`.
+"""
+
+import bisect
+import json
+import threading
+from itertools import chain
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Sequence, Set, Tuple
+
+
+class CellChange(NamedTuple):
+    # the name of the row's record before the edit
+    name: str
+    column: str
+    value: Any
+
+
+def changed_cells(changes: List[Dict[str, Any]] | None) -> Iterator[CellChange]:
+    """Yields the edited cells of a cellValueChanged event, in order"""
+    for change in changes or []:
+        column = change.get("colId")
+        row = change.get("data") or {}
+        if column is None or column not in row:
+            continue
+        # renaming a record changes the name it is found by
+        name = change.get("oldValue") if column == "name" else row.get("name")
+        yield CellChange(name, column, row[column])
+
+
+def new_name(placeholder: str, taken: Callable[[str], bool]) -> str:
+    """A name for an added row, numbered if the placeholder is taken
+
+    Edits find their record by name, so each added row needs its own.
+    """
+    name, number = placeholder, 1
+    while taken(name):
+        number += 1
+        name = f"{placeholder[:-1]} {number}>"
+    return name
+
+
+# -----------------------------------------------------------------------------------------------
+# Infinite row model
+#
+# A grid with more than INFINITE_ROWS rows uses AG Grid's infinite row model: it
+# asks for blocks of BLOCK_SIZE rows through its getRowsRequest property, with
+# its sort and filter model, and a callback answers from a RowSource. Only the
+# blocks on screen are serialized and sent to the browser.
+# -----------------------------------------------------------------------------------------------
+INFINITE_ROWS = 1000
+BLOCK_SIZE = 100
+# blocks the browser keeps, the others are requested again when scrolled to
+MAX_BLOCKS = 10
+
+_NUMBER_FILTERS: Dict[str, Callable[[float, float, float], bool]] = {
+    "equals": lambda value, a, b: value == a,
+    "notEqual": lambda value, a, b: value != a,
+    "lessThan": lambda value, a, b: value < a,
+    "lessThanOrEqual": lambda value, a, b: value <= a,
+    "greaterThan": lambda value, a, b: value > a,
+    "greaterThanOrEqual": lambda value, a, b: value >= a,
+    "inRange": lambda value, a, b: a <= value <= b,
+}
+
+_TEXT_FILTERS: Dict[str, Callable[[str, str], bool]] = {
+    "contains": lambda value, text: text in value,
+    "notContains": lambda value, text: text not in value,
+    "equals": lambda value, text: value == text,
+    "notEqual": lambda value, text: value != text,
+    "startsWith": lambda value, text: value.startswith(text),
+    "endsWith": lambda value, text: value.endswith(text),
+    "blank": lambda value, text: value == "",
+    "notBlank": lambda value, text: value != "",
+}
+
+
+class _Index(NamedTuple):
+    """The records of a column in the order of _sort_key"""
+
+    order: List[int]
+    # the lower case text of each value, in that order
+    keys: List[str]
+    # numbers come first, then text from text_start to text_end, then blanks
+    text_start: int
+    text_end: int
+
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    """Orders numbers numerically, then text, then blanks, like the grid"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, value)
+    if value is None or value == "":
+        return (2, "")
+    return (1, str(value).lower())
+
+
+def _text(value: Any) -> str:
+    return "" if value is None else str(value).lower()
+
+
+class RowSource:
+    """Answers the block requests of an infinite grid from a list of records
+
+    `columns` maps each column id to a function returning the value of that
+    column for a record. The columns are read once per version of the records,
+    with a sorted index per column, built when the grid first sorts or filters
+    by it. Equality and prefix filters use the index, the other filters scan the
+    column. The last sorted and filtered order is kept, so scrolling only slices
+    it.
+
+    The cache is of one document: each session keeps its own RowSource, see
+    `EditorState.cache`. Requests are answered one at a time, as the browser
+    asks for several blocks at once.
+    """
+
+    def __init__(
+        self,
+        columns: Dict[str, Callable[[Any], Any]],
+        to_row: Callable[[Any], Dict[str, Any]],
+    ):
+        self.columns = columns
+        self.to_row = to_row
+        self._version: Any = None
+        self._values: Dict[str, List[Any]] = {}
+        self._indexes: Dict[str, _Index] = {}
+        self._query: Tuple[str, str] | None = None
+        self._order: List[int] = []
+        self._lock = threading.Lock()
+
+    def _reset(self, version: Any) -> None:
+        if version != self._version:
+            self._version = version
+            self._values = {}
+            self._indexes = {}
+            self._query = None
+
+    def _column(self, records: Sequence[Any], column: str) -> List[Any]:
+        values = self._values.get(column)
+        if values is None:
+            values = self._values[column] = list(map(self.columns[column], records))
+        return values
+
+    def _index(self, records: Sequence[Any], column: str) -> "_Index":
+        index = self._indexes.get(column)
+        if index is None:
+            values = self._column(records, column)
+            keys = sorted((_sort_key(value), i) for i, value in enumerate(values))
+            kinds = [key[0][0] for key in keys]
+            index = self._indexes[column] = _Index(
+                [i for _, i in keys],
+                [_text(values[i]) for _, i in keys],
+                bisect.bisect_left(kinds, 1),
+                bisect.bisect_left(kinds, 2),
+            )
+        return index
+
+    def _match(
+        self, records: Sequence[Any], column: str, condition: Dict[str, Any]
+    ) -> Set[int]:
+        """Positions of the records that pass one filter condition"""
+        if "conditions" in condition:
+            matches = [self._match(records, column, c) for c in condition["conditions"]]
+            if condition.get("operator") == "OR":
+                return set().union(*matches)
+            return set.intersection(*matches) if matches else set()
+
+        kind = condition.get("type", "contains")
+        values = self._column(records, column)
+        if condition.get("filterType") == "number":
+            test = _NUMBER_FILTERS.get(kind)
+            if test is None:
+                return set(range(len(values)))
+            a, b = condition.get("filter"), condition.get("filterTo")
+            matched = set()
+            for i, value in enumerate(values):
+                try:
+                    if test(float(value), a, b):
+                        matched.add(i)
+                except (TypeError, ValueError):
+                    pass
+            return matched
+
+        text = _text(condition.get("filter"))
+        if kind in ("equals", "startsWith"):
+            index = self._index(records, column)
+            keys = index.keys
+            start = bisect.bisect_left(keys, text, index.text_start, index.text_end)
+            if kind == "equals":
+                end = bisect.bisect_right(keys, text, start, index.text_end)
+            else:
+                end = bisect.bisect_left(keys, text + "\uffff", start, index.text_end)
+            matched = set(index.order[start:end])
+            # numbers and blanks are not in text order, they are tested one by one
+            test = _TEXT_FILTERS[kind]
+            for i in chain(range(index.text_start), range(index.text_end, len(keys))):
+                if test(keys[i], text):
+                    matched.add(index.order[i])
+            return matched
+        test = _TEXT_FILTERS.get(kind, _TEXT_FILTERS["contains"])
+        return {i for i, value in enumerate(values) if test(_text(value), text)}
+
+    def _sorted(
+        self,
+        records: Sequence[Any],
+        sort_model: List[Dict[str, Any]],
+        filter_model: Dict[str, Any],
+    ) -> List[int]:
+        matched: Set[int] | None = None
+        for column, condition in filter_model.items():
+            if column in self.columns:
+                found = self._match(records, column, condition)
+                matched = found if matched is None else matched & found
+
+        sort_model = [s for s in sort_model if s.get("colId") in self.columns]
+        if len(sort_model) == 1:
+            order = self._index(records, sort_model[0]["colId"]).order
+            if sort_model[0].get("sort") == "desc":
+                order = order[::-1]
+        elif sort_model:
+            order = list(range(len(records)))
+            # stable sorts, the last key first
+            for sort in reversed(sort_model):
+                values = self._column(records, sort["colId"])
+                order.sort(
+                    key=lambda i: _sort_key(values[i]),
+                    reverse=sort.get("sort") == "desc",
+                )
+        else:
+            order = list(range(len(records)))
+        if matched is not None:
+            order = [i for i in order if i in matched]
+        return order
+
+    def get_rows(
+        self, records: Sequence[Any], version: Any, request: Dict[str, Any] | None
+    ) -> Dict[str, Any]:
+        """The getRowsResponse for a getRowsRequest
+
+        `version` must change whenever the records do, the tree hash of the
+        document for example.
+        """
+        request = request or {}
+        sort_model = request.get("sortModel") or []
+        filter_model = request.get("filterModel") or {}
+        query = (
+            json.dumps(sort_model, sort_keys=True),
+            json.dumps(filter_model, sort_keys=True),
+        )
+        start = request.get("startRow") or 0
+        end = request.get("endRow") or start + BLOCK_SIZE
+        with self._lock:
+            self._reset(version)
+            if query != self._query:
+                self._order = self._sorted(records, sort_model, filter_model)
+                self._query = query
+            order = self._order
+            return {
+                "rowData": [self.to_row(records[i]) for i in order[start:end]],
+                "rowCount": len(order),
+            }
+
+
+def grid_props(
+    n_rows: int, rows: Callable[[], List[Dict[str, Any]]], options: Dict[str, Any]
+) -> Dict[str, Any]:
+    """AgGrid properties for a grid of `n_rows` rows
+
+    Up to INFINITE_ROWS rows, every row is sent with the layout and the grid
+    grows to fit them. Above, the grid has a fixed height and requests its rows
+    block by block.
+    """
+    if n_rows <= INFINITE_ROWS:
+        return {
+            "rowData": rows(),
+            "dashGridOptions": options,
+            "style": {"height": None},
+        }
+    options = {key: value for key, value in options.items() if key != "domLayout"}
+    options.update(
+        cacheBlockSize=BLOCK_SIZE,
+        maxBlocksInCache=MAX_BLOCKS,
+        infiniteInitialRowCount=BLOCK_SIZE,
+    )
+    return {
+        "rowModelType": "infinite",
+        "dashGridOptions": options,
+        "style": {"height": "70vh"},
+    }
+
+
+def refresh_script(grid_id: str) -> str:
+    """A clientside callback reloading the blocks of an infinite grid"""
+    return f"""
+    async function () {{
+        const api = await dash_ag_grid.getApiAsync("{grid_id}");
+        if (api.getGridOption("rowModelType") === "infinite") {{
+            api.refreshInfiniteCache();
+        }}
+    }}
+    """
@@ -1,28 +1,62 @@
 """A set of validators for forms and models"""
 
+import json
 import re
-from typing import Any
+from typing import Any, Callable, Dict
+
+# Values that int() and float() accept, written the common way
+_INT = re.compile("[+-]?[0-9]+")
+_FLOAT = re.compile("[+-]?(?:[0-9]+\\.[0-9]*|\\.[0-9]+)(?:[eE][+-]?[0-9]+)?")
+_EXPONENT = re.compile("[+-]?[0-9]+[eE][+-]?[0-9]+")
+_DIGIT = re.compile("\\d")
+# without digits, float() only accepts nan, inf and infinity
+_MAYBE_NUMBER = re.compile("\\d|nan|inf", re.IGNORECASE)
+_BOOLEANS = frozenset(["true", "false", "1", "0"])
+
+
+class Rule:
+    """A text rule checked by the models and, in the browser, by the forms
+
+    The pattern must match the whole text, and is written in the syntax Python
+    and JavaScript regular expressions share, so `clientside` checks the same
+    texts as the rule does.
+    """
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self._regex = re.compile(pattern)
+
+    def __call__(self, text: Any) -> bool:
+        return isinstance(text, str) and self._regex.fullmatch(text) is not None
+
+    def clientside(self) -> str:
+        """A clientside callback from an input value to its `invalid` prop"""
+        return f"""
+    function (value) {{
+        return !new RegExp("^(?:" + {json.dumps(self.pattern)} + ")$").test(value || "");
+    }}
+    """
+
+
+ALPHA_NUM = Rule("[a-zA-Z0-9_]+")
+NOT_BLANK = Rule("[\\s\\S]*\\S[\\s\\S]*")
+VERSION_NUMBER = Rule("[0-9]+\\.[0-9]+\\.[0-9]+")
 
 
 def validate_alpha_num(text: str) -> bool:
-    if re.match("^[a-zA-Z0-9_]+$", text):
-        return True
-    else:
-        return False
+    return ALPHA_NUM(text)
 
 
 def validate_not_blank(text: str) -> bool:
-    return not text.strip() == ""
+    return NOT_BLANK(text)
 
 
 def validate_version_number(text: str) -> bool:
-    if re.match("^[0-9]+\\.[0-9]+\\.[0-9]+$", text):
-        return True
-    else:
-        return False
+    return VERSION_NUMBER(text)
 
 
-def validate_type(value: Any, type: type) -> bool:
+def _validate_by_conversion(value: Any, type: type) -> bool:
+    """The reference rules, used for values the fast checks cannot decide"""
     # Check built-in conversion first
     try:
         _ = type(value)
@@ -55,3 +89,60 @@ def validate_type(value: Any, type: type) -> bool:
             pass
 
     return True
+
+
+def _is_str(value: Any) -> bool:
+    if type(value) is str:
+        if not _MAYBE_NUMBER.search(value):
+            return True
+        if _INT.fullmatch(value) or _FLOAT.fullmatch(value):
+            return False
+    return _validate_by_conversion(value, str)
+
+
+def _is_int(value: Any) -> bool:
+    if type(value) is str:
+        if value.isdecimal() or _INT.fullmatch(value):
+            return True
+        if not _DIGIT.search(value):
+            return False
+    return _validate_by_conversion(value, int)
+
+
+def _is_float(value: Any) -> bool:
+    if type(value) is str:
+        if _FLOAT.fullmatch(value) or _EXPONENT.fullmatch(value):
+            return True
+        if _INT.fullmatch(value) or not _MAYBE_NUMBER.search(value):
+            return False
+    return _validate_by_conversion(value, float)
+
+
+def _is_bool(value: Any) -> bool:
+    if type(value) is str:
+        return value in _BOOLEANS
+    return _validate_by_conversion(value, bool)
+
+
+TYPE_VALIDATORS: Dict[type, Callable[[Any], bool]] = {
+    str: _is_str,
+    int: _is_int,
+    float: _is_float,
+    bool: _is_bool,
+}
+
+
+def type_validator(type: type) -> Callable[[Any], bool]:
+    """Returns a function checking that a value is valid for the type
+
+    The checks decide common values with precompiled patterns and fall back to
+    the conversion rules of `validate_type` for anything unusual.
+    """
+    validator = TYPE_VALIDATORS.get(type)
+    if validator is None:
+        return lambda value: _validate_by_conversion(value, type)
+    return validator
+
+
+def validate_type(value: Any, type: type) -> bool:
+    return type_validator(type)(value)
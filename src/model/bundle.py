@@ -0,0 +1,68 @@
+"""Compiles configs into flat, typed, read-only bundles
+
+At run time a flow only needs the effective value of each item. `save` writes
+them, converted to their native types, with just enough schema information to
+check them, so they can be read back with `src.runtime.bundle` without loading
+the Config and Schema classes. `publish` shares them with worker processes
+through `src.runtime.shared` instead of a file.
+"""
+
+import json
+from typing import Any, Dict, Mapping
+
+import src.helpers.converters as converters
+import src.helpers.files as files
+from src.model.config import Config
+from src.model.schema import NATIVE_TYPES
+from src.runtime.bundle import FORMAT, VERSION
+from src.runtime.shared import Publisher
+
+
+def to_dict(config: Config, values: Mapping[str, Any] | None = None) -> dict:
+    """Returns the bundle of a config
+
+    `values` optionally replaces the values of the config items, for example
+    with the effective values resolved by a ConfigTree. A value that does not
+    match the type of its item raises ValueError.
+    """
+    if config.schema is None:
+        raise FileNotFoundError(f"Schema {config.schema_path} does not exist")
+
+    types: Dict[str, str] = {}
+    native: Dict[str, Any] = {}
+    for item in config.items:
+        schema_item = item.schema_item
+        value = item.value if values is None else values[schema_item.name]
+        try:
+            native[schema_item.name] = converters.to_native(
+                value, NATIVE_TYPES[schema_item.type]
+            )
+        except ValueError as e:
+            raise ValueError(f"Item {schema_item.name}: {e}") from None
+        types[schema_item.name] = schema_item.type.value
+
+    return {
+        "format": FORMAT,
+        "version": VERSION,
+        "name": config.name,
+        "schema": config.schema.name,
+        "schemaVersion": config.schema.version,
+        "types": types,
+        "values": native,
+    }
+
+
+def save(
+    config: Config, filename: str, values: Mapping[str, Any] | None = None
+) -> None:
+    """Writes the bundle of a config, see `to_dict`"""
+    files.save_text(
+        filename, json.dumps(to_dict(config, values), separators=(",", ":"))
+    )
+
+
+def publish(
+    publisher: Publisher, config: Config, values: Mapping[str, Any] | None = None
+) -> int:
+    """Publishes the bundle of a config in shared memory, returns its version"""
+    return publisher.publish(to_dict(config, values))
@@ -0,0 +1,90 @@
+"""Process-wide cache of parsed schema files
+
+Every Config loads the schema it references, so loading many configs that share
+one schema would parse it again and again. `load` keeps the most recently used
+schemas keyed by their resolved path, modification time and size, and hands out
+copy-on-write snapshots of them: a config can edit its schema without changing
+the cached one, and nothing is copied until it does. With the sidecar cache
+enabled, a schema that is not in memory is read from its binary copy, see
+src/model/sidecar.py.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Tuple
+
+import src.model.schema as schema_factory
+import src.model.sidecar as sidecar
+from src.model.schema import Schema
+
+MAXSIZE = 64
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class SchemaCache:
+    """A bounded LRU cache of schemas, invalidated when the file changes"""
+
+    def __init__(self, maxsize: int = MAXSIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._schemas: OrderedDict[str, Tuple[Tuple[int, int], Schema]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, filename: str) -> Schema:
+        """Like `schema.load`, but only parses a file when it has changed"""
+        path = os.path.realpath(filename)
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._schemas.get(path)
+            if cached is not None and cached[0] == version:
+                self._schemas.move_to_end(path)
+                self.hits += 1
+                return cached[1].copy()
+            self.misses += 1
+
+        if sidecar.enabled:
+            schema = sidecar.load_schema(path)
+        else:
+            schema = schema_factory.load(path)
+        schema.build_indexes()
+        with self._lock:
+            self._schemas[path] = (version, schema)
+            self._schemas.move_to_end(path)
+            while len(self._schemas) > self.maxsize:
+                self._schemas.popitem(last=False)
+        return schema.copy()
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._schemas))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._schemas.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+schemas = SchemaCache()
+
+
+def load(filename: str) -> Schema:
+    """Loads a schema through the process-wide cache"""
+    return schemas.load(filename)
+
+
+def info() -> CacheInfo:
+    """Returns the hit and miss counters of the process-wide cache"""
+    return schemas.info()
+
+
+def clear() -> None:
+    schemas.clear()
@@ -0,0 +1,293 @@
+"""Compiled JSON codecs for the model dataclasses
+
+dataclass_wizard inspects every field on every call to `from_dict` / `to_dict`,
+and `json.dumps(..., indent=4)` falls back to the pure python encoder. The codecs
+in this module look at a dataclass once and generate three specialized functions
+for it:
+
+* `encode` builds the same dict as `JSONWizard.to_dict`
+* `write` renders the same text as `json.dumps(obj.to_dict(), indent=4)`
+* `decode` builds the dataclass from a dict, like `JSONWizard.from_dict`
+
+Any input the fast decoder does not recognise (missing keys, values needing type
+coercion, ...) is handed to `JSONWizard.from_dict`, so behaviour and error
+messages are unchanged.
+"""
+
+import dataclasses
+import json
+import threading
+import types
+import typing
+from enum import Enum
+from json.encoder import encode_basestring_ascii
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple
+
+from dataclass_wizard.models import JSONField
+from dataclass_wizard.utils.string_conv import to_camel_case
+
+INDENT = "    "
+
+
+class _Fallback(Exception):
+    """Raised by a generated decoder when the input needs the generic path"""
+
+
+class _Converter(NamedTuple):
+    """Source generators for converting one value, given its expression"""
+
+    encode: Callable[[str], str]
+    write: Callable[[str, str], str]
+    decode: Callable[[str], str]
+
+
+def _raise_fallback() -> Any:
+    raise _Fallback
+
+
+def _enum_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _write_value(value: Any, ind: str) -> str:
+    """Renders a JSON value exactly like `json.dumps(..., indent=4)`"""
+    kind = type(value)
+    if kind is str:
+        return encode_basestring_ascii(value)
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if kind is int:
+        return int.__repr__(value)
+    if kind is float and value - value == 0.0:
+        return float.__repr__(value)
+    return json.dumps(value, indent=4).replace("\n", "\n" + ind)
+
+
+def _write_list(values: List[Any], ind: str, write: Callable[[Any, str], str]) -> str:
+    if not values:
+        return "[]"
+    inner = ind + INDENT
+    return (
+        "[\n"
+        + inner
+        + (",\n" + inner).join([write(value, inner) for value in values])
+        + "\n"
+        + ind
+        + "]"
+    )
+
+
+def _is_dumped(field: dataclasses.Field) -> bool:
+    if isinstance(field, JSONField):
+        return field.json.dump
+    return True
+
+
+def _unwrap_optional(hint: Any) -> Tuple[Any, bool]:
+    """Returns (inner type, True) for `X | None` or `Optional[X]`"""
+    origin = typing.get_origin(hint)
+    if origin is typing.Union or origin is types.UnionType:
+        args = typing.get_args(hint)
+        if len(args) == 2 and type(None) in args:
+            return next(arg for arg in args if arg is not type(None)), True
+    return hint, False
+
+
+class Codec:
+    """A specialized encoder/decoder for one dataclass"""
+
+    def __init__(self, cls: type):
+        self.cls = cls
+        self.encode: Callable[[Any], Dict[str, Any]]
+        self.write: Callable[[Any, str], str]
+        self._decode: Callable[[Dict[str, Any]], Any]
+
+    def decode(self, data: Dict[str, Any]) -> Any:
+        try:
+            return self._decode(data)
+        except _Fallback:
+            return self.cls.from_dict(data)
+
+    def compile(self) -> None:
+        hints = typing.get_type_hints(self.cls)
+        namespace: Dict[str, Any] = {
+            "_cls": self.cls,
+            "_Fallback": _Fallback,
+            "_raise_fallback": _raise_fallback,
+            "_enum_value": _enum_value,
+            "_write_value": _write_value,
+            "_write_list": _write_list,
+        }
+        encode_entries: List[str] = []
+        write_parts: List[str] = []
+        decode_lines: List[str] = []
+        init_args: List[str] = []
+
+        for i, field in enumerate(dataclasses.fields(self.cls)):
+            if not field.init or not _is_dumped(field):
+                continue
+
+            key = to_camel_case(field.name)
+            hint, optional = _unwrap_optional(hints[field.name])
+            converter = _converter(hint, f"_t{i}", namespace)
+            attr = f"obj.{field.name}"
+            value = f"v{i}"
+
+            encoded = converter.encode(attr)
+            if optional and encoded != attr:
+                encoded = f"(None if {attr} is None else {encoded})"
+            encode_entries.append(f"{key!r}: {encoded}")
+
+            written = converter.write(attr, "inner")
+            if optional:
+                written = f"('null' if {attr} is None else {written})"
+            separator = "{\n" if not write_parts else ",\n"
+            write_parts.append(f"{separator!r} + inner + {json.dumps(key) + ': '!r}")
+            write_parts.append(written)
+
+            required = (
+                field.default is dataclasses.MISSING
+                and field.default_factory is dataclasses.MISSING
+            )
+            lookup = f"data[{key!r}]"
+            if key != field.name:
+                lookup = f"(data[{key!r}] if {key!r} in data else data[{field.name!r}])"
+            decoded = converter.decode(value)
+            if optional:
+                decoded = f"(None if {value} is None else {decoded})"
+            if required:
+                decode_lines.append(f"        {value} = {lookup}")
+                if decoded != value:
+                    decode_lines.append(f"        {value} = {decoded}")
+                init_args.append(f"{field.name}={value}")
+            else:
+                decode_lines.append(
+                    f"        if {key!r} in data or {field.name!r} in data:"
+                )
+                decode_lines.append(f"            {value} = {lookup}")
+                decode_lines.append(f"            kwargs[{field.name!r}] = {decoded}")
+
+        if write_parts:
+            write_parts.append("'\\n' + ind + '}'")
+        else:
+            write_parts.append("'{}'")
+
+        source = "\n".join(
+            [
+                "def encode(obj):",
+                "    return {" + ", ".join(encode_entries) + "}",
+                "",
+                "def write(obj, ind):",
+                f"    inner = ind + {INDENT!r}",
+                "    return " + " + ".join(write_parts),
+                "",
+                "def decode(data):",
+                "    kwargs = {}",
+                "    try:",
+                *decode_lines,
+                "    except (KeyError, TypeError):",
+                "        raise _Fallback",
+                f"    return _cls({', '.join(init_args + ['**kwargs'])})",
+            ]
+        )
+        exec(compile(source, f"<codec {self.cls.__qualname__}>", "exec"), namespace)
+        self.encode = namespace["encode"]
+        self.write = namespace["write"]
+        self._decode = namespace["decode"]
+
+
+def _converter(hint: Any, name: str, namespace: Dict[str, Any]) -> _Converter:
+    """Returns the source generators for one type, registering any helpers"""
+    origin = typing.get_origin(hint)
+
+    if origin is list:
+        (item_hint,) = typing.get_args(hint) or (Any,)
+        item = _converter(item_hint, f"{name}_item", namespace)
+        namespace[f"{name}_write_item"] = eval(
+            f"lambda x, ind: {item.write('x', 'ind')}", namespace
+        )
+        return _Converter(
+            encode=lambda expr: f"[{item.encode('x')} for x in {expr}]",
+            write=lambda expr, ind: f"_write_list({expr}, {ind}, {name}_write_item)",
+            decode=lambda expr: f"[{item.decode('x')} for x in {expr}]",
+        )
+
+    if dataclasses.is_dataclass(hint):
+        namespace[f"{name}_codec"] = codec_for(hint)
+        return _Converter(
+            encode=lambda expr: f"{name}_codec.encode({expr})",
+            write=lambda expr, ind: f"{name}_codec.write({expr}, {ind})",
+            decode=lambda expr: f"{name}_codec.decode({expr})",
+        )
+
+    if isinstance(hint, type) and issubclass(hint, Enum):
+        namespace[f"{name}_enum"] = hint
+        namespace[f"{name}_members"] = hint._value2member_map_
+        return _Converter(
+            encode=lambda expr: f"_enum_value({expr})",
+            write=lambda expr, ind: f"_write_value(_enum_value({expr}), {ind})",
+            decode=lambda expr: (
+                f"({expr} if type({expr}) is {name}_enum "
+                f"else {name}_members[{expr}])"
+            ),
+        )
+
+    if hint in (str, int, float, bool):
+        namespace[f"{name}_type"] = hint
+        return _Converter(
+            encode=lambda expr: expr,
+            write=lambda expr, ind: f"_write_value({expr}, {ind})",
+            decode=lambda expr: (
+                f"({expr} if type({expr}) is {name}_type else _raise_fallback())"
+            ),
+        )
+
+    return _Converter(
+        encode=lambda expr: expr,
+        write=lambda expr, ind: f"_write_value({expr}, {ind})",
+        decode=lambda expr: expr,
+    )
+
+
+_CODECS: Dict[type, Codec] = {}
+_COMPILING: Dict[type, Codec] = {}
+_LOCK = threading.RLock()
+
+
+def codec_for(cls: type) -> Codec:
+    """Returns the codec for a dataclass, compiling it on first use"""
+    codec = _CODECS.get(cls)
+    if codec is None:
+        # other threads wait until the codec is compiled before using it
+        with _LOCK:
+            codec = _CODECS.get(cls) or _COMPILING.get(cls)
+            if codec is None:
+                # Registered before compiling so that classes can refer to each other
+                codec = _COMPILING[cls] = Codec(cls)
+                try:
+                    codec.compile()
+                finally:
+                    del _COMPILING[cls]
+                _CODECS[cls] = codec
+    return codec
+
+
+def encode(obj: Any) -> Dict[str, Any]:
+    """Equivalent to `obj.to_dict()` for JSONWizard dataclasses"""
+    return codec_for(type(obj)).encode(obj)
+
+
+def decode(cls: type, data: Dict[str, Any]) -> Any:
+    """Equivalent to `cls.from_dict(data)` for JSONWizard dataclasses"""
+    return codec_for(cls).decode(data)
+
+
+def dumps(obj: Any) -> str:
+    """Equivalent to `json.dumps(obj.to_dict(), indent=4)`"""
+    return codec_for(type(obj)).write(obj, "")
@@ -1,29 +1,62 @@
 """Configuration classes"""
 
+import copy
 import json
 import os
-from copy import deepcopy
 from dataclasses import dataclass, field
-from typing import Any, List
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List
 
 from dataclass_wizard import JSONWizard, json_field
 
+import src.helpers.converters as converters
+import src.helpers.files as files
 import src.helpers.validators as validators
-import src.model.schema as schema_factory
-from src.model.schema import Schema, SchemaItem, SchemaValidationError
+import src.model.cache as schema_cache
+import src.model.codec as codec
+import src.model.merkle as merkle
+from src.model.records import RecordIndex, RecordList
+from src.model.schema import NATIVE_TYPES, Schema, SchemaItem, SchemaValidationError
 
+DELTA_FORMAT = "delta"
 
-@dataclass
+
+class SchemaMismatchError(Exception):
+    """Exception raised when a delta config does not match its schema.
+
+    Attributes:
+        message -- explanation of the mismatch
+    """
+
+    def __init__(self, message):
+        self.message = message
+        super().__init__(self.message)
+
+
+@dataclass(slots=True)
 class ConfigItem(JSONWizard):
     schema_item: SchemaItem
     value: Any = None
 
     def to_dict(self) -> dict:
-        merged_dict = self.schema_item.to_dict().copy()
-        merged_dict.update(super().to_dict())
+        merged_dict = codec.encode(self.schema_item)
+        merged_dict.update(codec.encode(self))
         return merged_dict
 
 
+def _item_hash(item: ConfigItem) -> bytes:
+    schema_item = item.schema_item
+    return merkle.digest_of(
+        schema_item.name,
+        schema_item.desc,
+        schema_item.group,
+        schema_item.default,
+        schema_item.type.value,
+        schema_item.options,
+        item.value,
+    )
+
+
 @dataclass
 class Config(JSONWizard):
     name: str
@@ -36,16 +69,167 @@ class Config(JSONWizard):
     )  # type: ignore
 
     def __post_init__(self) -> None:
+        self._item_index: RecordIndex[ConfigItem] = RecordIndex(
+            attrgetter("schema_item.name"), attrgetter("schema_item.group")
+        )
+        self._item_hashes: merkle.HashTree[ConfigItem] = merkle.HashTree(_item_hash)
+        self._native: Dict[str, Any] = {}
+        self.last_save: files.SaveStats | None = None
         if os.path.exists(self.schema_path):
-            self.schema = schema_factory.load(self.schema_path)
+            self.schema = schema_cache.load(self.schema_path)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # the index relies on the revision count of a RecordList
+        if name == "items":
+            if not isinstance(value, RecordList):
+                value = RecordList(value)
+            super().__setattr__("_native", {})
+        super().__setattr__(name, value)
+
+    # -----------------------------------------------------------------------------------------------
+    # Typed access
+    #
+    # config["name"] and the get_<type> methods return the value of an item
+    # converted to the native type of its schema item. Each value is converted
+    # once and cached until it is changed with set_value or config["name"] = ...
+    # -----------------------------------------------------------------------------------------------
+    def __getitem__(self, name: str) -> Any:
+        try:
+            return self._native[name]
+        except KeyError:
+            pass
+        item = self.get_item(name)
+        if item is None:
+            raise KeyError(name)
+        schema_item = item.schema_item
+        try:
+            value = converters.to_native(item.value, NATIVE_TYPES[schema_item.type])
+        except ValueError as e:
+            raise ValueError(f"Item {name}: {e}") from None
+        self._native[name] = value
+        return value
+
+    def __setitem__(self, name: str, value: Any) -> None:
+        if self.get_item(name) is None:
+            raise KeyError(name)
+        self.set_value(name, value)
+
+    def __contains__(self, name: str) -> bool:
+        return self.get_item(name) is not None
+
+    def _get_typed(self, name: str, native: type) -> Any:
+        try:
+            value = self._native[name]
+        except KeyError:
+            value = self[name]
+        if type(value) is not native and value is not None:
+            raise TypeError(f"Item {name} is not a {native.__name__}")
+        return value
+
+    def get_str(self, name: str) -> str | None:
+        return self._get_typed(name, str)
+
+    def get_int(self, name: str) -> int | None:
+        return self._get_typed(name, int)
+
+    def get_float(self, name: str) -> float | None:
+        return self._get_typed(name, float)
+
+    def get_bool(self, name: str) -> bool | None:
+        return self._get_typed(name, bool)
+
+    # -----------------------------------------------------------------------------------------------
+    # Content hashes
+    # -----------------------------------------------------------------------------------------------
+    def build_indexes(self) -> None:
+        """Builds the name and group index now, so that copies share it"""
+        self._item_index.sync(self.items)
+
+    def build_hashes(self) -> None:
+        """Hashes every item now, so that copies share the hashes"""
+        self._item_hashes.sync(self.items)
+
+    def is_hashed(self) -> bool:
+        """True if the hashes are up to date, so comparing them is cheap"""
+        return self._item_hashes.in_sync(self.items)
+
+    def tree_hash(self) -> bytes:
+        """Hash of the content that is saved, updated as values are set
+
+        Two configs with the same tree hash save the same file. Only the items
+        changed since the last call are hashed again.
+        """
+        return merkle.document_hash(
+            (self.name, self.desc, self.schema_path),
+            self._item_hashes.root(self.items),
+        )
+
+    def changed_items(self, other: "Config") -> List[int]:
+        """Positions of the items that differ from the other config's"""
+        return self._item_hashes.diff(self.items, other._item_hashes, other.items)
+
+    def get_item(self, name: str) -> ConfigItem | None:
+        return self._item_index.get(self.items, name)
+
+    def get_group_items(self, group: str) -> List[ConfigItem]:
+        return self._item_index.in_group(self.items, group)
+
+    def set_value(self, name: str, value: Any) -> bool:
+        """Sets the value of an item, returns True if it changed"""
+        item = self.get_item(name)
+        if item is None or item.value == value:
+            return False
+        hashed = self._item_hashes.in_sync(self.items)
+        edited = self._item_index.edit(self.items, item)  # type: ignore[arg-type]
+        edited.value = value
+        self._item_hashes.replace(self.items, item, edited, hashed)
+        self._native.pop(name, None)
+        return True
+
+    def add_item(self, item: ConfigItem) -> None:
+        hashed = self._item_hashes.in_sync(self.items)
+        self._item_index.append(self.items, item)
+        self._item_hashes.append(self.items, item, hashed)
+        self._native.pop(item.schema_item.name, None)
+
+    def remove_items(self, names: Iterable[str]) -> None:
+        names = set(names)
+        self._item_index.remove(self.items, names)
+        for name in names:
+            self._native.pop(name, None)
+
+    def update_item(self, item: ConfigItem, **changes: Any) -> ConfigItem:
+        """Edits an item, copying it first if it is shared with another snapshot
+
+        `value` sets the value of the item. Other changes are made to a copy of
+        its schema item, which the schema shares. Returns the edited item, which
+        replaces `item` in this config.
+        """
+        hashed = self._item_hashes.in_sync(self.items)
+        edited = self._item_index.edit(self.items, item)  # type: ignore[arg-type]
+        old_name, old_group = edited.schema_item.name, edited.schema_item.group
+        if "value" in changes:
+            edited.value = changes.pop("value")
+        if changes:
+            schema_item = copy.copy(edited.schema_item)
+            schema_item.errors = []
+            for attribute, value in changes.items():
+                setattr(schema_item, attribute, value)
+            edited.schema_item = schema_item
+        self._item_index.rekey(self.items, edited, old_name, old_group)
+        self._item_hashes.replace(self.items, item, edited, hashed)
+        self._native.pop(old_name, None)
+        self._native.pop(edited.schema_item.name, None)
+        return edited
 
     def generate_items(self) -> None:
         if self.schema is None:
             return
 
-        self.items = []
-        for schema_item in self.schema.items:
-            self.items.append(ConfigItem(schema_item, value=schema_item.default))
+        self.items = [
+            ConfigItem(schema_item, value=schema_item.default)
+            for schema_item in self.schema.items
+        ]
 
     def sort_by_group_then_name(self) -> None:
         self.items.sort(
@@ -91,29 +275,106 @@ class Config(JSONWizard):
         return all_errors
 
     def save(self, filename: str) -> bool:
+        """Writes the config if it is valid, see `last_save` for what was done"""
         if self.validate():
-            with open(filename, "w") as f:
-                f.write(json.dumps(self.to_dict(), indent=4))
+            self.last_save = files.save_text(filename, codec.dumps(self))
             return True
         else:
             return False
 
+    def to_delta_dict(self) -> dict:
+        """Returns the config with only the values that differ from the schema"""
+        values = {}
+        for item in self.items:
+            if item.value != item.schema_item.default:
+                values[item.schema_item.name] = item.value
+
+        return {
+            "format": DELTA_FORMAT,
+            "name": self.name,
+            "desc": self.desc,
+            "schemaPath": self.schema_path,
+            "schemaHash": None if self.schema is None else self.schema.content_hash(),
+            "values": values,
+        }
+
+    def save_delta(self, filename: str) -> bool:
+        """Like save, but writes the delta format which references the schema"""
+        if self.validate():
+            text = json.dumps(self.to_delta_dict(), indent=4)
+            self.last_save = files.save_text(filename, text)
+            return True
+        else:
+            return False
+
+    def to_dict(self) -> dict:  # type: ignore[override]
+        return codec.encode(self)
+
+    def to_json(self, **kwargs: Any) -> str:  # type: ignore[override]
+        return json.dumps(self.to_dict(), **kwargs)
+
     def copy(self) -> "Config":
-        return deepcopy(self)
+        """Returns a snapshot in O(1), sharing every record until it is edited"""
+        clone = copy.copy(self)
+        clone.errors = list(self.errors)
+        clone.schema = None if self.schema is None else self.schema.copy()
+        clone.items = self.items.copy()
+        clone._item_index = self._item_index.copy(clone.items)
+        clone._item_hashes = self._item_hashes.copy(clone.items)
+        return clone
 
 
-def from_json(string: str) -> Config:
-    configs = Config.from_json(string)
-    if isinstance(configs, list):
-        # TODO: throw something
-        config = configs[0]
-    else:
-        config = configs
+def from_delta_dict(data: dict, strict: bool = False) -> Config:
+    """Resolves a delta config against the schema it references
 
+    With strict set, a schema that changed since the config was saved raises
+    SchemaMismatchError, otherwise the current schema defaults are used.
+    """
+    config = Config(data["name"], data["desc"], data["schemaPath"])
+    if config.schema is None:
+        raise FileNotFoundError(f"Schema {config.schema_path} does not exist")
+
+    if strict and data.get("schemaHash") != config.schema.content_hash():
+        raise SchemaMismatchError(
+            f"Schema {config.schema_path} changed since config {config.name} was saved"
+        )
+
+    config.generate_items()
+    missing = []
+    for name, value in data.get("values", {}).items():
+        item = config.get_item(name)
+        if item is None:
+            missing.append(name)
+        else:
+            item.value = value
+
+    if missing:
+        raise SchemaMismatchError(
+            f"Config {config.name} sets items {missing} which are not in schema {config.schema_path}"
+        )
+
+    return config
+
+
+def from_dict(data: dict, strict: bool = False) -> Config:
+    """Builds a config from its full or delta dict"""
+    config: Config
+    if data.get("format") == DELTA_FORMAT:
+        config = from_delta_dict(data, strict)
+    else:
+        config = codec.decode(Config, data)
     config.sort_by_group_then_name()
     return config
 
 
-def load(filename: str) -> Config:
+def from_json(string: str, strict: bool = False) -> Config:
+    data = json.loads(string)
+    if isinstance(data, list):
+        # TODO: throw something
+        data = data[0]
+    return from_dict(data, strict)
+
+
+def load(filename: str, strict: bool = False) -> Config:
     with open(filename) as f:
-        return from_json(f.read())
+        return from_json(f.read(), strict)
@@ -0,0 +1,194 @@
+"""Content hashes of record lists, kept up to date as records are edited
+
+`HashTree` hashes each record of a RecordList and combines the hashes in a tree
+of `FANOUT` children per node, so the hash of the whole list changes when any
+record does. Editing, replacing or appending one record rehashes that record
+and the nodes above it, O(log n). Other changes to the list are detected through
+its revision, like `RecordIndex` does, and rebuild the tree on the next use,
+rehashing only the records that are not in the tree already.
+
+Comparing the roots of two trees tells whether two lists hold the same content
+in O(1), and `diff` finds the positions that differ by descending into the
+nodes whose hashes differ. Like the indexes, a tree is only right if its records
+are edited through the owning Schema or Config.
+"""
+
+import hashlib
+from typing import Callable, Dict, Generic, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+FANOUT = 64
+DIGEST_SIZE = 16
+
+
+def digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=DIGEST_SIZE).digest()
+
+
+def digest_of(*fields: object) -> bytes:
+    """Hash of a tuple of plain values, used for records and documents"""
+    return digest(repr(fields).encode())
+
+
+_EMPTY = digest(b"")
+
+
+class HashTree(Generic[T]):
+    """The content hash of a RecordList, with copy-on-write snapshots"""
+
+    def __init__(self, key: Callable[[T], bytes]):
+        # the hash of one record
+        self.key = key
+        self._records: List[T] | None = None
+        self._revision = -1
+        # the records as they were hashed and their positions, by id
+        self._order: List[T | None] = []
+        self._positions: Dict[int, int] = {}
+        # _levels[0] holds a hash per record, the last level the root
+        self._levels: List[List[bytes]] = [[]]
+        self._shared = False
+
+    def copy(self, records: List[T]) -> "HashTree[T]":
+        """Returns a tree for a copy of the hashed list, sharing its nodes"""
+        clone: HashTree[T] = HashTree(self.key)
+        if self._records is not None:
+            clone._records = records
+            clone._revision = self._revision
+            clone._order = self._order
+            clone._positions = self._positions
+            clone._levels = self._levels
+            clone._shared = self._shared = True
+        return clone
+
+    def _own(self) -> None:
+        """Takes private copies of the nodes before changing them"""
+        if self._shared:
+            self._order = list(self._order)
+            self._positions = dict(self._positions)
+            self._levels = [list(level) for level in self._levels]
+            self._shared = False
+
+    def in_sync(self, records: List[T]) -> bool:
+        revision = getattr(records, "revision", None)
+        return (
+            revision is not None
+            and records is self._records
+            and revision == self._revision
+        )
+
+    def sync(self, records: List[T]) -> None:
+        """Builds the tree now, unless it is up to date"""
+        if self.in_sync(records):
+            return
+        order, positions, old = self._order, self._positions, self._levels[0]
+        leaves = []
+        for record in records:
+            position = positions.get(id(record))
+            if position is not None and order[position] is record:
+                leaves.append(old[position])
+            else:
+                leaves.append(self.key(record))
+
+        self._order = list(records)
+        self._positions = {id(record): i for i, record in enumerate(self._order)}
+        self._levels = [leaves]
+        while len(self._levels[-1]) > 1:
+            level = self._levels[-1]
+            self._levels.append(
+                [
+                    digest(b"".join(level[start : start + FANOUT]))
+                    for start in range(0, len(level), FANOUT)
+                ]
+            )
+        self._shared = False
+        self._records = records
+        self._revision = getattr(records, "revision", -1)
+
+    def root(self, records: List[T]) -> bytes:
+        """The hash of every record in the list, in order"""
+        self.sync(records)
+        return self._levels[-1][0] if self._levels[0] else _EMPTY
+
+    def _update(self, position: int) -> None:
+        """Rehashes the nodes above a leaf"""
+        levels = self._levels
+        level = 0
+        while len(levels[level]) > 1:
+            parent = position // FANOUT
+            start = parent * FANOUT
+            node = digest(b"".join(levels[level][start : start + FANOUT]))
+            if level + 1 == len(levels):
+                levels.append([])
+            if parent == len(levels[level + 1]):
+                levels[level + 1].append(node)
+            else:
+                levels[level + 1][parent] = node
+            position = parent
+            level += 1
+
+    def replace(self, records: List[T], old: T, new: T, in_sync: bool) -> None:
+        """Rehashes a record after it was edited, or replaced by an edited copy
+
+        `in_sync` is the value of `in_sync(records)` before the edit.
+        """
+        position = self._positions.get(id(old))
+        if position is None or self._order[position] is not old:
+            return
+        self._own()
+        if not in_sync:
+            # rehashed on the next sync
+            self._order[position] = None
+            return
+        del self._positions[id(old)]
+        self._order[position] = new
+        self._positions[id(new)] = position
+        self._levels[0][position] = self.key(new)
+        self._update(position)
+        self._revision = getattr(records, "revision", -1)
+
+    def append(self, records: List[T], record: T, in_sync: bool) -> None:
+        """Hashes a record appended to the list"""
+        if not in_sync:
+            return
+        self._own()
+        self._positions[id(record)] = len(self._order)
+        self._order.append(record)
+        self._levels[0].append(self.key(record))
+        self._update(len(self._order) - 1)
+        self._revision = getattr(records, "revision", -1)
+
+    def diff(
+        self, records: List[T], other: "HashTree[T]", other_records: List[T]
+    ) -> List[int]:
+        """Positions at which the records of two lists differ
+
+        Inserting or removing a record moves the ones after it, which all differ
+        from the records at their old positions.
+        """
+        self.sync(records)
+        other.sync(other_records)
+        a, b = self._levels, other._levels
+        if len(a[0]) != len(b[0]):
+            size = min(len(a[0]), len(b[0]))
+            changed = [i for i in range(size) if a[0][i] != b[0][i]]
+            return changed + list(range(size, max(len(a[0]), len(b[0]))))
+
+        # same size, same shape: only descend into nodes that differ
+        candidates = [0] if a[-1] != b[-1] else []
+        for level in range(len(a) - 2, -1, -1):
+            nodes_a, nodes_b = a[level], b[level]
+            candidates = [
+                child
+                for parent in candidates
+                for child in range(
+                    parent * FANOUT, min((parent + 1) * FANOUT, len(nodes_a))
+                )
+                if nodes_a[child] != nodes_b[child]
+            ]
+        return candidates
+
+
+def document_hash(fields: Tuple[object, ...], *roots: bytes) -> bytes:
+    """Combines the fields of a document with the roots of its record lists"""
+    return digest(repr(fields).encode() + b"".join(roots))
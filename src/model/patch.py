@@ -0,0 +1,422 @@
+"""Structured differences between two schemas or two configs
+
+`diff` compares two schemas, or two configs, and returns a `Patch` listing the
+document fields that changed and, per table, the records that were added,
+removed, renamed or modified, with the old and new value of each changed field.
+Records are matched by name through a dict, so a diff is O(n), and records
+shared by two snapshots, like `Root.schema` and `Root.next_schema`, are skipped
+without being compared. When both documents are hashed already, only the
+records at the positions where their hash trees differ are looked at.
+
+A record that disappears under one name and appears under another with the same
+fields is reported as renamed. A record that is renamed and edited at once is
+reported as removed and added. The order of the records is not compared.
+
+`Patch.to_dict` and `from_dict` convert a patch to and from JSON, and `apply`
+applies it to a copy of another document, for example to carry the changes
+made to one schema over to another version of it.
+"""
+
+from dataclasses import dataclass, field
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Set, Tuple
+
+from src.model.config import Config, ConfigItem
+from src.model.schema import Schema, SchemaGroup, SchemaItem, SchemaItemType
+
+FORMAT = "configtree-patch"
+VERSION = 1
+
+ADDED = "added"
+REMOVED = "removed"
+RENAMED = "renamed"
+MODIFIED = "modified"
+
+# the fields of each kind of record, besides its name, as saved to disk
+ITEM_FIELDS = ("desc", "group", "default", "type", "options")
+CONFIG_ITEM_FIELDS = ITEM_FIELDS + ("value",)
+GROUP_FIELDS = ("desc", "order")
+
+
+class PatchError(Exception):
+    """Exception raised when a patch does not apply to a document.
+
+    Attributes:
+        message -- explanation of the conflict
+    """
+
+    def __init__(self, message):
+        self.message = message
+        super().__init__(self.message)
+
+
+@dataclass
+class RecordChange:
+    """One added, removed, renamed or modified record
+
+    `fields` maps each changed field to its old and new value. An added record
+    lists every field with an old value of None, a removed one every field with
+    a new value of None.
+    """
+
+    action: str
+    name: str
+    old_name: str | None = None
+    fields: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        data: Dict[str, Any] = {"action": self.action, "name": self.name}
+        if self.old_name is not None:
+            data["oldName"] = self.old_name
+        data["fields"] = {name: list(change) for name, change in self.fields.items()}
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RecordChange":
+        fields = {name: tuple(change) for name, change in data["fields"].items()}
+        return cls(data["action"], data["name"], data.get("oldName"), fields)
+
+
+@dataclass
+class Patch:
+    """The changes that turn one schema, or config, into another"""
+
+    kind: str
+    fields: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+    groups: List[RecordChange] = field(default_factory=list)
+    items: List[RecordChange] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.fields or self.groups or self.items)
+
+    def to_dict(self) -> dict:
+        return {
+            "format": FORMAT,
+            "version": VERSION,
+            "kind": self.kind,
+            "fields": {name: list(change) for name, change in self.fields.items()},
+            "groups": [change.to_dict() for change in self.groups],
+            "items": [change.to_dict() for change in self.items],
+        }
+
+    def summary(self) -> List[str]:
+        """One line per change, for reviews and logs"""
+        lines = [
+            f"{self.kind} {name}: {old!r} -> {new!r}"
+            for name, (old, new) in self.fields.items()
+        ]
+        for table, changes in (("group", self.groups), ("item", self.items)):
+            for change in changes:
+                if change.action == RENAMED:
+                    lines.append(f"{table} {change.old_name} renamed to {change.name}")
+                elif change.action == MODIFIED:
+                    edits = ", ".join(
+                        f"{name} {old!r} -> {new!r}"
+                        for name, (old, new) in change.fields.items()
+                    )
+                    lines.append(f"{table} {change.name} modified: {edits}")
+                else:
+                    lines.append(f"{table} {change.name} {change.action}")
+        return lines
+
+
+def from_dict(data: dict) -> Patch:
+    if data.get("format") != FORMAT or data.get("version") != VERSION:
+        raise PatchError(
+            f"Not a version {VERSION} patch: {data.get('format')} "
+            f"version {data.get('version')}"
+        )
+    return Patch(
+        data["kind"],
+        {name: tuple(change) for name, change in data["fields"].items()},
+        [RecordChange.from_dict(change) for change in data["groups"]],
+        [RecordChange.from_dict(change) for change in data["items"]],
+    )
+
+
+# -----------------------------------------------------------------------------------------------
+# Diff
+# -----------------------------------------------------------------------------------------------
+def _item_values(item: SchemaItem) -> Tuple[Any, ...]:
+    return (item.desc, item.group, item.default, item.type.value, item.options)
+
+
+def _config_item_values(item: ConfigItem) -> Tuple[Any, ...]:
+    return _item_values(item.schema_item) + (item.value,)
+
+
+def _group_values(group: SchemaGroup) -> Tuple[Any, ...]:
+    return (group.desc, group.order)
+
+
+def _item_fields(item: SchemaItem) -> Dict[str, Any]:
+    return dict(zip(ITEM_FIELDS, _item_values(item)))
+
+
+def _config_item_fields(item: ConfigItem) -> Dict[str, Any]:
+    return dict(zip(CONFIG_ITEM_FIELDS, _config_item_values(item)))
+
+
+def _group_fields(group: SchemaGroup) -> Dict[str, Any]:
+    return dict(zip(GROUP_FIELDS, _group_values(group)))
+
+
+def _changed(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Tuple[Any, Any]]:
+    return {
+        name: (old[name], value) for name, value in new.items() if old[name] != value
+    }
+
+
+def _by_name(
+    records: Iterable[Any], skip: Set[int], name_of: Callable[[Any], str]
+) -> Dict[str, Any]:
+    """The records not in `skip`, by name, the first of each name like the indexes"""
+    by_name: Dict[str, Any] = {}
+    for record in records:
+        if id(record) not in skip:
+            by_name.setdefault(name_of(record), record)
+    return by_name
+
+
+def _diff_records(
+    old_records: List[Any],
+    new_records: List[Any],
+    name_of: Callable[[Any], str],
+    fields: Tuple[str, ...],
+    values_of: Callable[[Any], Tuple[Any, ...]],
+) -> List[RecordChange]:
+    # records shared by two snapshots are the same in both, only the others are
+    # matched by name and compared
+    shared = set(map(id, old_records))
+    shared.intersection_update(map(id, new_records))
+    old = _by_name(old_records, shared, name_of)
+    new = _by_name(new_records, shared, name_of)
+
+    changes = []
+    added: Dict[str, Tuple[Any, ...]] = {}
+    for name, record in new.items():
+        values = values_of(record)
+        before = old.pop(name, None)
+        if before is None:
+            added[name] = values
+            continue
+        old_values = values_of(before)
+        if old_values != values:
+            changed = {
+                field: (a, b)
+                for field, a, b in zip(fields, old_values, values)
+                if a != b
+            }
+            changes.append(RecordChange(MODIFIED, name, fields=changed))
+    removed = {name: values_of(record) for name, record in old.items()}
+
+    # a removed and an added record with the same fields were renamed
+    by_values: Dict[Tuple[Any, ...], List[str]] = {}
+    for name, values in removed.items():
+        by_values.setdefault(values, []).append(name)
+    for name, values in list(added.items()):
+        names = by_values.get(values)
+        if names:
+            old_name = names.pop(0)
+            del removed[old_name], added[name]
+            changes.append(RecordChange(RENAMED, name, old_name))
+
+    for name, values in removed.items():
+        changed = {field: (value, None) for field, value in zip(fields, values)}
+        changes.append(RecordChange(REMOVED, name, fields=changed))
+    for name, values in added.items():
+        changed = {field: (None, value) for field, value in zip(fields, values)}
+        changes.append(RecordChange(ADDED, name, fields=changed))
+    return changes
+
+
+def _document_fields(document: Schema | Config) -> Dict[str, Any]:
+    if isinstance(document, Schema):
+        return {
+            "name": document.name,
+            "desc": document.desc,
+            "version": document.version,
+        }
+    return {
+        "name": document.name,
+        "desc": document.desc,
+        "schemaPath": document.schema_path,
+    }
+
+
+def _at(
+    old_records: List[Any], new_records: List[Any], positions: List[int]
+) -> Tuple[List[Any], List[Any]]:
+    """The records of both lists at the positions where their hashes differ"""
+    return (
+        [old_records[i] for i in positions if i < len(old_records)],
+        [new_records[i] for i in positions if i < len(new_records)],
+    )
+
+
+def diff(old: Schema | Config, new: Schema | Config) -> Patch:
+    """Returns the changes that turn `old` into `new`"""
+    if isinstance(old, Schema) and isinstance(new, Schema):
+        patch = Patch("schema")
+        old_groups, new_groups = old.groups, new.groups
+        old_items, new_items = old.items, new.items
+        if old.is_hashed() and new.is_hashed():
+            old_groups, new_groups = _at(
+                old_groups, new_groups, old.changed_groups(new)
+            )
+            old_items, new_items = _at(old_items, new_items, old.changed_items(new))
+        patch.groups = _diff_records(
+            old_groups, new_groups, attrgetter("name"), GROUP_FIELDS, _group_values
+        )
+        patch.items = _diff_records(
+            old_items, new_items, attrgetter("name"), ITEM_FIELDS, _item_values
+        )
+    elif isinstance(old, Config) and isinstance(new, Config):
+        patch = Patch("config")
+        old_items, new_items = old.items, new.items
+        if old.is_hashed() and new.is_hashed():
+            old_items, new_items = _at(old_items, new_items, old.changed_items(new))
+        patch.items = _diff_records(
+            old_items,
+            new_items,
+            attrgetter("schema_item.name"),
+            CONFIG_ITEM_FIELDS,
+            _config_item_values,
+        )
+    else:
+        raise TypeError(f"Cannot diff {type(old).__name__} and {type(new).__name__}")
+    patch.fields = _changed(_document_fields(old), _document_fields(new))
+    return patch
+
+
+# -----------------------------------------------------------------------------------------------
+# Apply
+# -----------------------------------------------------------------------------------------------
+def _check(
+    table: str,
+    name: str,
+    current: Dict[str, Any],
+    fields: Dict[str, Tuple[Any, Any]],
+) -> None:
+    for key, (old, _) in fields.items():
+        if current.get(key) != old:
+            raise PatchError(
+                f"{table} {name} field {key} is {current.get(key)!r}, "
+                f"the patch expects {old!r}"
+            )
+
+
+def _new_values(change: RecordChange) -> Dict[str, Any]:
+    values = {key: new for key, (_, new) in change.fields.items()}
+    if "type" in values:
+        values["type"] = SchemaItemType(values["type"])
+    return values
+
+
+def _apply_records(
+    table: str,
+    changes: List[RecordChange],
+    get: Callable[[str], Any],
+    fields_of: Callable[[Any], Dict[str, Any]],
+    add: Callable[[str, Dict[str, Any]], None],
+    remove: Callable[[List[str]], None],
+    update: Callable[..., Any],
+    strict: bool,
+) -> None:
+    def existing(name: str) -> Any:
+        record = get(name)
+        if record is None:
+            raise PatchError(f"{table} {name} does not exist")
+        return record
+
+    # removed first, so that records can be renamed or added in their place
+    removed = [change for change in changes if change.action == REMOVED]
+    for change in removed:
+        record = existing(change.name)
+        if strict:
+            _check(table, change.name, fields_of(record), change.fields)
+    remove([change.name for change in removed])
+
+    for change in changes:
+        if change.action == RENAMED:
+            record = existing(change.old_name or "")
+            if get(change.name) is not None:
+                raise PatchError(f"{table} {change.name} already exists")
+            update(record, name=change.name)
+        elif change.action == MODIFIED:
+            record = existing(change.name)
+            if strict:
+                _check(table, change.name, fields_of(record), change.fields)
+            update(record, **_new_values(change))
+        elif change.action == ADDED:
+            if get(change.name) is not None:
+                raise PatchError(f"{table} {change.name} already exists")
+            add(change.name, _new_values(change))
+        elif change.action != REMOVED:
+            raise PatchError(f"Unknown change {change.action} of {table} {change.name}")
+
+
+def _apply_fields(document: Schema | Config, patch: Patch, strict: bool) -> None:
+    if strict:
+        _check(patch.kind, document.name, _document_fields(document), patch.fields)
+    attributes = {"schemaPath": "schema_path"}
+    for key, (_, new) in patch.fields.items():
+        setattr(document, attributes.get(key, key), new)
+
+
+def apply(
+    document: Schema | Config, patch: Patch, strict: bool = False
+) -> Schema | Config:
+    """Returns a copy of the document with the patch applied
+
+    With strict set, a record or field whose current value is not the old value
+    in the patch raises PatchError, otherwise the patch overwrites it. Missing
+    records, and added records that already exist, always raise PatchError.
+    """
+    kind = "schema" if isinstance(document, Schema) else "config"
+    if patch.kind != kind:
+        raise PatchError(f"Cannot apply a {patch.kind} patch to a {kind}")
+    document = document.copy()
+    _apply_fields(document, patch, strict)
+
+    if isinstance(document, Schema):
+        schema = document
+        _apply_records(
+            "group",
+            patch.groups,
+            schema.get_group,
+            _group_fields,
+            lambda name, fields: schema.add_group(SchemaGroup(name, **fields)),
+            schema.remove_groups,
+            schema.update_group,
+            strict,
+        )
+        _apply_records(
+            "item",
+            patch.items,
+            schema.get_item,
+            _item_fields,
+            lambda name, fields: schema.add_item(SchemaItem(name, **fields)),
+            schema.remove_items,
+            schema.update_item,
+            strict,
+        )
+        return schema
+
+    config = document
+
+    def add(name: str, fields: Dict[str, Any]) -> None:
+        value = fields.pop("value")
+        config.add_item(ConfigItem(SchemaItem(name, **fields), value))
+
+    _apply_records(
+        "item",
+        patch.items,
+        config.get_item,
+        _config_item_fields,
+        add,
+        config.remove_items,
+        config.update_item,
+        strict,
+    )
+    return config
@@ -0,0 +1,380 @@
+"""Copy-on-write record lists with name and group indexes
+
+`RecordList.copy` and `RecordIndex.copy` are O(1): the copy shares the same
+storage and records as the original. The first structural change on either side
+takes a private copy of the pointer array (no records are copied), and a record
+is only duplicated when it is edited through `RecordIndex.edit`. Records that may
+be shared between snapshots must therefore be treated as read-only and changed
+through the owning Schema or Config, never by assigning to their attributes.
+"""
+
+import copy
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Set,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+
+class RecordList(Generic[T]):
+    """A list of records with O(1) copy-on-write snapshots
+
+    It counts its modifications so indexes can tell when they are stale, and
+    remembers which records it owns, ie. which ones are not shared with another
+    snapshot and can be edited in place.
+    """
+
+    def __init__(self, records: Iterable[T] = ()):
+        self._data: List[T] = list(records)
+        self._shared = False
+        self._owned: Set[int] | None = None  # None: every record is owned
+        self.revision = 0
+        self._positions: Dict[int, int] | None = None
+        self._positions_revision = -1
+
+    # -----------------------------------------------------------------------------------------------
+    # Copy-on-write
+    # -----------------------------------------------------------------------------------------------
+    def copy(self) -> "RecordList[T]":
+        """Returns a snapshot sharing this list's storage and records"""
+        clone: RecordList[T] = RecordList.__new__(RecordList)
+        clone._data = self._data
+        clone._shared = self._shared = True
+        clone._owned = set()
+        self._owned = set()
+        clone.revision = self.revision
+        clone._positions = None
+        clone._positions_revision = -1
+        return clone
+
+    def _write(self) -> List[T]:
+        """Returns storage that is safe to modify, after a structural change"""
+        if self._shared:
+            self._data = list(self._data)
+            self._shared = False
+        self.revision += 1
+        return self._data
+
+    def _adopt(self, records: Iterable[T]) -> None:
+        if self._owned is not None:
+            self._owned.update(id(record) for record in records)
+
+    def owns(self, record: T) -> bool:
+        """True if the record is not shared with another snapshot"""
+        return self._owned is None or id(record) in self._owned
+
+    def _position(self, record: T) -> int:
+        """Returns the position of a record, found by identity"""
+        # positions are looked up once per structural change, not per replace
+        if self._positions is None or self._positions_revision != self.revision:
+            self._positions = {id(record): i for i, record in enumerate(self._data)}
+            self._positions_revision = self.revision
+        position = self._positions.get(id(record))
+        if position is None or self._data[position] is not record:
+            raise ValueError("record is not in the list")
+        return position
+
+    def replace(self, old: T, new: T) -> None:
+        """Swaps a record for another one without moving it"""
+        position = self._position(old)
+        if self._shared:
+            self._data = list(self._data)
+            self._shared = False
+        self._data[position] = new
+        self._adopt([new])
+        self.revision += 1
+        positions = self._positions
+        if positions is not None:
+            del positions[id(old)]
+            positions[id(new)] = position
+            self._positions_revision = self.revision
+
+    def footprint(self, size: Callable[[T], int], samples: int = 16) -> int:
+        """Estimated bytes held by this snapshot alone
+
+        That is the pointer array, unless it is shared, and the records owned,
+        counted at the mean `size` of up to `samples` records of the list.
+        """
+        data = self._data
+        total = 0 if self._shared else 8 * len(data)
+        owned = len(data) if self._owned is None else min(len(self._owned), len(data))
+        if not owned:
+            return total
+        step = max(1, len(data) // samples)
+        sizes = [size(record) for record in data[::step]]
+        return total + owned * sum(sizes) // len(sizes)
+
+    def __reduce__(self) -> Any:
+        # ownership is tracked by id, so copies and pickles start afresh
+        return (self.__class__, (list(self._data),))
+
+    # -----------------------------------------------------------------------------------------------
+    # List interface
+    # -----------------------------------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._data)
+
+    def __reversed__(self) -> Iterator[T]:
+        return reversed(self._data)
+
+    def __contains__(self, record: Any) -> bool:
+        return record in self._data
+
+    def __getitem__(self, index: Any) -> Any:
+        return self._data[index]
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, RecordList):
+            return self._data is other._data or self._data == other._data
+        if isinstance(other, list):
+            return self._data == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(self._data)
+
+    def index(self, record: T, *args: Any) -> int:
+        return self._data.index(record, *args)
+
+    def count(self, record: T) -> int:
+        return self._data.count(record)
+
+    def append(self, record: T) -> None:
+        self._write().append(record)
+        self._adopt([record])
+
+    def extend(self, records: Iterable[T]) -> None:
+        records = list(records)
+        self._write().extend(records)
+        self._adopt(records)
+
+    def insert(self, index: Any, record: T) -> None:
+        self._write().insert(index, record)
+        self._adopt([record])
+
+    def remove(self, record: T) -> None:
+        self._write().remove(record)
+
+    def pop(self, index: Any = -1) -> T:
+        return self._write().pop(index)
+
+    def clear(self) -> None:
+        self._data = []
+        self._shared = False
+        self._write()
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        self._write().sort(*args, **kwargs)
+
+    def reverse(self) -> None:
+        self._write().reverse()
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        records = list(value) if isinstance(index, slice) else [value]
+        adopted = records
+        if self._owned is not None:
+            # records already in the list, maybe shared, are not adopted
+            present = {id(record) for record in self._data}
+            adopted = [record for record in records if id(record) not in present]
+        self._write()[index] = records if isinstance(index, slice) else value
+        self._adopt(adopted)
+
+    def __delitem__(self, index: Any) -> None:
+        del self._write()[index]
+
+    def __iadd__(self, records: Iterable[T]) -> "RecordList[T]":
+        self.extend(records)
+        return self
+
+
+class _MultiMap(Generic[T]):
+    """Maps a key to a list of records, with copy-on-write snapshots"""
+
+    def __init__(self) -> None:
+        self._data: Dict[str, List[T]] = {}
+        self._shared = False
+        self._owned: Set[str] | None = None  # None: every list is owned
+
+    def copy(self) -> "_MultiMap[T]":
+        clone: _MultiMap[T] = _MultiMap()
+        clone._data = self._data
+        clone._shared = self._shared = True
+        clone._owned = set()
+        self._owned = set()
+        return clone
+
+    def get(self, key: str) -> List[T]:
+        """Returns the records for a key, the list must not be modified"""
+        return self._data.get(key, [])
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
+
+    def _list(self, key: str) -> List[T]:
+        if self._shared:
+            self._data = dict(self._data)
+            self._shared = False
+        records = self._data.get(key)
+        if records is None:
+            records = self._data[key] = []
+        elif self._owned is not None and key not in self._owned:
+            records = self._data[key] = list(records)
+        if self._owned is not None:
+            self._owned.add(key)
+        return records
+
+    def add(self, key: str, record: T) -> None:
+        self._list(key).append(record)
+
+    def discard(self, key: str, record: T) -> None:
+        if key not in self._data:
+            return
+        records = self._list(key)
+        for i, match in enumerate(records):
+            if match is record:
+                del records[i]
+                break
+        if not records:
+            del self._data[key]
+
+    def replace(self, key: str, old: T, new: T) -> None:
+        records = self._list(key)
+        for i, match in enumerate(records):
+            if match is old:
+                records[i] = new
+                return
+
+
+class RecordIndex(Generic[T]):
+    """Looks up the records of a RecordList by name and by group
+
+    The index is built on first use and kept up to date by `append`, `remove`,
+    `edit` and `rekey`. Any other change to the list is detected through its
+    revision and the index is rebuilt on the next lookup. Renaming a record in
+    place must be followed by `rekey`.
+    """
+
+    def __init__(
+        self, name: Callable[[T], str], group: Callable[[T], str] | None = None
+    ):
+        self.name = name
+        self.group = group
+        self._records: List[T] | None = None
+        self._revision = -1
+        self._by_name: _MultiMap[T] = _MultiMap()
+        self._by_group: _MultiMap[T] = _MultiMap()
+
+    def copy(self, records: List[T]) -> "RecordIndex[T]":
+        """Returns an index for a copy of the indexed list, sharing its tables"""
+        clone: RecordIndex[T] = RecordIndex(self.name, self.group)
+        if self._records is not None:
+            clone._records = records
+            clone._revision = self._revision
+            clone._by_name = self._by_name.copy()
+            clone._by_group = self._by_group.copy()
+        return clone
+
+    def _in_sync(self, records: List[T]) -> bool:
+        # plain lists have no revision and are re-indexed on every lookup
+        revision = getattr(records, "revision", None)
+        return (
+            revision is not None
+            and records is self._records
+            and revision == self._revision
+        )
+
+    def sync(self, records: List[T]) -> None:
+        """Builds the index now, unless it is up to date"""
+        if self._in_sync(records):
+            return
+        self._by_name = _MultiMap()
+        self._by_group = _MultiMap()
+        for record in records:
+            self._insert(record)
+        self._records = records
+        self._revision = getattr(records, "revision", -1)
+
+    def _insert(self, record: T) -> None:
+        self._by_name.add(self.name(record), record)
+        if self.group is not None:
+            self._by_group.add(self.group(record), record)
+
+    def get(self, records: List[T], name: str) -> T | None:
+        """Returns the first record called `name`, or None"""
+        self.sync(records)
+        for record in self._by_name.get(name):
+            if self.name(record) == name:
+                return record
+
+        # A stale entry means a record was renamed without rekey
+        if name in self._by_name:
+            self._revision = -1
+            return self.get(records, name)
+        return None
+
+    def in_group(self, records: List[T], group: str) -> List[T]:
+        """Returns the records in a group"""
+        self.sync(records)
+        return list(self._by_group.get(group))
+
+    def append(self, records: List[T], record: T) -> None:
+        in_sync = self._in_sync(records)
+        records.append(record)
+        if in_sync:
+            self._insert(record)
+            self._revision = getattr(records, "revision", -1)
+
+    def remove(self, records: List[T], names: Iterable[str]) -> None:
+        """Removes every record whose name is in `names`"""
+        names = set(names)
+        in_sync = self._in_sync(records)
+        kept, removed = [], []
+        for record in records:
+            (removed if self.name(record) in names else kept).append(record)
+        records[:] = kept
+        if in_sync:
+            for record in removed:
+                self._by_name.discard(self.name(record), record)
+                if self.group is not None:
+                    self._by_group.discard(self.group(record), record)
+            self._revision = getattr(records, "revision", -1)
+
+    def edit(self, records: RecordList[T], record: T) -> T:
+        """Returns a version of the record that can be modified in place
+
+        A record shared with another snapshot is copied and the copy takes its
+        place in the list and in the index.
+        """
+        if records.owns(record):
+            return record
+        in_sync = self._in_sync(records)
+        clone = copy.copy(record)
+        records.replace(record, clone)
+        if in_sync:
+            self._by_name.replace(self.name(record), record, clone)
+            if self.group is not None:
+                self._by_group.replace(self.group(record), record, clone)
+            self._revision = records.revision
+        return clone
+
+    def rekey(
+        self, records: List[T], record: T, old_name: str, old_group: str | None
+    ) -> None:
+        """Updates the index after a record's name or group changed in place"""
+        if not self._in_sync(records):
+            return
+        self._by_name.discard(old_name, record)
+        if old_group is not None:
+            self._by_group.discard(old_group, record)
+        self._insert(record)
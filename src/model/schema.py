@@ -1,14 +1,21 @@
 """Schema dataclasses for modeling a schema"""
 
+import copy
+import hashlib
 import json
-from copy import deepcopy
+import sys
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, List
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Tuple
 
 from dataclass_wizard import JSONWizard, json_field
 
+import src.helpers.files as files
 import src.helpers.validators as validators
+import src.model.codec as codec
+import src.model.merkle as merkle
+from src.model.records import RecordIndex, RecordList
 
 
 @dataclass
@@ -32,7 +39,20 @@ class SchemaItemType(Enum):
     float = "Float"
 
 
-@dataclass
+NATIVE_TYPES = {
+    SchemaItemType.str: str,
+    SchemaItemType.bool: bool,
+    SchemaItemType.int: int,
+    SchemaItemType.float: float,
+}
+
+_TYPE_VALIDATORS = {
+    item_type: validators.type_validator(native)
+    for item_type, native in NATIVE_TYPES.items()
+}
+
+
+@dataclass(slots=True)
 class SchemaItem(JSONWizard):
     """A schema item represents one variable we want to configure"""
 
@@ -46,25 +66,17 @@ class SchemaItem(JSONWizard):
         "errors", default_factory=list, dump=False
     )  # type: ignore
 
+    def __post_init__(self) -> None:
+        # many items share a group, keep a single copy of its name
+        if type(self.group) is str:
+            self.group = sys.intern(self.group)
+
     def __validate_field_type__(self, col: str, value: str) -> None:
-        type_error = None
-        if self.type == SchemaItemType.int:
-            if not validators.validate_type(value, int):
-                type_error = "Integer"
-        elif self.type == SchemaItemType.bool:
-            if not validators.validate_type(value, bool):
-                type_error = "Boolean"
-        elif self.type == SchemaItemType.float:
-            if not validators.validate_type(value, float):
-                type_error = "Float"
-        elif self.type == SchemaItemType.str:
-            if not validators.validate_type(value, str):
-                type_error = "String"
-
-        if type_error:
+        validator = _TYPE_VALIDATORS.get(self.type)
+        if validator is not None and not validator(value):
             self.errors.append(
                 SchemaValidationError(
-                    f"Item {self.name} column '{col}': value '{value}' is not a {type_error}",
+                    f"Item {self.name} column '{col}': value '{value}' is not a {self.type.value}",
                     "item",
                     self.name,
                     col,
@@ -101,11 +113,7 @@ class SchemaItem(JSONWizard):
             self.__validate_field_type__("options", value)
 
     def validate_group(self, parent: "Schema") -> None:
-        match = next(
-            (group for group in parent.groups if group.name == self.group), None
-        )
-
-        if match is None:
+        if parent.get_group(self.group) is None:
             self.errors.append(
                 SchemaValidationError(
                     f"Item {self.name} invalid group {self.group}, must be an existing group {parent.get_group_names()}",
@@ -128,7 +136,7 @@ class SchemaItem(JSONWizard):
             return False
 
 
-@dataclass
+@dataclass(slots=True)
 class SchemaGroup(JSONWizard):
     """A schema group helps group similar items to make editing large configs easier"""
 
@@ -183,6 +191,29 @@ class SchemaGroup(JSONWizard):
             return False
 
 
+def _same_errors(
+    a: List[SchemaValidationError], b: List[SchemaValidationError]
+) -> bool:
+    # SchemaValidationError has no fields as far as dataclass equality is concerned
+    return [(e.message, e.table, e.row, e.col) for e in a] == [
+        (e.message, e.table, e.row, e.col) for e in b
+    ]
+
+
+def _has_group_error(item: SchemaItem) -> bool:
+    return any(error.col == "group" for error in item.errors)
+
+
+def _item_hash(item: SchemaItem) -> bytes:
+    return merkle.digest_of(
+        item.name, item.desc, item.group, item.default, item.type.value, item.options
+    )
+
+
+def _group_hash(group: SchemaGroup) -> bytes:
+    return merkle.digest_of(group.name, group.desc, group.order)
+
+
 @dataclass
 class Schema(JSONWizard):
     """A schema is the top level schema dataclass that holds all schema groups"""
@@ -196,16 +227,251 @@ class Schema(JSONWizard):
         "errors", default_factory=list, dump=False
     )  # type: ignore
 
+    def __post_init__(self) -> None:
+        self._item_index: RecordIndex[SchemaItem] = RecordIndex(
+            attrgetter("name"), attrgetter("group")
+        )
+        self._group_index: RecordIndex[SchemaGroup] = RecordIndex(attrgetter("name"))
+        self._item_hashes: merkle.HashTree[SchemaItem] = merkle.HashTree(_item_hash)
+        self._group_hashes: merkle.HashTree[SchemaGroup] = merkle.HashTree(_group_hash)
+        # validation state, see validate()
+        self._validated: Tuple[Any, ...] | None = None
+        self._dirty_items: Dict[int, SchemaItem] = {}
+        self._dirty_groups: Dict[int, SchemaGroup] = {}
+        self._group_errors: Dict[int, SchemaItem] = {}
+        self._record_errors: Tuple[Tuple[Any, ...], List[SchemaValidationError]] | None
+        self._record_errors = None
+        self.last_save: files.SaveStats | None = None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # the indexes rely on the revision count of a RecordList
+        if name in ("groups", "items") and not isinstance(value, RecordList):
+            value = RecordList(value)
+        super().__setattr__(name, value)
+
+    def to_dict(self) -> dict:  # type: ignore[override]
+        return codec.encode(self)
+
+    def to_json(self, **kwargs: Any) -> str:  # type: ignore[override]
+        return json.dumps(self.to_dict(), **kwargs)
+
     def copy(self) -> "Schema":
-        return deepcopy(self)
+        """Returns a snapshot in O(1), sharing every record until it is edited"""
+        clone = copy.copy(self)
+        clone.errors = list(self.errors)
+        clone.groups = self.groups.copy()
+        clone.items = self.items.copy()
+        clone._item_index = self._item_index.copy(clone.items)
+        clone._group_index = self._group_index.copy(clone.groups)
+        clone._item_hashes = self._item_hashes.copy(clone.items)
+        clone._group_hashes = self._group_hashes.copy(clone.groups)
+        clone._validated = clone._state() if self._is_validated() else None
+        clone._dirty_items = dict(self._dirty_items)
+        clone._dirty_groups = dict(self._dirty_groups)
+        clone._group_errors = dict(self._group_errors)
+        clone._record_errors = None
+        return clone
+
+    def build_indexes(self) -> None:
+        """Builds the name and group indexes now, so that copies share them"""
+        self._item_index.sync(self.items)
+        self._group_index.sync(self.groups)
+
+    def build_hashes(self) -> None:
+        """Hashes every item and group now, so that copies share the hashes"""
+        self._item_hashes.sync(self.items)
+        self._group_hashes.sync(self.groups)
+
+    def is_hashed(self) -> bool:
+        """True if the hashes are up to date, so comparing them is cheap"""
+        return self._item_hashes.in_sync(self.items) and self._group_hashes.in_sync(
+            self.groups
+        )
+
+    def tree_hash(self) -> bytes:
+        """Hash of the content that is saved, updated as records are edited
+
+        Two schemas with the same tree hash save the same file. Only the records
+        edited since the last call are hashed again.
+        """
+        return merkle.document_hash(
+            (self.name, self.desc, self.version),
+            self._item_hashes.root(self.items),
+            self._group_hashes.root(self.groups),
+        )
+
+    def changed_items(self, other: "Schema") -> List[int]:
+        """Positions of the items that differ from the other schema's"""
+        return self._item_hashes.diff(self.items, other._item_hashes, other.items)
+
+    def changed_groups(self, other: "Schema") -> List[int]:
+        """Positions of the groups that differ from the other schema's"""
+        return self._group_hashes.diff(self.groups, other._group_hashes, other.groups)
+
+    def get_item(self, name: str) -> SchemaItem | None:
+        return self._item_index.get(self.items, name)
+
+    def get_group(self, name: str) -> SchemaGroup | None:
+        return self._group_index.get(self.groups, name)
+
+    def get_group_items(self, group: str) -> List[SchemaItem]:
+        return self._item_index.in_group(self.items, group)
+
+    def add_item(self, item: SchemaItem) -> None:
+        validated = self._is_validated()
+        hashed = self._item_hashes.in_sync(self.items)
+        self._item_index.append(self.items, item)
+        self._item_hashes.append(self.items, item, hashed)
+        self._touch(validated, items=[item])
+
+    def add_group(self, group: SchemaGroup) -> None:
+        validated = self._is_validated()
+        hashed = self._group_hashes.in_sync(self.groups)
+        self._group_index.append(self.groups, group)
+        self._group_hashes.append(self.groups, group, hashed)
+        self._touch(
+            validated, items=self._group_dependents([group.name]), groups=[group]
+        )
+
+    def remove_items(self, names: Iterable[str]) -> None:
+        validated = self._is_validated()
+        names = set(names)
+        self._item_index.remove(self.items, names)
+        for records in (self._dirty_items, self._group_errors):
+            for key in [key for key, item in records.items() if item.name in names]:
+                del records[key]
+        self._touch(validated)
+
+    def remove_groups(self, names: Iterable[str]) -> None:
+        validated = self._is_validated()
+        names = set(names)
+        self._group_index.remove(self.groups, names)
+        self._dirty_groups = {
+            key: group
+            for key, group in self._dirty_groups.items()
+            if group.name not in names
+        }
+        self._touch(validated, items=self._group_dependents(names))
+
+    def update_item(self, item: SchemaItem, **changes: Any) -> SchemaItem:
+        """Edits an item, copying it first if it is shared with another snapshot
+
+        Returns the edited item, which replaces `item` in this schema.
+        """
+        validated = self._is_validated()
+        hashed = self._item_hashes.in_sync(self.items)
+        self._forget(item)
+        edited = self._item_index.edit(self.items, item)  # type: ignore[arg-type]
+        old_name, old_group = edited.name, edited.group
+        for attribute, value in changes.items():
+            setattr(edited, attribute, value)
+        self._item_index.rekey(self.items, edited, old_name, old_group)
+        self._item_hashes.replace(self.items, item, edited, hashed)
+        item = edited
+        self._touch(validated, items=[item])
+        return item
+
+    def update_group(self, group: SchemaGroup, **changes: Any) -> SchemaGroup:
+        """Edits a group, copying it first if it is shared with another snapshot
+
+        Returns the edited group, which replaces `group` in this schema. Renaming
+        a group also marks the items of the old and new group for validation.
+        """
+        validated = self._is_validated()
+        hashed = self._group_hashes.in_sync(self.groups)
+        self._dirty_groups.pop(id(group), None)
+        edited = self._group_index.edit(self.groups, group)  # type: ignore[arg-type]
+        old_name = edited.name
+        for attribute, value in changes.items():
+            setattr(edited, attribute, value)
+        self._group_index.rekey(self.groups, edited, old_name, None)
+        self._group_hashes.replace(self.groups, group, edited, hashed)
+        group = edited
+        renamed = [old_name, group.name] if group.name != old_name else []
+        self._touch(validated, items=self._group_dependents(renamed), groups=[group])
+        return group
+
+    # -----------------------------------------------------------------------------------------------
+    # Validation state
+    #
+    # validate() checks every record the first time, then only the records marked
+    # dirty by the methods above. Any other change to the items or groups lists is
+    # detected through their revision and triggers a full validation again. Like
+    # with copies, records must be edited through the methods above for this to
+    # work.
+    # -----------------------------------------------------------------------------------------------
+    def _state(self) -> Tuple[Any, ...]:
+        return (self.items, self.groups, self.items.revision, self.groups.revision)
+
+    def _is_validated(self) -> bool:
+        return self._validated is not None and _same_state(
+            self._validated, self._state()
+        )
+
+    def _group_dependents(self, names: Iterable[str]) -> List[SchemaItem]:
+        """Items whose validation depends on the groups called `names`"""
+        names = list(names)
+        if not names:
+            return []
+        # the group error message lists every group name
+        items = list(self._group_errors.values())
+        for name in names:
+            items.extend(self.get_group_items(name))
+        return items
+
+    def _forget(self, item: SchemaItem) -> None:
+        self._dirty_items.pop(id(item), None)
+        self._group_errors.pop(id(item), None)
+
+    def _touch(
+        self,
+        validated: bool,
+        items: Iterable[SchemaItem] = (),
+        groups: Iterable[SchemaGroup] = (),
+    ) -> None:
+        """Marks records for validation after an edit through the methods above"""
+        self._record_errors = None
+        if not validated:
+            return
+        self._validated = self._state()
+        for item in items:
+            self._dirty_items[id(item)] = item
+        for group in groups:
+            self._dirty_groups[id(group)] = group
+
+    def _validate_record(
+        self,
+        records: RecordList[Any],
+        index: RecordIndex[Any],
+        hashes: merkle.HashTree[Any],
+        record: Any,
+        validate: Callable[[Any], Any],
+    ) -> Any:
+        """Validates a record, without changing another snapshot's copy of it"""
+        if records.owns(record):
+            validate(record)
+            return record
+        probe = copy.copy(record)
+        validate(probe)
+        if _same_errors(probe.errors, record.errors):
+            return record
+        hashed = hashes.in_sync(records)
+        clone = index.edit(records, record)
+        clone.errors = probe.errors
+        hashes.replace(records, record, clone, hashed)
+        return clone
+
+    def content_hash(self) -> str:
+        """SHA-256 of the schema as it is written to disk"""
+        return hashlib.sha256(codec.dumps(self).encode()).hexdigest()
 
     def get_group_names(self) -> List[str]:
         return [group.name for group in self.groups]
 
     def save(self, filename) -> bool:
+        """Writes the schema if it is valid, see `last_save` for what was done"""
         if self.validate():
-            with open(filename, "w") as f:
-                f.write(json.dumps(self.to_dict(), indent=4))
+            self.last_save = files.save_text(filename, codec.dumps(self))
             return True
         else:
             return False
@@ -250,34 +516,81 @@ class Schema(JSONWizard):
         return True
 
     def validate(self) -> bool:
+        """Validates the schema and any item or group edited since the last call"""
         self.errors = []
         self.validate_name()
         self.validate_desc()
         self.validate_version()
-        for item in self.items:
-            item.validate(self)
 
-        for group in self.groups:
-            group.validate()
+        items: Iterable[SchemaItem]
+        groups: Iterable[SchemaGroup]
+        if self._is_validated():
+            items = list(self._dirty_items.values())
+            groups = list(self._dirty_groups.values())
+        else:
+            items, groups = list(self.items), list(self.groups)
+            self._group_errors = {}
+        self._dirty_items = {}
+        self._dirty_groups = {}
+
+        for item in items:
+            validated_item = self._validate_record(
+                self.items,
+                self._item_index,
+                self._item_hashes,
+                item,
+                lambda item: item.validate(self),
+            )
+            if validated_item is not item:
+                # a copy replaced the shared record, which is no longer ours
+                self._forget(item)
+                item = validated_item
+            if _has_group_error(item):
+                self._group_errors[id(item)] = item
+            else:
+                self._group_errors.pop(id(item), None)
+
+        for group in groups:
+            self._validate_record(
+                self.groups,
+                self._group_index,
+                self._group_hashes,
+                group,
+                SchemaGroup.validate,
+            )
 
+        self._validated = self._state()
+        self._record_errors = None
         return len(self.errors) == 0
 
     def get_errors(self) -> List[SchemaValidationError]:
-        all_errors = self.errors.copy()
-        for item in self.items:
-            all_errors.extend(item.errors)
-        for group in self.groups:
-            all_errors.extend(group.errors)
-        return all_errors
+        state = self._state()
+        if self._record_errors is None or not _same_state(
+            self._record_errors[0], state
+        ):
+            record_errors = []
+            for item in self.items:
+                record_errors.extend(item.errors)
+            for group in self.groups:
+                record_errors.extend(group.errors)
+            self._record_errors = (state, record_errors)
+        return self.errors + self._record_errors[1]
+
+
+def _same_state(a: Tuple[Any, ...], b: Tuple[Any, ...]) -> bool:
+    return a[0] is b[0] and a[1] is b[1] and a[2:] == b[2:]
+
+
+def from_dict(data: dict) -> Schema:
+    return codec.decode(Schema, data)
 
 
 def from_json(string: str) -> Schema:
-    schemas = Schema.from_json(string)
-    if isinstance(schemas, list):
+    data = json.loads(string)
+    if isinstance(data, list):
         # TODO: throw something
-        return schemas[0]
-    else:
-        return schemas
+        data = data[0]
+    return from_dict(data)
 
 
 def load(filename: str) -> Schema:
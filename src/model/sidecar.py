@@ -0,0 +1,231 @@
+"""Binary sidecar cache of parsed schema and config files
+
+Decoding a big schema from JSON dominates start up time. `load_schema` and
+`load_config` keep a compact binary copy of each file they parse in a
+`.configtree-cache` directory next to it, named after a hash of the file's
+content, and read that copy instead when the content has not changed. A cache
+file holds the columns of the items, encoded with `marshal`, behind a header
+with the format version, the python version, the content hash and a hash of the
+payload, so anything written by another version of the code, for other content,
+or damaged on disk, is ignored and rebuilt.
+
+Only schemas and full configs are cached: a delta config is resolved against
+its schema, which is cached by itself, and is small. A full config keeps the
+schema embedded in its file, used like `config.load` does when the file at
+its schema path does not exist.
+
+The cache is optional. The process-wide schema cache uses it when the
+CONFIGTREE_CACHE environment variable is set to 1, or after `enable()`.
+Failing to write a cache file, in a read-only directory for example, only
+means the next load parses the file again.
+"""
+
+import hashlib
+import json
+import marshal
+import os
+import struct
+import sys
+from typing import Any, List, Tuple
+
+import src.helpers.files as files
+
+# config imports this module through the schema cache, so only its module is
+# imported here
+import src.model.config as config_factory
+import src.model.schema as schema_factory
+from src.model.schema import Schema, SchemaGroup, SchemaItem, SchemaItemType
+from src.model.table import ItemTable
+
+CACHE_DIR = ".configtree-cache"
+# bump when the encoding or the model classes change
+FORMAT_VERSION = 2
+# cache files kept per directory, the oldest are removed first
+MAX_ENTRIES = 256
+
+_MAGIC = b"CTBC"
+_HEADER = struct.Struct("<4sHBB16s16s")
+_SCHEMA, _CONFIG = b"S", b"C"
+_TYPES = list(SchemaItemType)
+
+enabled = os.environ.get("CONFIGTREE_CACHE", "") == "1"
+
+
+def enable(on: bool = True) -> None:
+    """Turns the cache on or off for the process-wide schema cache"""
+    global enabled
+    enabled = on
+
+
+def _digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def cache_path(filename: str, digest: bytes) -> str:
+    directory = os.path.dirname(os.path.abspath(filename))
+    return os.path.join(directory, CACHE_DIR, digest.hex() + ".bin")
+
+
+# -----------------------------------------------------------------------------------------------
+# Encoding
+# -----------------------------------------------------------------------------------------------
+def _encode_items(items: List[SchemaItem]) -> Tuple[Any, ...]:
+    table = ItemTable(items)
+    return (
+        table.names,
+        table.descs,
+        table.groups,
+        table.defaults,
+        table.types.tobytes(),
+        table.options,
+    )
+
+
+def _decode_items(columns: Tuple[Any, ...]) -> List[SchemaItem]:
+    names, descs, groups, defaults, types, options = columns
+    return list(
+        map(
+            SchemaItem,
+            names,
+            descs,
+            groups,
+            defaults,
+            [_TYPES[code] for code in types],
+            options,
+        )
+    )
+
+
+def encode_schema(schema: Schema) -> bytes:
+    groups = [(group.name, group.desc, group.order) for group in schema.groups]
+    payload = (schema.name, schema.desc, schema.version, groups)
+    return _SCHEMA + marshal.dumps(payload + (_encode_items(schema.items),))
+
+
+def encode_config(
+    config: "config_factory.Config", embedded: Schema | None = None
+) -> bytes:
+    """Encodes a config and the schema embedded in its file, if any"""
+    schema_items = [item.schema_item for item in config.items]
+    values = [item.value for item in config.items]
+    payload = (config.name, config.desc, config.schema_path)
+    schema = None if embedded is None else encode_schema(embedded)
+    return _CONFIG + marshal.dumps(
+        payload + (_encode_items(schema_items), values, schema)
+    )
+
+
+def decode(data: bytes) -> "Schema | config_factory.Config":
+    kind, payload = data[:1], marshal.loads(data[1:])
+    if kind == _SCHEMA:
+        name, desc, version, groups, columns = payload
+        return Schema(
+            name,
+            desc,
+            version,
+            [SchemaGroup(*group) for group in groups],
+            _decode_items(columns),
+        )
+    name, desc, schema_path, columns, values, schema = payload
+    config = config_factory.Config(name, desc, schema_path)
+    if config.schema is None and schema is not None:
+        # decoded only when the schema path does not load, like config.load
+        config.schema = decode(schema)  # type: ignore[assignment]
+    config.items = list(map(config_factory.ConfigItem, _decode_items(columns), values))
+    return config
+
+
+# -----------------------------------------------------------------------------------------------
+# Files
+# -----------------------------------------------------------------------------------------------
+def _read(path: str, digest: bytes) -> bytes | None:
+    """Returns the payload of a cache file, None if it is missing or stale"""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if len(data) < _HEADER.size:
+        return None
+    magic, version, major, minor, cached, check = _HEADER.unpack_from(data)
+    if (magic, version, major, minor, cached) != (
+        _MAGIC,
+        FORMAT_VERSION,
+        *sys.version_info[:2],
+        digest,
+    ):
+        return None
+    payload = data[_HEADER.size :]
+    if _digest(payload) != check:
+        return None
+    return payload
+
+
+def _write(path: str, digest: bytes, payload: bytes) -> None:
+    header = _HEADER.pack(
+        _MAGIC, FORMAT_VERSION, *sys.version_info[:2], digest, _digest(payload)
+    )
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        files.write_atomic(path, header + payload)
+        _prune(os.path.dirname(path))
+    except OSError:
+        pass
+
+
+def _prune(directory: str) -> None:
+    entries = [entry for entry in os.scandir(directory) if entry.name.endswith(".bin")]
+    if len(entries) <= MAX_ENTRIES:
+        return
+    entries.sort(key=lambda entry: entry.stat().st_mtime_ns)
+    for entry in entries[: len(entries) - MAX_ENTRIES]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def _load(filename: str, kind: type) -> "Schema | config_factory.Config":
+    with open(filename, "rb") as f:
+        data = f.read()
+    digest = _digest(data)
+    path = cache_path(filename, digest)
+    payload = _read(path, digest)
+    if payload is not None:
+        try:
+            value = decode(payload)
+        except (ValueError, EOFError, TypeError, IndexError):
+            pass  # rebuilt below
+        else:
+            if isinstance(value, kind):
+                return value
+
+    if kind is Schema:
+        schema = schema_factory.from_json(data.decode())
+        _write(path, digest, encode_schema(schema))
+        return schema
+
+    parsed = json.loads(data)
+    if isinstance(parsed, list):
+        parsed = parsed[0]
+    config = config_factory.from_dict(parsed)
+    if parsed.get("format") != config_factory.DELTA_FORMAT:
+        embedded = None
+        if parsed.get("schema") is not None:
+            if os.path.exists(config.schema_path):
+                # the config has the schema of its path, not the embedded one
+                embedded = schema_factory.from_dict(parsed["schema"])
+            else:
+                embedded = config.schema
+        _write(path, digest, encode_config(config, embedded))
+    return config
+
+
+def load_schema(filename: str) -> Schema:
+    """Like `schema.load`, but reads the binary copy when the file is unchanged"""
+    return _load(filename, Schema)  # type: ignore[return-value]
+
+
+def load_config(filename: str) -> "config_factory.Config":
+    """Like `config.load`, but reads the binary copy of full configs"""
+    return _load(filename, config_factory.Config)  # type: ignore[return-value]
@@ -0,0 +1,180 @@
+"""Incremental loading of large schema files
+
+`schema.load` reads the whole file, parses it into dicts and then builds the
+dataclasses, so all three are in memory at the same time. The functions in this
+module parse the `groups` and `items` arrays one element at a time, so only a
+chunk of text and a single element are held on top of the objects built so far.
+"""
+
+import json
+from typing import IO, Any, Dict, Iterator, List, Tuple
+
+import src.model.codec as codec
+from src.model.schema import Schema, SchemaGroup, SchemaItem
+from src.model.table import ItemTable
+
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+_DECODER = json.JSONDecoder()
+
+
+class _Reader:
+    """Pulls JSON tokens and values from a text file, a chunk at a time"""
+
+    def __init__(self, f: IO[str], chunk_size: int = CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """Reads the next chunk, dropping text that was already consumed"""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+    def peek(self) -> str:
+        """Returns the next non-whitespace character, or "" at end of file"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise self._error(f"Expecting '{char}'")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decodes the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+                # a number at the end of the buffer may continue in the next chunk
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+    def skip(self) -> None:
+        """Skips the next value, streaming through arrays"""
+        if self.peek() == "[":
+            for _ in self.array():
+                self.skip()
+        else:
+            self.value()
+
+    def array(self) -> Iterator[None]:
+        """Steps through an array, the caller consumes each element"""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield
+            char = self.peek()
+            self.pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                self.pos -= 1
+                raise self._error("Expecting ',' delimiter")
+
+    def object(self) -> Iterator[str]:
+        """Steps through an object's keys, the caller consumes each value"""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise self._error("Expecting property name enclosed in double quotes")
+            key = self.value()
+            self.expect(":")
+            yield key
+            char = self.peek()
+            self.pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                self.pos -= 1
+                raise self._error("Expecting ',' delimiter")
+
+
+def iter_schema(
+    f: IO[str], chunk_size: int = CHUNK_SIZE, groups: bool = True, items: bool = True
+) -> Iterator[Tuple[str, Any]]:
+    """Yields (key, value) pairs from a schema file as they are parsed
+
+    Top level fields such as name and version are yielded with their raw JSON
+    value, while each element of `groups` and `items` is yielded on its own as
+    a SchemaGroup or SchemaItem. Arrays that are not wanted are skipped.
+    """
+    reader = _Reader(f, chunk_size)
+    if reader.peek() == "[":
+        # like from_json, only the first schema of a list is used
+        reader.expect("[")
+
+    wanted = {"groups": SchemaGroup if groups else None}
+    wanted["items"] = SchemaItem if items else None
+    for key in reader.object():
+        if key in wanted:
+            cls = wanted[key]
+            if cls is None:
+                reader.skip()
+                continue
+            for _ in reader.array():
+                yield key, codec.decode(cls, reader.value())
+        else:
+            yield key, reader.value()
+
+
+def iter_items(filename: str, chunk_size: int = CHUNK_SIZE) -> Iterator[SchemaItem]:
+    """Yields the items of a schema file one at a time"""
+    with open(filename) as f:
+        for key, value in iter_schema(f, chunk_size, groups=False):
+            if key == "items":
+                yield value
+
+
+def load_table(filename: str, chunk_size: int = CHUNK_SIZE) -> ItemTable:
+    """Reads the items of a schema file into a table, one item at a time"""
+    return ItemTable(iter_items(filename, chunk_size))
+
+
+def load(filename: str, chunk_size: int = CHUNK_SIZE) -> Schema:
+    """Builds a Schema like `schema.load`, without reading the whole file first"""
+    header: Dict[str, Any] = {}
+    groups: List[SchemaGroup] = []
+    items: List[SchemaItem] = []
+    with open(filename) as f:
+        for key, value in iter_schema(f, chunk_size):
+            if key == "groups":
+                groups.append(value)
+            elif key == "items":
+                items.append(value)
+            else:
+                header[key] = value
+
+    schema: Schema = codec.decode(Schema, header)
+    schema.groups = groups
+    schema.items = items
+    return schema
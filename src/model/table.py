@@ -0,0 +1,120 @@
+"""Column-oriented storage for large, read-only sets of schema items
+
+A SchemaItem is a small object, but a million of them still cost an object
+header, a reference per field and an errors list each. `ItemTable` keeps the
+same data in parallel columns instead: names, descriptions, defaults and options
+in lists, groups as interned strings and types as one byte per item.
+
+The table is a read-only `Sequence[SchemaItem]`, so code that only reads
+`schema.items` (iterating, len, indexing, lookups by name) works on it
+unchanged. Items are built on access and editing them does not change the table.
+
+Tables are opt-in: `Schema.items` stays a list of records, which the editor
+and the models edit, so only code that builds a table, with
+`stream.load_table` or `from_schema`, saves the memory.
+"""
+
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Sequence, overload
+
+from src.model.schema import Schema, SchemaItem, SchemaItemType
+
+_TYPES = list(SchemaItemType)
+_TYPE_CODES = {item_type: code for code, item_type in enumerate(_TYPES)}
+
+
+def _intern(value: str) -> str:
+    return sys.intern(value) if type(value) is str else value
+
+
+class ItemTable(Sequence[SchemaItem]):
+    """Schema items stored column by column"""
+
+    __slots__ = ("names", "descs", "groups", "defaults", "types", "options", "_rows")
+
+    def __init__(self, items: Iterable[SchemaItem] = ()):
+        self.names: List[str] = []
+        self.descs: List[str] = []
+        self.groups: List[str] = []
+        self.defaults: List[object] = []
+        self.types = array("B")
+        self.options: List[str] = []
+        self._rows: Dict[str, int] | None = None
+        for item in items:
+            self.append(item)
+
+    def append(self, item: SchemaItem) -> None:
+        self.names.append(item.name)
+        self.descs.append(item.desc)
+        self.groups.append(_intern(item.group))
+        self.defaults.append(item.default)
+        self.types.append(_TYPE_CODES[item.type])
+        self.options.append(_intern(item.options))
+        self._rows = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _item(self, row: int) -> SchemaItem:
+        return SchemaItem(
+            self.names[row],
+            self.descs[row],
+            self.groups[row],
+            self.defaults[row],
+            _TYPES[self.types[row]],
+            self.options[row],
+        )
+
+    @overload
+    def __getitem__(self, index: int) -> SchemaItem: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[SchemaItem]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._item(row) for row in range(len(self))[index]]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ItemTable index out of range")
+        return self._item(index)
+
+    def __iter__(self) -> Iterator[SchemaItem]:
+        for row in range(len(self)):
+            yield self._item(row)
+
+    def row(self, name: str) -> int | None:
+        """Returns the row of the first item called `name`, or None"""
+        if self._rows is None:
+            self._rows = {}
+            for row, item_name in enumerate(self.names):
+                self._rows.setdefault(item_name, row)
+        return self._rows.get(name)
+
+    def get(self, name: str) -> SchemaItem | None:
+        """Like Schema.get_item"""
+        row = self.row(name)
+        return None if row is None else self._item(row)
+
+    def in_group(self, group: str) -> List[SchemaItem]:
+        """Like Schema.get_group_items"""
+        return [
+            self._item(row) for row, name in enumerate(self.groups) if name == group
+        ]
+
+    def type_of(self, row: int) -> SchemaItemType:
+        return _TYPES[self.types[row]]
+
+
+def from_schema(schema: Schema) -> ItemTable:
+    """Returns the items of a schema as a table"""
+    return ItemTable(schema.items)
+
+
+def to_schema(table: ItemTable, header: Schema) -> Schema:
+    """Returns a copy of `header` whose items are built from the table"""
+    schema = header.copy()
+    schema.items = list(table)
+    return schema
@@ -0,0 +1,183 @@
+"""Inheritance of config values over a tree of configs
+
+A `ConfigTree` holds configs of one schema in a hierarchy, for example a site
+config, project configs below it and run configs below those. Each node only
+stores the values it overrides. Its effective values are resolved once, from
+its parent's effective values, and kept, so looking a value up is a single dict
+access however deep the node is.
+
+Setting or clearing a value updates the resolved values of the node and of the
+descendants that inherit that value in place. Descendants that override the
+value themselves, and the rest of the tree, are not touched.
+"""
+
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping
+
+from src.model.config import Config
+from src.model.schema import Schema
+
+
+class _Node:
+    __slots__ = ("name", "parent", "children", "values", "resolved")
+
+    def __init__(self, name: str, parent: "_Node | None", values: Dict[str, Any]):
+        self.name = name
+        self.parent = parent
+        self.children: List[_Node] = []
+        self.values = values
+        self.resolved: Dict[str, Any] | None = None
+
+
+class ConfigTree:
+    """Configs of one schema, each inheriting the values of its parent"""
+
+    def __init__(self, schema: Schema):
+        self.schema = schema
+        self.defaults = {item.name: item.default for item in schema.items}
+        self._nodes: Dict[str, _Node] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._nodes
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._nodes)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def _node(self, name: str) -> _Node:
+        node = self._nodes.get(name)
+        if node is None:
+            raise KeyError(f"Config {name} is not in the tree")
+        return node
+
+    def _check_items(self, names: Any) -> None:
+        unknown = [name for name in names if name not in self.defaults]
+        if unknown:
+            raise KeyError(f"Items {unknown} are not in schema {self.schema.name}")
+
+    def add(
+        self,
+        name: str,
+        parent: str | None = None,
+        values: Mapping[str, Any] | None = None,
+    ) -> None:
+        """Adds a config that overrides `values` of its parent, or of the schema"""
+        if name in self._nodes:
+            raise ValueError(f"Config {name} is already in the tree")
+        values = dict(values or {})
+        self._check_items(values)
+        parent_node = None if parent is None else self._node(parent)
+        node = _Node(name, parent_node, values)
+        if parent_node is not None:
+            parent_node.children.append(node)
+        self._nodes[name] = node
+
+    def add_config(self, config: Config, parent: str | None = None) -> None:
+        """Adds a config, overriding the values that differ from the schema"""
+        values = {
+            item.schema_item.name: item.value
+            for item in config.items
+            if item.value != item.schema_item.default
+        }
+        self.add(config.name, parent, values)
+
+    def parent(self, name: str) -> str | None:
+        parent = self._node(name).parent
+        return None if parent is None else parent.name
+
+    def children(self, name: str) -> List[str]:
+        return [child.name for child in self._node(name).children]
+
+    def overrides(self, name: str) -> Mapping[str, Any]:
+        """The values set on this config itself"""
+        return MappingProxyType(self._node(name).values)
+
+    # -----------------------------------------------------------------------------------------------
+    # Resolution
+    # -----------------------------------------------------------------------------------------------
+    def _resolve(self, node: _Node) -> Dict[str, Any]:
+        if node.resolved is not None:
+            return node.resolved
+
+        # walk up to the closest resolved ancestor, then resolve down from it
+        path = []
+        ancestor: _Node | None = node
+        while ancestor is not None and ancestor.resolved is None:
+            path.append(ancestor)
+            ancestor = ancestor.parent
+        resolved = self.defaults if ancestor is None else ancestor.resolved
+        for step in reversed(path):
+            step.resolved = {**resolved, **step.values}  # type: ignore[dict-item]
+            resolved = step.resolved
+        return resolved  # type: ignore[return-value]
+
+    def resolve(self, name: str) -> Mapping[str, Any]:
+        """Returns the effective values of a config, read-only"""
+        return MappingProxyType(self._resolve(self._node(name)))
+
+    def get(self, name: str, item: str) -> Any:
+        """Returns the effective value of one item of a config"""
+        node = self._node(name)
+        resolved = node.resolved
+        if resolved is None:
+            resolved = self._resolve(node)
+        return resolved[item]
+
+    # -----------------------------------------------------------------------------------------------
+    # Edits
+    # -----------------------------------------------------------------------------------------------
+    def _propagate(self, node: _Node, item: str, value: Any) -> None:
+        """Updates the resolved value of `item` where it is inherited from `node`"""
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current.resolved is not None:
+                current.resolved[item] = value
+            stack.extend(
+                child for child in current.children if item not in child.values
+            )
+
+    def set_value(self, name: str, item: str, value: Any) -> None:
+        """Overrides the value of an item in a config and its descendants"""
+        self._check_items([item])
+        node = self._node(name)
+        node.values[item] = value
+        self._propagate(node, item, value)
+
+    def unset_value(self, name: str, item: str) -> None:
+        """Removes an override, the config inherits the value again"""
+        node = self._node(name)
+        if item not in node.values:
+            return
+        del node.values[item]
+        parent = node.parent
+        value = self.defaults[item] if parent is None else self.get(parent.name, item)
+        self._propagate(node, item, value)
+
+    def remove(self, name: str) -> None:
+        """Removes a config, its children are attached to its parent"""
+        node = self._node(name)
+        parent = node.parent
+        if parent is not None:
+            parent.children.remove(node)
+            parent.children.extend(node.children)
+        for child in node.children:
+            child.parent = parent
+            self._invalidate(child)
+        del self._nodes[name]
+
+    def _invalidate(self, node: _Node) -> None:
+        """Drops the resolved values of a node and its descendants"""
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            current.resolved = None
+            stack.extend(current.children)
+
+    def apply(self, name: str, config: Config) -> None:
+        """Sets the values of a config to the effective values of `name`"""
+        resolved = self._resolve(self._node(name))
+        for item in config.items:
+            config.set_value(item.schema_item.name, resolved[item.schema_item.name])
@@ -0,0 +1,267 @@
+"""A cache of the schema and config files of a workspace directory
+
+A `Workspace` keeps the schemas and configs it has loaded, with the modification
+time and size of their files, and knows which configs depend on which schema.
+`refresh` reloads only the files that changed, plus the configs of a changed
+schema since a config is resolved against its schema, and sends a `Change` for
+each of them to the subscribers. `src.watch` calls it when files change on disk.
+Getters check the file they return, so they never hand out stale data, with or
+without a watcher.
+
+A workspace that does not `discover` files only follows the files it was asked
+for, and the schemas of its configs: `refresh` does not look for new files
+below the root, and watchers only watch the directories of those files.
+"""
+
+import json
+import os
+import re
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Set, Tuple
+
+import src.model.cache as schema_cache
+import src.model.config as config_factory
+import src.model.sidecar as sidecar
+from src.model.config import Config
+from src.model.schema import Schema
+
+HEAD_SIZE = 4096
+
+_SCHEMA_PATH = re.compile(r'"schemaPath"\s*:\s*("(?:[^"\\]|\\.)*")')
+
+Version = Tuple[int, int] | None
+
+
+class Change(NamedTuple):
+    path: str
+    # "schema", "config", or "file" for a file that does not load
+    kind: str
+    # "added", "changed" or "removed"
+    action: str
+    # the schema whose change reloaded this config
+    cause: str | None = None
+
+
+class _Entry(NamedTuple):
+    kind: str
+    version: Version
+    value: Schema | Config | Exception
+    schema_path: str | None = None
+    schema_version: Version = None
+
+
+def find_files(paths: Iterable[str]) -> List[str]:
+    """Expands directories to the .json files below them"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs[:] = [name for name in dirs if not name.startswith(".")]
+                files.extend(
+                    os.path.join(root, name) for name in names if name.endswith(".json")
+                )
+        else:
+            files.append(path)
+    return files
+
+
+def schema_path_of(path: str) -> str:
+    """Finds the schema a config refers to without parsing the whole file
+
+    Returns "" for a schema, or a file that cannot be read.
+    """
+    try:
+        with open(path) as f:
+            head = f.read(HEAD_SIZE)
+    except (OSError, ValueError):
+        return ""
+    match = _SCHEMA_PATH.search(head)
+    return json.loads(match.group(1)) if match else ""
+
+
+def _version(path: str) -> Version:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class Workspace:
+    """The schemas and configs below `root`, reloaded when their files change"""
+
+    def __init__(self, root: str = ".", discover: bool = True):
+        self.root = os.path.realpath(root)
+        self.discover = discover
+        self._entries: Dict[str, _Entry] = {}
+        self._dependents: Dict[str, Set[str]] = {}
+        self._subscribers: List[Callable[[Change], None]] = []
+        self._lock = threading.RLock()
+
+    def __contains__(self, path: str) -> bool:
+        return os.path.realpath(path) in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # -----------------------------------------------------------------------------------------------
+    # Access
+    # -----------------------------------------------------------------------------------------------
+    def _get(self, path: str, kind: str) -> Schema | Config:
+        path = os.path.realpath(path)
+        self.refresh([path])
+        entry = self._entries.get(path)
+        if entry is None:
+            raise FileNotFoundError(f"File {path} does not exist")
+        if isinstance(entry.value, Exception):
+            raise entry.value
+        if entry.kind != kind:
+            raise ValueError(f"File {path} is not a {kind}")
+        return entry.value
+
+    def schema(self, path: str) -> Schema:
+        """Returns a snapshot of a schema, loading its file if it changed"""
+        return self._get(path, "schema").copy()  # type: ignore[return-value]
+
+    def config(self, path: str) -> Config:
+        """Returns a snapshot of a config, loading its file if it changed"""
+        return self._get(path, "config").copy()  # type: ignore[return-value]
+
+    def warm(self) -> int:
+        """Indexes and hashes the loaded documents, returns how many there are
+
+        Snapshots share the indexes and hashes of the document they were taken
+        from, so editors opening a warmed document do not build them again.
+        """
+        with self._lock:
+            documents = [
+                entry.value
+                for entry in self._entries.values()
+                if isinstance(entry.value, (Schema, Config))
+            ]
+        for document in documents:
+            document.build_indexes()
+            document.build_hashes()
+        return len(documents)
+
+    def dependents(self, path: str) -> List[str]:
+        """The loaded configs that refer to a schema"""
+        return sorted(self._dependents.get(os.path.realpath(path), ()))
+
+    def follows(self, path: str) -> bool:
+        """True if a change to the file would change the workspace"""
+        path = os.path.realpath(path)
+        with self._lock:
+            return path in self._entries or bool(self._dependents.get(path))
+
+    def directories(self) -> Set[str]:
+        """The directories of the loaded files and of the schemas of configs"""
+        with self._lock:
+            paths = set(self._entries).union(
+                path for path, configs in self._dependents.items() if configs
+            )
+        return {os.path.dirname(path) for path in paths}
+
+    # -----------------------------------------------------------------------------------------------
+    # Changes
+    # -----------------------------------------------------------------------------------------------
+    def subscribe(self, callback: Callable[[Change], None]) -> Callable[[], None]:
+        """Calls `callback` with every change, returns a function to unsubscribe"""
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def scan(self) -> List[Change]:
+        """Loads every file below the root, see `refresh`"""
+        return self.refresh(find_files([self.root]))
+
+    def refresh(self, paths: Iterable[str] | None = None) -> List[Change]:
+        """Reloads the files that changed and the configs of changed schemas
+
+        Without paths, every loaded file is checked and, if the workspace
+        discovers files, new files below the root are loaded. Returns the
+        changes, after sending them to the subscribers.
+        """
+        with self._lock:
+            if paths is None:
+                paths = set(self._entries)
+                if self.discover:
+                    paths.update(find_files([self.root]))
+            changes = []
+            for path in {os.path.realpath(path) for path in paths}:
+                change = self._reload(path)
+                if change is not None:
+                    changes.append(change)
+
+            reloaded = {change.path for change in changes}
+            for change in list(changes):
+                for path in self.dependents(change.path):
+                    if path in reloaded:
+                        continue
+                    reloaded.add(path)
+                    change = self._reload(path)  # type: ignore[assignment]
+                    if change is not None:
+                        changes.append(change)
+            subscribers = list(self._subscribers)
+
+        for change in changes:
+            for callback in subscribers:
+                callback(change)
+        return changes
+
+    def _reload(self, path: str) -> Change | None:
+        """Reloads one file if it, or the schema of a config, changed"""
+        old = self._entries.get(path)
+        version = _version(path)
+        if version is None:
+            if old is None:
+                return None
+            self._set(path, None)
+            return Change(path, old.kind, "removed")
+
+        cause = None
+        if old is not None and old.version == version:
+            if old.schema_path is None or old.schema_version == _version(
+                old.schema_path
+            ):
+                return None
+            cause = old.schema_path
+
+        entry = self._load(path, version)
+        self._set(path, entry)
+        return Change(path, entry.kind, "added" if old is None else "changed", cause)
+
+    def _load(self, path: str, version: Version) -> _Entry:
+        schema_path: str | None = schema_path_of(path) or None
+        schema_version = None
+        if schema_path is not None:
+            # taken before loading, a change made meanwhile reloads it again
+            schema_path = os.path.realpath(schema_path)
+            schema_version = _version(schema_path)
+        try:
+            if schema_path is None:
+                return _Entry("schema", version, schema_cache.load(path))
+            if sidecar.enabled:
+                config = sidecar.load_config(path)
+            else:
+                config = config_factory.load(path)
+        except Exception as e:
+            return _Entry("file", version, e, schema_path, schema_version)
+        return _Entry("config", version, config, schema_path, schema_version)
+
+    def _set(self, path: str, entry: _Entry | None) -> None:
+        old = self._entries.pop(path, None)
+        if old is not None and old.schema_path is not None:
+            self._dependents[old.schema_path].discard(path)
+        if entry is not None:
+            self._entries[path] = entry
+            if entry.schema_path is not None:
+                self._dependents.setdefault(entry.schema_path, set()).add(path)
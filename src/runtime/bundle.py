@@ -0,0 +1,68 @@
+"""Minimal reader for compiled config bundles
+
+A bundle holds the effective values of a config, already converted to their
+native types, in a flat JSON file written by `src.model.bundle`. This module
+only depends on the standard library so that flows can read a bundle without
+importing dash, pandas or dataclass_wizard.
+"""
+
+import json
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, Mapping
+
+FORMAT = "configtree-bundle"
+VERSION = 1
+
+
+class BundleError(Exception):
+    """Exception raised when a file is not a bundle this reader understands.
+
+    Attributes:
+        message -- explanation of the error
+    """
+
+    def __init__(self, message):
+        self.message = message
+        super().__init__(self.message)
+
+
+class Bundle(Mapping[str, Any]):
+    """The read-only values of a compiled config, by item name"""
+
+    __slots__ = ("name", "schema", "schema_version", "types", "_values")
+
+    def __init__(self, data: Dict[str, Any]):
+        if data.get("format") != FORMAT or data.get("version") != VERSION:
+            raise BundleError(
+                f"Not a version {VERSION} bundle: {data.get('format')} "
+                f"version {data.get('version')}"
+            )
+        self.name: str = data["name"]
+        self.schema: str = data["schema"]
+        self.schema_version: str = data["schemaVersion"]
+        self.types: Mapping[str, str] = MappingProxyType(data["types"])
+        self._values: Dict[str, Any] = data["values"]
+
+    def __getitem__(self, name: str) -> Any:
+        return self._values[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._values
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        return f"Bundle({self.name!r}, {len(self)} values)"
+
+
+def loads(text: str | bytes) -> Bundle:
+    return Bundle(json.loads(text))
+
+
+def load(filename: str) -> Bundle:
+    with open(filename, "rb") as f:
+        return loads(f.read())
@@ -0,0 +1,128 @@
+"""Client for the local config service
+
+`ConfigClient.get` fetches the bundle of a config from `src.service` and keeps
+it with its ETag. Later calls revalidate with If-None-Match, so an unchanged
+config costs a 304 response and no parsing. Connections are kept alive and
+reused from a pool, so threads of a flow can share one client. Like
+`src.runtime.bundle`, this module only depends on the standard library.
+"""
+
+import http.client
+import json
+import queue
+import socket
+import threading
+from typing import Dict, Tuple
+from urllib.parse import quote
+
+from src.runtime.bundle import Bundle
+
+POOL_SIZE = 8
+TIMEOUT = 10.0
+
+_PREFIX = "/configs/"
+
+
+class ServiceError(Exception):
+    """Exception raised when the service cannot return a config.
+
+    Attributes:
+        status -- HTTP status of the response
+        message -- explanation of the error
+    """
+
+    def __init__(self, status, message):
+        self.status = status
+        self.message = message
+        super().__init__(self.message)
+
+
+class _UnixConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class ConfigClient:
+    """Fetches bundles from a config service at "host:port" or a socket path"""
+
+    def __init__(
+        self, address: str, pool_size: int = POOL_SIZE, timeout: float = TIMEOUT
+    ):
+        self.address = address
+        self.timeout = timeout
+        self._pool: queue.LifoQueue[http.client.HTTPConnection] = queue.LifoQueue(
+            pool_size
+        )
+        self._bundles: Dict[str, Tuple[str, Bundle]] = {}
+        self._lock = threading.Lock()
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if "/" in self.address or ":" not in self.address:
+            return _UnixConnection(self.address, self.timeout)
+        host, port = self.address.rsplit(":", 1)
+        return http.client.HTTPConnection(host, int(port), timeout=self.timeout)
+
+    def _request(self, path: str, headers: Dict[str, str]) -> Tuple[int, str, bytes]:
+        try:
+            connection = self._pool.get_nowait()
+        except queue.Empty:
+            connection = self._connect()
+        try:
+            try:
+                connection.request("GET", path, headers=headers)
+                response = connection.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError):
+                # the server closed an idle connection, a new one is opened
+                connection.close()
+                connection.request("GET", path, headers=headers)
+                response = connection.getresponse()
+            body = response.read()
+        except BaseException:
+            connection.close()
+            raise
+        finally:
+            try:
+                self._pool.put_nowait(connection)
+            except queue.Full:
+                connection.close()
+        return response.status, response.getheader("ETag", ""), body
+
+    def get(self, name: str) -> Bundle:
+        """Returns the bundle of a config, by its path below the served root"""
+        with self._lock:
+            cached = self._bundles.get(name)
+        headers = {} if cached is None else {"If-None-Match": cached[0]}
+        status, etag, body = self._request(_PREFIX + quote(name), headers)
+        if status == 304 and cached is not None:
+            return cached[1]
+        if status != 200:
+            try:
+                message = json.loads(body)["error"]
+            except (ValueError, KeyError, TypeError):
+                message = body.decode(errors="replace")
+            raise ServiceError(status, message)
+
+        result = Bundle(json.loads(body))
+        with self._lock:
+            self._bundles[name] = (etag, result)
+        return result
+
+    def close(self) -> None:
+        """Closes the pooled connections"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def __enter__(self) -> "ConfigClient":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,290 @@
+"""Publishing config bundles in shared memory for worker processes
+
+A `Publisher` writes a bundle (see `src.model.bundle.to_dict`) into a block of
+`multiprocessing.shared_memory` once, and any number of processes attach to it
+by name with `attach`. Workers read values straight out of the shared block, no
+file is parsed and no object graph is copied per process.
+
+Each publish creates a new block called `<name>_<version>` and then bumps the
+version in a small control block called `<name>`. A `SharedBundle` compares its
+version with the control block to tell whether a newer config was published,
+and `refresh` attaches to it. Blocks are read-only by convention: only the
+publisher writes them, before the version that points to them is published.
+
+Layout of a block, all integers little endian:
+
+    header   magic, layout version, config version, item count and the
+             offsets of the three sections below
+    meta     JSON: bundle name, schema, schema version, item names and types
+    slots    16 bytes per item: a type code then an int64, a float64, a bool
+             or the (offset, length) of a string
+    strings  UTF-8 text of the string values
+"""
+
+import json
+import struct
+import sys
+import threading
+from multiprocessing import resource_tracker, shared_memory
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping
+
+LAYOUT = 1
+
+_HEADER = struct.Struct("<4sIQIIII")
+_CONTROL = struct.Struct("<4sIQ")
+_MAGIC = b"CTSM"
+_CONTROL_MAGIC = b"CTSC"
+
+_SLOT_SIZE = 16
+_CODE = struct.Struct("<B")
+_INT = struct.Struct("<q")
+_FLOAT = struct.Struct("<d")
+_BOOL = struct.Struct("<?")
+_STR = struct.Struct("<II")
+
+_NONE, _STRING, _INTEGER, _REAL, _BOOLEAN, _JSON = range(6)
+
+_ATTACH_RETRIES = 10
+_REGISTER_LOCK = threading.Lock()
+
+
+class SharedBundleError(Exception):
+    """Exception raised when a shared block is missing or not understood.
+
+    Attributes:
+        message -- explanation of the error
+    """
+
+    def __init__(self, message):
+        self.message = message
+        super().__init__(self.message)
+
+
+def _block_name(name: str, version: int) -> str:
+    return f"{name}_{version}"
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Opens an existing block without making this process responsible for it"""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)  # type: ignore[call-arg]
+    # Before 3.13 attaching registers the block with the resource tracker, which
+    # would unlink it when this process exits, or unregister the publisher's
+    # own registration when it shares the tracker.
+    with _REGISTER_LOCK:
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name)
+        finally:
+            resource_tracker.register = register
+
+
+def encode(bundle: Mapping[str, Any], version: int) -> bytes:
+    """Returns the shared layout of a bundle dict"""
+    values: Mapping[str, Any] = bundle["values"]
+    names = list(values)
+    meta = json.dumps(
+        {
+            "name": bundle["name"],
+            "schema": bundle["schema"],
+            "schemaVersion": bundle["schemaVersion"],
+            "names": names,
+            "types": [bundle["types"].get(name) for name in names],
+        },
+        separators=(",", ":"),
+    ).encode()
+
+    slots = bytearray(_SLOT_SIZE * len(names))
+    strings = bytearray()
+    for i, name in enumerate(names):
+        value = values[name]
+        offset = i * _SLOT_SIZE
+        kind = type(value)
+        if value is None:
+            code = _NONE
+        elif kind is bool:
+            code = _BOOLEAN
+            _BOOL.pack_into(slots, offset + 8, value)
+        elif kind is int and -(2**63) <= value < 2**63:
+            code = _INTEGER
+            _INT.pack_into(slots, offset + 8, value)
+        elif kind is float:
+            code = _REAL
+            _FLOAT.pack_into(slots, offset + 8, value)
+        else:
+            code = _STRING if kind is str else _JSON
+            text = (value if kind is str else json.dumps(value)).encode()
+            _STR.pack_into(slots, offset + 8, len(strings), len(text))
+            strings += text
+        _CODE.pack_into(slots, offset, code)
+
+    meta_offset = _HEADER.size
+    slots_offset = meta_offset + len(meta)
+    strings_offset = slots_offset + len(slots)
+    header = _HEADER.pack(
+        _MAGIC, LAYOUT, version, len(names), meta_offset, slots_offset, strings_offset
+    )
+    return header + meta + bytes(slots) + bytes(strings)
+
+
+class Publisher:
+    """Publishes successive versions of a bundle under one name"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.version = 0
+        self._control = shared_memory.SharedMemory(
+            name, create=True, size=_CONTROL.size
+        )
+        _CONTROL.pack_into(self._control.buf, 0, _CONTROL_MAGIC, LAYOUT, 0)
+        self._block: shared_memory.SharedMemory | None = None
+
+    def publish(self, bundle: Mapping[str, Any]) -> int:
+        """Publishes a bundle dict, returns its version"""
+        version = self.version + 1
+        data = encode(bundle, version)
+        block = shared_memory.SharedMemory(
+            _block_name(self.name, version), create=True, size=len(data)
+        )
+        block.buf[: len(data)] = data
+
+        _CONTROL.pack_into(self._control.buf, 0, _CONTROL_MAGIC, LAYOUT, version)
+        self.version = version
+        # readers that attached to the old block keep their mapping
+        if self._block is not None:
+            self._block.close()
+            self._block.unlink()
+        self._block = block
+        return version
+
+    def close(self) -> None:
+        """Removes the published blocks"""
+        for block in (self._block, self._control):
+            if block is not None:
+                block.close()
+                block.unlink()
+        self._block = None
+
+    def __enter__(self) -> "Publisher":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+def _published_version(control: shared_memory.SharedMemory) -> int:
+    magic, layout, version = _CONTROL.unpack_from(control.buf, 0)
+    if magic != _CONTROL_MAGIC or layout != LAYOUT:
+        raise SharedBundleError(f"{control.name} is not a layout {LAYOUT} control")
+    return version
+
+
+class SharedBundle(Mapping[str, Any]):
+    """The values of a published bundle, read from shared memory"""
+
+    def __init__(self, name: str):
+        self.name = name
+        try:
+            self._control = _attach(name)
+        except FileNotFoundError:
+            raise SharedBundleError(f"Nothing is published as {name}") from None
+        self._block: shared_memory.SharedMemory | None = None
+        self._open()
+
+    def _open(self) -> None:
+        for _ in range(_ATTACH_RETRIES):
+            version = _published_version(self._control)
+            if version == 0:
+                raise SharedBundleError(f"Nothing is published as {self.name} yet")
+            try:
+                block = _attach(_block_name(self.name, version))
+                break
+            except FileNotFoundError:
+                # a newer version was published while we were attaching
+                continue
+        else:
+            raise SharedBundleError(f"Could not attach to {self.name}")
+
+        buf = block.buf
+        magic, layout, version, count, meta_offset, slots_offset, strings_offset = (
+            _HEADER.unpack_from(buf, 0)
+        )
+        if magic != _MAGIC or layout != LAYOUT:
+            block.close()
+            raise SharedBundleError(f"{block.name} is not a layout {LAYOUT} block")
+        meta = json.loads(bytes(buf[meta_offset:slots_offset]))
+
+        if self._block is not None:
+            self._block.close()
+        self._block = block
+        self._buf = buf
+        self.version: int = version
+        self.bundle_name: str = meta["name"]
+        self.schema: str = meta["schema"]
+        self.schema_version: str = meta["schemaVersion"]
+        names: List[str] = meta["names"]
+        self.types: Mapping[str, str] = MappingProxyType(
+            dict(zip(names, meta["types"]))
+        )
+        self._slots: Dict[str, int] = {
+            name: slots_offset + i * _SLOT_SIZE for i, name in enumerate(names)
+        }
+        self._strings = strings_offset
+
+    def is_stale(self) -> bool:
+        """True if a newer version was published since we attached"""
+        return _published_version(self._control) != self.version
+
+    def refresh(self) -> bool:
+        """Attaches to the latest version, returns True if it changed"""
+        if not self.is_stale():
+            return False
+        self._open()
+        return True
+
+    def __getitem__(self, name: str) -> Any:
+        offset = self._slots[name]
+        buf = self._buf
+        code = buf[offset]
+        if code == _INTEGER:
+            return _INT.unpack_from(buf, offset + 8)[0]
+        if code == _REAL:
+            return _FLOAT.unpack_from(buf, offset + 8)[0]
+        if code == _BOOLEAN:
+            return buf[offset + 8] != 0
+        if code == _NONE:
+            return None
+        start, length = _STR.unpack_from(buf, offset + 8)
+        start += self._strings
+        text = str(buf[start : start + length], "utf-8")
+        return text if code == _STRING else json.loads(text)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._slots
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._slots)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def close(self) -> None:
+        """Detaches from shared memory, the values can no longer be read"""
+        self._buf = None  # type: ignore[assignment]
+        if self._block is not None:
+            self._block.close()
+            self._block = None
+        self._control.close()
+
+    def __enter__(self) -> "SharedBundle":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+def attach(name: str) -> SharedBundle:
+    """Attaches to the latest bundle published as `name`"""
+    return SharedBundle(name)
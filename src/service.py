@@ -0,0 +1,215 @@
+"""Local read API serving compiled configs
+
+    GET /configs/<path>
+
+returns the bundle of the config file at <path>, relative to the served
+directory, as JSON (see src/model/bundle.py). Bundles are built once and kept in
+memory until the config or its schema file changes, detected by modification
+time and size. Each response carries a strong ETag, a hash of its body, so
+clients revalidate with If-None-Match and get 304 Not Modified while the config
+is unchanged. `src.runtime.client` is a matching client.
+
+The service listens on a TCP address ("host:port") or on a Unix socket (a path),
+with a thread per connection and HTTP/1.1 keep-alive.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import stat
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import BaseServer, ThreadingMixIn, UnixStreamServer
+from typing import NamedTuple, Tuple
+from urllib.parse import unquote, urlsplit
+
+import src.model.bundle as bundle
+import src.model.config as config_factory
+import src.model.sidecar as sidecar
+
+PREFIX = "/configs/"
+MAXSIZE = 256
+# the default backlog of 5 drops connections when many clients start at once
+BACKLOG = 128
+
+Version = Tuple[int, int] | None
+
+
+class Entry(NamedTuple):
+    config_version: Version
+    schema_path: str
+    schema_version: Version
+    body: bytes
+    etag: str
+
+
+def _version(path: str) -> Version:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class ConfigService:
+    """Bundles of the configs below `root`, rebuilt when their files change"""
+
+    def __init__(self, root: str, maxsize: int = MAXSIZE):
+        self.root = os.path.realpath(root)
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, name: str) -> str:
+        path = os.path.realpath(os.path.join(self.root, name))
+        if not path.startswith(self.root + os.sep) or not os.path.isfile(path):
+            raise FileNotFoundError(f"Config {name} does not exist")
+        return path
+
+    def get(self, name: str) -> Entry:
+        """Returns the bundle of a config, building it if a file has changed"""
+        path = self._path(name)
+        config_version = _version(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if (
+                entry is not None
+                and entry.config_version == config_version
+                and entry.schema_version == _version(entry.schema_path)
+            ):
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        # versions are taken before reading, so a change made while the bundle
+        # is built makes the next request build it again
+        if sidecar.enabled:
+            config = sidecar.load_config(path)
+        else:
+            config = config_factory.load(path)
+        schema_version = _version(config.schema_path)
+        body = json.dumps(bundle.to_dict(config), separators=(",", ":")).encode()
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        entry = Entry(config_version, config.schema_path, schema_version, body, etag)
+        with self._lock:
+            self._entries[path] = entry
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return entry
+
+
+def _matches(header: str | None, etag: str) -> bool:
+    """True if an If-None-Match header matches the ETag"""
+    if header is None:
+        return False
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "ServiceServer"
+
+    def do_GET(self) -> None:
+        path = urlsplit(self.path).path
+        if not path.startswith(PREFIX):
+            self._send_error(404, f"Unknown path {path}")
+            return
+        try:
+            entry = self.server.service.get(unquote(path[len(PREFIX) :]))
+        except FileNotFoundError as e:
+            self._send_error(404, str(e))
+            return
+        except Exception as e:
+            self._send_error(422, f"{type(e).__name__}: {e}")
+            return
+
+        if _matches(self.headers.get("If-None-Match"), entry.etag):
+            self.send_response(304)
+            self.send_header("ETag", entry.etag)
+            self.end_headers()
+            return
+        self._send(200, entry.body, entry.etag)
+
+    def _send(self, status: int, body: bytes, etag: str | None = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if etag is not None:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, message: str) -> None:
+        self._send(status, json.dumps({"error": message}).encode())
+
+    def log_request(self, code: int | str = "-", size: int | str = "-") -> None:
+        # one line per request would cost more than serving it, errors are still
+        # logged
+        pass
+
+
+class _TCPHandler(Handler):
+    # headers and body are written separately, Nagle would delay the body
+    disable_nagle_algorithm = True
+
+
+class ServiceServer(BaseServer):
+    service: ConfigService
+
+
+class _TCPServer(ThreadingHTTPServer, ServiceServer):
+    daemon_threads = True
+    request_queue_size = BACKLOG
+
+
+class _UnixServer(ThreadingMixIn, UnixStreamServer, ServiceServer):
+    daemon_threads = True
+    request_queue_size = BACKLOG
+
+    def get_request(self) -> tuple:
+        # Unix sockets have no client address, the handler logs one
+        request, _ = super().get_request()
+        return request, ("local", 0)
+
+
+def is_unix_address(address: str) -> bool:
+    return os.sep in address or ":" not in address
+
+
+def make_server(service: ConfigService, address: str) -> ServiceServer:
+    """Binds a server to "host:port" or to a Unix socket path"""
+    server: ServiceServer
+    if is_unix_address(address):
+        # a socket left behind by a server that did not shut down
+        if os.path.exists(address) and stat.S_ISSOCK(os.stat(address).st_mode):
+            os.remove(address)
+        server = _UnixServer(address, Handler)
+    else:
+        host, port = address.rsplit(":", 1)
+        server = _TCPServer((host, int(port)), _TCPHandler)
+    server.service = service
+    return server
+
+
+def serve(root: str, address: str) -> None:
+    """Serves the configs below `root` until interrupted"""
+    server = make_server(ConfigService(root), address)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if server.socket.family == socket.AF_UNIX:
+            os.remove(address)
@@ -0,0 +1,201 @@
+"""Production serving of the editor
+
+`main.create_app(production=True)` uses these on the Flask server of the Dash
+app:
+
+- `compress` compresses callback responses, pages and static files with brotli,
+  when the `brotli` package is installed and the browser accepts it, or gzip.
+  Static files are compressed once per version of the file and kept in memory.
+- `cache_assets` lets browsers keep the files of assets/. Dash links them with
+  their modification time in the query string, so those links are cached for a
+  year and a changed file gets a new link; other requests are revalidated after
+  `ASSET_MAX_AGE` seconds.
+- `preload` loads the given documents, and those below the root of a workspace
+  that discovers files, with their indexes and hashes, and renders the index
+  page once, before the first browser asks. Nothing else below the working
+  directory is loaded.
+"""
+
+import gzip
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterable, Tuple
+
+import flask
+from dash import Dash
+
+from src.model.workspace import Workspace, find_files
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# smaller responses gain less than the compression costs
+MIN_SIZE = 500
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+# static files are compressed once at the best level
+STATIC_GZIP_LEVEL = 9
+STATIC_BROTLI_QUALITY = 11
+# compressed static files kept in memory
+MAX_STATIC = 256
+
+ASSET_MAX_AGE = 3600
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+# the files of assets/ and of the Dash components
+STATIC_PREFIXES = ("/assets/", "/_dash-component-suites/")
+
+COMPRESSIBLE = {
+    "application/javascript",
+    "application/json",
+    "application/xml",
+    "image/svg+xml",
+    "text/css",
+    "text/html",
+    "text/javascript",
+    "text/plain",
+}
+
+
+def _gzip(data: bytes, level: int) -> bytes:
+    # mtime=0: the same bytes for the same data, so ETags stay meaningful
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _encodings() -> Tuple[Tuple[str, Callable[[bytes, bool], bytes]], ...]:
+    """The encodings this server can use, preferred first"""
+    encodings: Tuple[Tuple[str, Callable[[bytes, bool], bytes]], ...] = (
+        (
+            "gzip",
+            lambda data, static: _gzip(
+                data, STATIC_GZIP_LEVEL if static else GZIP_LEVEL
+            ),
+        ),
+    )
+    if brotli is not None:
+        encodings = (
+            (
+                "br",
+                lambda data, static: brotli.compress(
+                    data, quality=STATIC_BROTLI_QUALITY if static else BROTLI_QUALITY
+                ),
+            ),
+        ) + encodings
+    return encodings
+
+
+def _accepted(accept_encoding: str, encoding: str) -> bool:
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip().lower() == encoding:
+            return params.replace(" ", "") != "q=0"
+    return False
+
+
+class _StaticCache:
+    """Compressed static files, least recently used first"""
+
+    def __init__(self, size: int = MAX_STATIC):
+        self.size = size
+        self._entries: OrderedDict[Tuple[str, str, str], bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str, str], compress: Callable[[], bytes]) -> bytes:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                return data
+        data = compress()
+        with self._lock:
+            self._entries[key] = data
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return data
+
+
+def compress(server: flask.Flask, min_size: int = MIN_SIZE) -> None:
+    """Compresses the responses of a server that the browser accepts encoded"""
+    encodings = _encodings()
+    static = _StaticCache()
+
+    @server.after_request
+    def compress_response(response: flask.Response) -> flask.Response:
+        if (
+            response.status_code != 200
+            or (response.is_streamed and not response.direct_passthrough)
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE
+        ):
+            return response
+        accept = flask.request.headers.get("Accept-Encoding", "")
+        for encoding, encode in encodings:
+            if _accepted(accept, encoding):
+                break
+        else:
+            response.vary.add("Accept-Encoding")
+            return response
+
+        etag, _ = response.get_etag()
+        response.direct_passthrough = False
+        data = response.get_data()
+        if len(data) < min_size:
+            return response
+        if flask.request.path.startswith(STATIC_PREFIXES):
+            # their path, with the version in the query string, and their ETag
+            # name a version of the file
+            key = (flask.request.full_path, etag or "", encoding)
+            body = static.get(key, lambda: encode(data, True))
+        else:
+            body = encode(data, False)
+
+        response.set_data(body)
+        response.headers["Content-Encoding"] = encoding
+        # ranges would be of the encoded bytes
+        response.headers.pop("Accept-Ranges", None)
+        response.vary.add("Accept-Encoding")
+        if etag:
+            # the same resource, but not the same bytes
+            response.set_etag(etag, weak=True)
+        return response
+
+
+def cache_assets(
+    server: flask.Flask, prefix: str = "/assets/", max_age: int = ASSET_MAX_AGE
+) -> None:
+    """Sets Cache-Control on the files of assets/"""
+
+    @server.after_request
+    def cache_asset(response: flask.Response) -> flask.Response:
+        if not flask.request.path.startswith(prefix) or response.status_code not in (
+            200,
+            304,
+        ):
+            return response
+        response.cache_control.public = True
+        response.cache_control.no_cache = None
+        if "m" in flask.request.args:
+            # the link changes with the file
+            response.cache_control.max_age = IMMUTABLE_MAX_AGE
+            response.cache_control.immutable = True
+        else:
+            response.cache_control.max_age = max_age
+        return response
+
+
+def preload(app: Dash, workspace: Workspace, paths: Iterable[str] = ()) -> int:
+    """Loads and prepares documents and pages, returns the documents loaded
+
+    `paths` are schema and config files, or directories of them.
+    """
+    if workspace.discover:
+        workspace.scan()
+    workspace.refresh(find_files(paths))
+    documents = workspace.warm()
+    with app.server.test_client() as client:
+        # the first request builds the index page and the callback map
+        for path in ("/", "/_dash-layout", "/_dash-dependencies"):
+            client.get(path)
+    return documents
@@ -0,0 +1,367 @@
+"""Editor state per browser session
+
+Each browser gets a session id in the `configtree_session` cookie, and the
+callbacks it triggers see the state of its own session, so several users can
+edit different schemas at once. `SessionStore` keeps the states of the sessions
+in memory, least recently used first, and evicts the sessions that have been
+idle for `idle_seconds`, the oldest ones above `max_sessions`, and the oldest
+ones while the estimated memory of all sessions is above `max_bytes`.
+
+With a `directory`, set through the CONFIGTREE_SESSION_DIR environment variable,
+the state of a session is also written to a file in that directory after each
+callback that changed it, and read back when another process changed the file,
+so a server with several worker processes can send any request to any worker.
+The requests of a session then hold a lock on its lock file, since Dash runs
+the callbacks of a page in parallel, and `prune_files` only removes the files
+of sessions no request holds. Without a directory, the state of a session
+only lives in the process that created it, and a multi-process server needs
+sticky sessions.
+
+The state is an object of the `factory` class given to the store, with these
+methods:
+
+- `fingerprint()`, which changes whenever the state does, cheaply
+- `footprint()`, the estimated bytes the state holds alone
+- `to_dict()` and the class method `from_dict()`, for the files
+"""
+
+import json
+import os
+import re
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Generic, List, Protocol, Tuple, Type, TypeVar
+
+import flask
+
+import src.helpers.files as files
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover, windows
+    fcntl = None  # type: ignore[assignment]
+
+COOKIE = "configtree_session"
+# the session of code running outside a request, tests and scripts
+LOCAL = "local"
+
+MAX_SESSIONS = int(os.environ.get("CONFIGTREE_SESSIONS", "100"))
+MAX_BYTES = int(os.environ.get("CONFIGTREE_SESSION_BYTES", str(512 * 2**20)))
+IDLE_SECONDS = float(os.environ.get("CONFIGTREE_SESSION_IDLE", "3600"))
+# how often the files of idle sessions are looked for
+PRUNE_SECONDS = 600
+
+# the requests that run callbacks, the only ones that use the state
+_CALLBACK_PATH = "_dash-update-component"
+_SESSION_ID = re.compile(r"^[A-Za-z0-9_-]{16,64}$")
+
+
+class State(Protocol):
+    def fingerprint(self) -> Any: ...
+
+    def footprint(self) -> int: ...
+
+    def to_dict(self) -> Dict[str, Any]: ...
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "State": ...
+
+
+S = TypeVar("S", bound=State)
+
+
+class Session(Generic[S]):
+    def __init__(self, state: S):
+        self.state = state
+        self.last_used = time.monotonic()
+        # the fingerprint of the state when it was last accounted and saved
+        self.fingerprint: Any = state.fingerprint()
+        self.bytes = state.footprint()
+        # (mtime, size) of the session file last read or written
+        self.file_version: Tuple[int, int] | None = None
+
+
+class SessionStore(Generic[S]):
+    """The state of each session, with LRU eviction and memory accounting"""
+
+    def __init__(
+        self,
+        factory: Type[S],
+        directory: str | None = None,
+        max_sessions: int = MAX_SESSIONS,
+        max_bytes: int = MAX_BYTES,
+        idle_seconds: float = IDLE_SECONDS,
+    ):
+        self.factory = factory
+        self.directory = directory
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.idle_seconds = idle_seconds
+        self._sessions: OrderedDict[str, Session[S]] = OrderedDict()
+        self._lock = threading.RLock()
+        self._pruned = time.monotonic()
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    # -----------------------------------------------------------------------------------------------
+    # Access
+    # -----------------------------------------------------------------------------------------------
+    def get(self, session_id: str, refresh: bool = False) -> S:
+        """The state of a session, created or read from its file if needed
+
+        With `refresh` set, the state is read again if another process changed
+        its file.
+        """
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or (refresh and self._file_changed(session_id, session)):
+                session = self._open(session_id)
+                self._sessions[session_id] = session
+                self._evict(keep=session_id)
+            self._sessions.move_to_end(session_id)
+            session.last_used = time.monotonic()
+            return session.state
+
+    def current(self) -> S:
+        """The state of the session of the current request"""
+        if flask.has_request_context():
+            state = flask.g.get("session_state")
+            if state is not None:
+                return state
+            session_id = flask.g.get("session_id")
+            if session_id is not None:
+                flask.g.session_state = state = self.get(session_id)
+                return state
+        return self.get(LOCAL)
+
+    def states(self) -> List[S]:
+        """The states of the sessions in memory"""
+        with self._lock:
+            return [session.state for session in self._sessions.values()]
+
+    def memory(self) -> int:
+        """Estimated bytes held by the states of all sessions"""
+        with self._lock:
+            return sum(session.bytes for session in self._sessions.values())
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Size and idle time of each session, least recently used first"""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "session": session_id[:8],
+                    "bytes": session.bytes,
+                    "idle": now - session.last_used,
+                }
+                for session_id, session in self._sessions.items()
+            ]
+
+    def commit(self, session_id: str) -> None:
+        """Accounts, and saves if it has a directory, a session after a change"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return
+            fingerprint = session.state.fingerprint()
+            if fingerprint == session.fingerprint:
+                return
+            session.fingerprint = fingerprint
+            session.bytes = session.state.footprint()
+            if self.directory is not None:
+                session.file_version = self._save(session_id, session.state)
+            self._evict(keep=session_id)
+        if time.monotonic() - self._pruned > PRUNE_SECONDS:
+            self._pruned = time.monotonic()
+            self.prune_files()
+
+    def discard(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    # -----------------------------------------------------------------------------------------------
+    # Eviction
+    # -----------------------------------------------------------------------------------------------
+    def _evict(self, keep: str) -> None:
+        """Removes idle sessions, then the oldest ones above the limits"""
+        sessions = self._sessions
+        now = time.monotonic()
+        for session_id in [
+            session_id
+            for session_id, session in sessions.items()
+            if now - session.last_used > self.idle_seconds and session_id != keep
+        ]:
+            del sessions[session_id]
+
+        total = sum(session.bytes for session in sessions.values())
+        for session_id in list(sessions):
+            if len(sessions) <= self.max_sessions and total <= self.max_bytes:
+                break
+            if session_id != keep:
+                total -= sessions.pop(session_id).bytes
+
+    # -----------------------------------------------------------------------------------------------
+    # Files
+    # -----------------------------------------------------------------------------------------------
+    def _path(self, session_id: str) -> str:
+        return os.path.join(self.directory or "", session_id + ".json")
+
+    def _file_version(self, session_id: str) -> Tuple[int, int] | None:
+        try:
+            st = os.stat(self._path(session_id))
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _file_changed(self, session_id: str, session: Session[S]) -> bool:
+        if self.directory is None:
+            return False
+        return self._file_version(session_id) != session.file_version
+
+    def _open(self, session_id: str) -> Session[S]:
+        if self.directory is not None:
+            path = self._path(session_id)
+            try:
+                with open(path, "rb") as f:
+                    st = os.fstat(f.fileno())
+                    data = json.load(f)
+                session = Session(self.factory.from_dict(data))  # type: ignore[arg-type]
+                session.file_version = (st.st_mtime_ns, st.st_size)
+                return session
+            except (OSError, ValueError, KeyError, TypeError):
+                pass  # a new session, or one that can not be restored
+        return Session(self.factory())
+
+    def _save(self, session_id: str, state: S) -> Tuple[int, int] | None:
+        data = json.dumps(state.to_dict()).encode()
+        try:
+            os.makedirs(self.directory or ".", exist_ok=True)
+            st = files.write_atomic(self._path(session_id), data)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def prune_files(self) -> int:
+        """Removes the files of sessions idle for longer than `idle_seconds`
+
+        A session is idle when neither its state nor its lock file, touched by
+        every request, changed since. Returns the sessions removed.
+        """
+        if self.directory is None:
+            return 0
+        oldest = time.time() - self.idle_seconds
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError:
+            return 0
+        idle: Dict[str, bool] = {}
+        for entry in entries:
+            session_id, extension = os.path.splitext(entry.name)
+            if extension not in (".json", ".lock"):
+                continue
+            try:
+                old = entry.stat().st_mtime < oldest
+            except OSError:
+                continue
+            idle[session_id] = idle.get(session_id, True) and old
+
+        removed = 0
+        for session_id in [session_id for session_id, old in idle.items() if old]:
+            fd = self._lock_file(session_id, blocking=False)
+            if fd is None:
+                continue  # a request is using the session
+            try:
+                for path in (self._path(session_id), self._lock_path(session_id)):
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+                removed += 1
+            except OSError:
+                pass
+            finally:
+                if fd >= 0:
+                    os.close(fd)
+        return removed
+
+    # -----------------------------------------------------------------------------------------------
+    # Requests
+    # -----------------------------------------------------------------------------------------------
+    def _lock_path(self, session_id: str) -> str:
+        return os.path.join(self.directory or "", session_id + ".lock")
+
+    def _lock_file(self, session_id: str, blocking: bool = True) -> int | None:
+        """Locks the lock file of a session, returns its descriptor
+
+        Returns None if `blocking` is not set and another request holds the
+        lock, and -1 where files cannot be locked.
+        """
+        if fcntl is None:
+            return -1
+        path = self._lock_path(session_id)
+        while True:
+            fd = os.open(path, os.O_CREAT | os.O_RDWR)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                os.close(fd)
+                return None
+            try:
+                current = os.fstat(fd).st_ino == os.stat(path).st_ino
+            except FileNotFoundError:
+                current = False
+            if current:
+                return fd
+            # prune_files removed the file meanwhile, lock the one at the path
+            os.close(fd)
+
+    def _acquire(self, session_id: str) -> None:
+        """Serializes the requests of a session across processes"""
+        if self.directory is None or fcntl is None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        fd = self._lock_file(session_id)
+        if fd is not None:
+            # flock does not change the file, its time tells when it was last used
+            os.utime(fd)
+            flask.g.session_lock = fd
+
+    def _release(self) -> None:
+        fd = flask.g.pop("session_lock", None)
+        if fd is not None:
+            os.close(fd)  # closing releases the lock
+
+    def init_app(self, server: flask.Flask) -> None:
+        """Gives each browser a session and its callbacks the session's state"""
+
+        @server.before_request
+        def open_session() -> None:
+            session_id = flask.request.cookies.get(COOKIE, "")
+            if not _SESSION_ID.match(session_id):
+                session_id = secrets.token_urlsafe(24)
+                flask.g.new_session = True
+            flask.g.session_id = session_id
+            if flask.request.path.endswith(_CALLBACK_PATH):
+                self._acquire(session_id)
+                flask.g.session_state = self.get(session_id, refresh=True)
+                flask.g.session_used = True
+
+        @server.after_request
+        def close_session(response: flask.Response) -> flask.Response:
+            if flask.g.get("session_used"):
+                self.commit(flask.g.session_id)
+            if flask.g.get("new_session"):
+                response.set_cookie(
+                    COOKIE, flask.g.session_id, httponly=True, samesite="Lax"
+                )
+            return response
+
+        @server.teardown_request
+        def release_session(error: BaseException | None) -> None:
+            self._release()
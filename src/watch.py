@@ -0,0 +1,205 @@
+"""Watching a workspace directory for changed files
+
+A watcher runs in a background thread and calls `Workspace.refresh` with the
+files that changed, so the workspace reloads them and notifies its subscribers.
+`start` uses inotify where the platform has it, and otherwise polls the files
+of the workspace every `interval` seconds.
+
+inotify reports events per directory, so every directory below the root is
+watched, and directories created later are added as they appear. For a
+workspace that does not discover files, only the directories of the files it
+follows are watched, as they are loaded, and events for other files are
+ignored. Events are collected for `DEBOUNCE` seconds before refreshing, so a
+git checkout that rewrites many files reloads each of them once.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Set
+
+from src.model.workspace import Workspace, find_files
+
+INTERVAL = 1.0
+DEBOUNCE = 0.05
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+_MASK = (
+    _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+)
+_EVENT = struct.Struct("iIII")
+_BUFFER_SIZE = 64 * 1024
+
+
+class Watcher(ABC):
+    """Refreshes a workspace from a background thread until stopped"""
+
+    def __init__(self, workspace: Workspace):
+        self.workspace = workspace
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> "Watcher":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def __enter__(self) -> "Watcher":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    @abstractmethod
+    def _run(self) -> None: ...
+
+
+class PollingWatcher(Watcher):
+    """Checks the modification time of every file each `interval` seconds"""
+
+    def __init__(self, workspace: Workspace, interval: float = INTERVAL):
+        super().__init__(workspace)
+        self.interval = interval
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.workspace.refresh()
+
+
+class InotifyWatcher(Watcher):
+    """Refreshes the files inotify reports as changed"""
+
+    def __init__(self, workspace: Workspace):
+        super().__init__(workspace)
+        libc_name = ctypes.util.find_library("c")
+        if not sys.platform.startswith("linux") or libc_name is None:
+            raise OSError("inotify is not available")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # written to by stop, to wake the thread up
+        self._wake_read, self._wake_write = os.pipe()
+        self._dirs: Dict[int, str] = {}
+        self._unsubscribe: Callable[[], None] | None = None
+        if workspace.discover:
+            self._add_tree(workspace.root)
+        else:
+            self._add_followed()
+            # files loaded later are watched as they are loaded
+            self._unsubscribe = workspace.subscribe(lambda _: self._add_followed())
+
+    def stop(self) -> None:
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+        self._stop.set()
+        os.write(self._wake_write, b"x")
+        if self._thread.is_alive():
+            self._thread.join()
+        for fd in (self._fd, self._wake_read, self._wake_write):
+            os.close(fd)
+
+    def _add_dir(self, path: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), _MASK)
+        if wd >= 0:
+            self._dirs[wd] = path
+
+    def _add_tree(self, root: str) -> None:
+        """Watches a directory and the directories below it"""
+        for path, dirs, _ in os.walk(root):
+            dirs[:] = [name for name in dirs if not name.startswith(".")]
+            self._add_dir(path)
+
+    def _add_followed(self) -> None:
+        """Watches the directories of the files the workspace follows"""
+        for path in self.workspace.directories().difference(list(self._dirs.values())):
+            self._add_dir(path)
+
+    def _read_events(self, changed: Set[str]) -> bool:
+        """Adds the files named in pending events, False if events were lost"""
+        try:
+            data = os.read(self._fd, _BUFFER_SIZE)
+        except BlockingIOError:
+            return True
+        complete = True
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & _IN_Q_OVERFLOW:
+                complete = False
+                continue
+            if mask & _IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            directory = self._dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, os.fsdecode(name))
+            if mask & _IN_ISDIR:
+                if not self.workspace.discover:
+                    continue
+                if mask & (_IN_CREATE | _IN_MOVED_TO) and not name.startswith(b"."):
+                    # files written before the watch was added are found by
+                    # scanning the new directory
+                    self._add_tree(path)
+                    changed.update(find_files([path]))
+                elif mask & (_IN_DELETE | _IN_MOVED_FROM):
+                    prefix = path + os.sep
+                    changed.update(p for p in self.workspace if p.startswith(prefix))
+            elif path.endswith(".json") and (
+                self.workspace.discover or self.workspace.follows(path)
+            ):
+                changed.add(path)
+        return complete
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            select.select([self._fd, self._wake_read], [], [])
+            if self._stop.is_set():
+                return
+            changed: Set[str] = set()
+            complete = self._read_events(changed)
+            # collect the rest of a burst of events before reloading
+            while select.select([self._fd], [], [], DEBOUNCE)[0]:
+                complete = self._read_events(changed) and complete
+            if complete:
+                self.workspace.refresh(changed)
+            else:
+                self.workspace.refresh()
+
+
+def start(workspace: Workspace, interval: float = INTERVAL) -> Watcher:
+    """Starts watching a workspace, with inotify when it is available"""
+    try:
+        watcher: Watcher = InotifyWatcher(workspace)
+    except (OSError, AttributeError):
+        watcher = PollingWatcher(workspace, interval)
+    return watcher.start()
@@ -7,12 +7,14 @@ from dash import html
 from src.app_state import Root
 from src.components.config_editor.config_editor import (
     alerts,
+    check_disk,
     desc_input,
     layout,
     name_input,
     needs_save,
     save,
     save_button,
+    sync_fields,
     validate_and_set_desc,
     validate_and_set_name,
 )
@@ -52,9 +54,19 @@ def test_needs_save_callback() -> None:
     if Root.next_config is None:
         assert False
     else:
-        assert needs_save("name", "desc")
+        assert needs_save()
         Root.next_config.name = "new"
-        assert not needs_save("name", "desc")
+        assert not needs_save()
+
+
+def test_sync_fields_callback() -> None:
+    init_valid_config()
+    if Root.next_config is None:
+        assert False
+    else:
+        assert sync_fields([None] * 4, "#name#", "")
+        assert not sync_fields([None] * 4, "name", "new desc")
+        assert Root.next_config.desc == "new desc"
 
 
 def test_save_callback() -> None:
@@ -98,3 +110,10 @@ def test_layout() -> None:
     CONFIG_FILENAME = "test/temp/config.json"
     MOCK_CONFIG.save(CONFIG_FILENAME)
     assert isinstance(layout(CONFIG_FILENAME), dbc.Form)
+
+
+def test_check_disk_callback() -> None:
+    Root.config_changed_on_disk = True
+    assert check_disk(1)
+    Root.config_changed_on_disk = False
+    assert not check_disk(2)
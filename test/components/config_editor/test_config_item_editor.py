@@ -1,7 +1,7 @@
 from test.mocking.config import MOCK_CONFIG_WITH_ITEMS
 
 from src.app_state import Root
-from src.components.config_editor.item_editor import layout, update
+from src.components.config_editor.item_editor import get_rows, layout, update
 
 
 def test_layout() -> None:
@@ -14,7 +14,28 @@ def test_layout() -> None:
 
 def test_update_callback():
     Root.next_config = None
-    assert not update(None, [])
+    assert not update([])
 
-    Root.next_config = MOCK_CONFIG_WITH_ITEMS
-    assert not update(None, [{"name": "name0", "value": "new_value"}])
+    Root.next_config = MOCK_CONFIG_WITH_ITEMS.copy()
+    row = Root.next_config.items[0].to_dict()
+    name = row["name"]
+    changes = [{"colId": "value", "data": dict(row, value="new_value")}]
+    assert not update(changes)
+    assert Root.next_config.get_item(name).value == "new_value"
+    assert MOCK_CONFIG_WITH_ITEMS.get_item(name).value != "new_value"
+
+
+def test_get_rows_callback():
+    Root.next_config = None
+    assert get_rows({}) == {"rowData": [], "rowCount": 0}
+
+    Root.next_config = MOCK_CONFIG_WITH_ITEMS.copy()
+    request = {
+        "startRow": 0,
+        "endRow": 1,
+        "sortModel": [{"colId": "name", "sort": "desc"}],
+    }
+    response = get_rows(request)
+    last = max(item.schema_item.name for item in Root.next_config.items)
+    assert response["rowCount"] == len(Root.next_config.items)
+    assert [row["name"] for row in response["rowData"]] == [last]
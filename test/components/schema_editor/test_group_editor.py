@@ -66,28 +66,27 @@ def test_add_group():
         },
         ["<new group name>"],
     )
+    transaction, names = add_group(True)
+    assert transaction["add"][0]["name"] == "<new group name 2>"
+    assert names == ["<new group name>", "<new group name 2>"]
 
 
 def test_update():
     Root.next_schema = None
-    assert update(True, []) == (
+    assert update([]) == (
         True,
         [],
     )
 
-    init_valid_schema()
-    new_rows = [
-        {"name": "Synthesis", "desc": "Synthesis Options", "order": 0},
-        {"name": "CTS", "desc": "CTS Options", "order": 1},
-        {"name": "DetailRoute", "desc": "Detail Route Options", "order": 2},
-        {"name": "Fruit", "desc": "Choose some fruit quantities", "order": 3},
+    init_valid_schema(mock=MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS)
+    row = {"name": "name1", "desc": "desc1", "order": 0}
+    changes = [
+        {"colId": "order", "oldValue": 0, "data": dict(row, order=3)},
+        {"colId": "name", "oldValue": "name1", "data": dict(row, name="CTS")},
     ]
-    assert update(True, new_rows) == (
+    assert update(changes) == (
         False,
-        [
-            "Synthesis",
-            "CTS",
-            "DetailRoute",
-            "Fruit",
-        ],
+        ["name0", "CTS", "name2"],
     )
+    assert Root.next_schema.get_group("CTS").order == 3
+    assert MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS.groups[1].name == "name1"
@@ -3,9 +3,11 @@ from test.mocking.schema import MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS
 from dash import html
 
 from src.app_state import Root
+from src.model.schema import SchemaItemType
 from src.components.schema_editor.item_editor import (
     add_item,
     deleted_selected,
+    get_rows,
     group_name_changed,
     layout,
     update,
@@ -42,33 +44,56 @@ def test_add_item():
     }
 
 
+def test_add_items_then_edit():
+    Root.next_schema = MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS.copy()
+    first = add_item(True)["add"][0]
+    second = add_item(True)["add"][0]
+    assert second["name"] == "<new item name 2>"
+
+    # the edits of the second row go to the second item
+    changes = [
+        {"colId": "desc", "data": dict(second, desc="second")},
+        {"colId": "name", "oldValue": second["name"], "data": dict(second, name="b")},
+    ]
+    assert not update(changes)
+    assert Root.next_schema.get_item("b").desc == "second"
+    assert Root.next_schema.get_item(first["name"]).desc == first["desc"]
+
+
 def test_update():
     Root.next_schema = MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS.copy()
-    new_rows = [
-        {
-            "name": "item_1",
-            "desc": "item_1",
-            "group": "syn",
-            "default": "",
-            "type": "String",
-        },
-        {
-            "name": "item_2",
-            "desc": "item_2",
-            "group": "syn",
-            "default": "",
-            "type": "String",
-        },
-        {
-            "name": "item_3",
-            "desc": "item_3",
-            "group": "syn",
-            "default": "",
-            "type": "String",
-        },
+    row = Root.next_schema.items[1].to_dict()
+    changes = [
+        {"colId": "desc", "oldValue": row["desc"], "data": dict(row, desc="changed")},
+        {"colId": "type", "oldValue": "String", "data": dict(row, type="Integer")},
+        {"colId": "name", "oldValue": "name1", "data": dict(row, name="renamed")},
+        {"colId": "desc", "data": {"name": "missing", "desc": "ignored"}},
     ]
-    assert not update(True, new_rows)
+    assert not update(changes)
+    item = Root.next_schema.get_item("renamed")
+    assert item.desc == "changed"
+    assert item.type == SchemaItemType.int
+    assert Root.next_schema.get_item("name1") is None
+    assert MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS.items[1].name == "name1"
+    assert not update(None)
 
 
 def test_group_name_changed():
     assert group_name_changed({"a": "b", "c": "d"}) == '{"a": "b", "c": "d"}'
+
+
+def test_get_rows_callback():
+    Root.next_schema = None
+    assert get_rows({}) == {"rowData": [], "rowCount": 0}
+
+    Root.next_schema = MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS.copy()
+    request = {
+        "startRow": 0,
+        "endRow": 10,
+        "filterModel": {
+            "name": {"filterType": "text", "type": "equals", "filter": "name0"}
+        },
+    }
+    response = get_rows(request)
+    assert response["rowCount"] == 1
+    assert response["rowData"] == [Root.next_schema.get_item("name0").to_dict()]
@@ -3,6 +3,7 @@ from test.mocking.schema import MOCK_SCHEMA
 from src.app_state import Root
 from src.components.schema_editor.schema_editor import (
     alerts,
+    check_disk,
     desc_input,
     disable_export_config_button,
     layout,
@@ -10,6 +11,7 @@ from src.components.schema_editor.schema_editor import (
     needs_save,
     save,
     save_button,
+    sync_fields,
     validate_and_set_desc,
     validate_and_set_name,
     validate_and_set_version,
@@ -71,6 +73,10 @@ def test_save_callback() -> None:
         assert False
     else:
         assert save(True) == (True, True, False, [])
+        # fields not synced yet are saved with the click
+        assert save(True, "saved_name", None, None) == (True, True, False, [])
+        assert Root.schema is not None and Root.schema.name == "saved_name"
+        assert save(True, MOCK_SCHEMA.name, None, None) == (True, True, False, [])
 
         Root.next_schema.version = "not a version"
         result = save(True)
@@ -86,9 +92,21 @@ def test_needs_save() -> None:
     if Root.next_schema is None:
         assert False
     else:
-        assert needs_save("_", "_", "_")
+        assert needs_save()
         Root.next_schema.name = "new_name___"
-        assert not needs_save("_", "_", "_")
+        assert not needs_save()
+
+
+def test_sync_fields_callback() -> None:
+    init_valid_schema()
+    if Root.next_schema is None:
+        assert False
+    else:
+        # invalid fields are not set
+        assert sync_fields([1, None] * 3, "#invalid#", "", "2.1")
+        assert not sync_fields([1, None] * 3, "new_name", "", "2.1")
+        assert Root.next_schema.name == "new_name"
+        assert Root.next_schema.version != "2.1"
 
 
 def test_alerts() -> None:
@@ -107,3 +125,10 @@ def test_disable_export_config_button_callback() -> None:
 def test_click_export_config_button_callback() -> None:
     # TODO: figure out how to test this
     pass
+
+
+def test_check_disk_callback() -> None:
+    Root.schema_changed_on_disk = True
+    assert check_disk(1)
+    Root.schema_changed_on_disk = False
+    assert not check_disk(2)
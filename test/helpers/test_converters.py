@@ -0,0 +1,34 @@
+import pytest
+
+from src.helpers.converters import to_native, type_converter
+
+
+def test_to_native():
+    assert to_native("value", str) == "value"
+    assert to_native("12", int) == 12
+    assert to_native(-3, int) == -3
+    assert to_native("0.5", float) == 0.5
+    assert to_native(2, float) == 2.0
+    assert to_native(1.5, float) == 1.5
+    assert to_native("true", bool) is True
+    assert to_native("0", bool) is False
+    assert to_native(False, bool) is False
+    for type in (str, int, float, bool):
+        assert to_native(None, type) is None
+
+
+def test_to_native_invalid():
+    with pytest.raises(ValueError):
+        to_native("1.5", int)
+    with pytest.raises(ValueError):
+        to_native("1", float)
+    with pytest.raises(ValueError):
+        to_native("yes", bool)
+    with pytest.raises(ValueError):
+        to_native(1, str)
+    with pytest.raises(ValueError):
+        to_native(True, int)
+
+
+def test_type_converter():
+    assert type_converter(int)("7") == 7
@@ -0,0 +1,79 @@
+import os
+import shutil
+
+import pytest
+
+import src.helpers.files as files
+
+DIR = "test/delete_me_files"
+
+
+@pytest.fixture
+def directory():
+    os.makedirs(DIR, exist_ok=True)
+    yield DIR
+    shutil.rmtree(DIR)
+
+
+def read(path: str) -> str:
+    with open(path) as f:
+        return f.read()
+
+
+def test_save_text(directory):
+    fn = os.path.join(directory, "file.json")
+    stats = files.save_text(fn, "first")
+    assert stats == (fn, 5, stats.elapsed, False)
+    assert read(fn) == "first"
+    assert os.listdir(directory) == ["file.json"]
+
+    # unchanged text is not written again
+    mtime = os.stat(fn).st_mtime_ns
+    stats = files.save_text(fn, "first")
+    assert stats.skipped and stats.bytes_written == 0
+    assert os.stat(fn).st_mtime_ns == mtime
+
+    assert not files.save_text(fn, "second").skipped
+    assert read(fn) == "second"
+
+
+def test_save_text_changed_on_disk(directory):
+    fn = os.path.join(directory, "file.json")
+    files.save_text(fn, "text")
+    with open(fn, "w") as f:
+        f.write("edited elsewhere")
+    assert not files.save_text(fn, "text").skipped
+    assert read(fn) == "text"
+
+    os.remove(fn)
+    assert not files.save_text(fn, "text").skipped
+    assert read(fn) == "text"
+
+
+def test_write_atomic(directory, monkeypatch):
+    fn = os.path.join(directory, "file.json")
+    files.save_text(fn, "old")
+    os.chmod(fn, 0o640)
+    files.save_text(fn, "new")
+    assert os.stat(fn).st_mode & 0o777 == 0o640
+
+    def crash(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", crash)
+    with pytest.raises(OSError):
+        files.save_text(fn, "lost")
+    assert read(fn) == "new"
+    assert os.listdir(directory) == ["file.json"]
+
+
+def test_write_atomic_new_file_mode(directory):
+    fn = os.path.join(directory, "new.json")
+    umask = os.umask(0o027)
+    try:
+        files.save_text(fn, "text")
+        # the umask applies, and is left as it was
+        assert os.umask(0o027) == 0o027
+    finally:
+        os.umask(umask)
+    assert os.stat(fn).st_mode & 0o777 == 0o640
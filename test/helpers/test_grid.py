@@ -0,0 +1,138 @@
+import sys
+import threading
+from operator import attrgetter
+from typing import Any, NamedTuple
+
+from src.helpers.grid import (
+    INFINITE_ROWS,
+    CellChange,
+    RowSource,
+    changed_cells,
+    grid_props,
+)
+
+
+def test_changed_cells():
+    changes = [
+        {"colId": "value", "oldValue": "1", "data": {"name": "a", "value": "2"}},
+        {"colId": "name", "oldValue": "b", "data": {"name": "c", "value": "3"}},
+        {"colId": "missing", "data": {"name": "d"}},
+        {"data": {"name": "e"}},
+    ]
+    assert list(changed_cells(changes)) == [
+        CellChange("a", "value", "2"),
+        CellChange("b", "name", "c"),
+    ]
+    assert list(changed_cells(None)) == []
+
+
+class Record(NamedTuple):
+    name: str
+    size: Any
+
+
+ROWS = RowSource(
+    {"name": attrgetter("name"), "size": attrgetter("size")}, Record._asdict
+)
+RECORDS = [Record("b", 2), Record("A", "x"), Record("c", None), Record("a2", 10)]
+
+
+def names(response):
+    return [row["name"] for row in response["rowData"]]
+
+
+def test_row_source_paging():
+    response = ROWS.get_rows(RECORDS, 1, {"startRow": 1, "endRow": 3})
+    assert names(response) == ["A", "c"]
+    assert response["rowCount"] == 4
+    assert ROWS.get_rows(RECORDS, 1, None)["rowCount"] == 4
+
+
+def test_row_source_sort():
+    request = {"sortModel": [{"colId": "name", "sort": "asc"}]}
+    assert names(ROWS.get_rows(RECORDS, 1, request)) == ["A", "a2", "b", "c"]
+    request = {"sortModel": [{"colId": "size", "sort": "desc"}]}
+    # numbers first, then text, then blanks
+    assert names(ROWS.get_rows(RECORDS, 1, request)) == ["c", "A", "a2", "b"]
+
+
+def test_row_source_filter():
+    def filtered(condition):
+        request = {"filterModel": {"name": condition}}
+        return names(ROWS.get_rows(RECORDS, 1, request))
+
+    assert filtered({"filterType": "text", "type": "startsWith", "filter": "a"}) == [
+        "A",
+        "a2",
+    ]
+    assert filtered({"filterType": "text", "type": "equals", "filter": "B"}) == ["b"]
+    assert filtered({"filterType": "text", "type": "contains", "filter": "2"}) == ["a2"]
+    assert filtered(
+        {
+            "filterType": "text",
+            "operator": "OR",
+            "conditions": [
+                {"type": "equals", "filter": "b"},
+                {"type": "equals", "filter": "c"},
+            ],
+        }
+    ) == ["b", "c"]
+
+    request = {
+        "filterModel": {
+            "size": {"filterType": "number", "type": "greaterThan", "filter": 5}
+        }
+    }
+    assert names(ROWS.get_rows(RECORDS, 1, request)) == ["a2"]
+
+
+def test_row_source_version():
+    records = list(RECORDS)
+    request = {"sortModel": [{"colId": "name", "sort": "asc"}]}
+    assert names(ROWS.get_rows(records, 1, request))[0] == "A"
+    records.append(Record("0", 1))
+    assert names(ROWS.get_rows(records, 2, request))[0] == "0"
+
+
+def test_row_source_threads():
+    # requests for another version of the records never see this one's order
+    short = [Record(f"s{i}", i) for i in range(10)]
+    long = [Record(f"l{i}", i) for i in range(1000)]
+    request = {"startRow": 990, "endRow": 1000, "filterModel": {}}
+    errors = []
+
+    def ask(records, version) -> None:
+        for _ in range(50):
+            try:
+                response = ROWS.get_rows(records, version, request)
+                assert response["rowCount"] == len(records)
+                assert all(name[0] == records[0].name[0] for name in names(response))
+            except Exception as e:  # reported below
+                errors.append(e)
+
+    threads = [
+        threading.Thread(target=ask, args=args)
+        for args in [(short, "short"), (long, "long")] * 4
+    ]
+    # switch threads often, to interleave the requests
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert errors == []
+
+
+def test_grid_props():
+    props = grid_props(2, lambda: [{}, {}], {"domLayout": "autoHeight"})
+    assert props["rowData"] == [{}, {}]
+    assert props["dashGridOptions"] == {"domLayout": "autoHeight"}
+
+    props = grid_props(INFINITE_ROWS + 1, lambda: [], {"domLayout": "autoHeight"})
+    assert props["rowModelType"] == "infinite"
+    assert "rowData" not in props
+    assert "domLayout" not in props["dashGridOptions"]
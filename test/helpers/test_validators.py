@@ -1,8 +1,18 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+
 from src.helpers.validators import (
+    ALPHA_NUM,
+    NOT_BLANK,
+    VERSION_NUMBER,
     validate_alpha_num,
     validate_not_blank,
     validate_version_number,
     validate_type,
+    type_validator,
 )
 
 
@@ -28,6 +38,30 @@ def test_validate_version_number():
     assert not validate_version_number("20240325")
 
 
+RULE_TEXTS = ["", " ", "\t\n", "a", " a ", "a b", "a_1", "#", "1.2.3", "1.2.3\n", "1.2"]
+
+
+def test_rule() -> None:
+    assert not ALPHA_NUM(None)
+    assert not VERSION_NUMBER("1.2.3\n")
+    assert NOT_BLANK("\n a")
+    assert '"[0-9]+\\\\.[0-9]+\\\\.[0-9]+"' in VERSION_NUMBER.clientside()
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs node")
+def test_rule_clientside() -> None:
+    # the browser marks invalid exactly the texts the rules reject
+    for rule in (ALPHA_NUM, NOT_BLANK, VERSION_NUMBER):
+        script = (
+            f"const invalid = {rule.clientside()};"
+            f"console.log(JSON.stringify({json.dumps(RULE_TEXTS)}.map(invalid)));"
+        )
+        output = subprocess.run(
+            ["node", "-e", script], capture_output=True, text=True, check=True
+        ).stdout
+        assert json.loads(output) == [not rule(text) for text in RULE_TEXTS]
+
+
 def test_validate_type():
     assert validate_type("", str)
     assert validate_type("I am a string", str)
@@ -48,3 +82,26 @@ def test_validate_type():
     assert validate_type("1", int)
     assert not validate_type("1.0", int)
     assert not validate_type("xxx", int)
+
+
+def test_validate_type_edge_cases():
+    assert validate_type("-1", int)
+    assert validate_type(" 12 ", int)
+    assert validate_type("1_000", int)
+    assert validate_type(1, int)
+    assert validate_type("1.", float)
+    assert validate_type(".5", float)
+    assert validate_type("1e5", float)
+    assert validate_type("nan", float)
+    assert not validate_type("-inf", str)
+    assert not validate_type("1e5", str)
+    assert validate_type("1.0.0", str)
+    assert validate_type("information", str)
+    assert not validate_type(True, bool)
+
+
+def test_type_validator():
+    for type in (str, int, float, bool):
+        validator = type_validator(type)
+        for value in ["", "x", "0", "-1", "1.5", "1e3", "true", " 7 ", "inf"]:
+            assert validator(value) == validate_type(value, type)
@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+import src.model.bundle as bundle
+import src.runtime.bundle as bundle_reader
+import src.runtime.shared as shared
+from src.model.config import Config
+from src.model.schema import Schema, SchemaItem, SchemaItemType
+from src.runtime.shared import Publisher
+
+
+def create_config() -> Config:
+    schema = Schema("schema", "desc", "1.2.3")
+    schema.items = [
+        SchemaItem("text", "desc", "group", "value", SchemaItemType.str),
+        SchemaItem("count", "desc", "group", "3", SchemaItemType.int),
+        SchemaItem("ratio", "desc", "group", "0.5", SchemaItemType.float),
+        SchemaItem("enabled", "desc", "group", "true", SchemaItemType.bool),
+    ]
+    config = Config("config", "desc", "missing_schema.json", schema=schema)
+    config.generate_items()
+    return config
+
+
+def test_to_dict():
+    data = bundle.to_dict(create_config())
+    assert data["format"] == bundle_reader.FORMAT
+    assert data["schema"] == "schema"
+    assert data["schemaVersion"] == "1.2.3"
+    assert data["values"] == {
+        "text": "value",
+        "count": 3,
+        "ratio": 0.5,
+        "enabled": True,
+    }
+    assert data["types"]["count"] == "Integer"
+
+
+def test_to_dict_values():
+    values = {"text": "other", "count": "4", "ratio": "1.5", "enabled": "0"}
+    data = bundle.to_dict(create_config(), values)
+    assert data["values"] == {
+        "text": "other",
+        "count": 4,
+        "ratio": 1.5,
+        "enabled": False,
+    }
+
+
+def test_to_dict_invalid():
+    config = create_config()
+    config.set_value("count", "many")
+    with pytest.raises(ValueError, match="count"):
+        bundle.to_dict(config)
+
+    config.schema = None
+    with pytest.raises(FileNotFoundError):
+        bundle.to_dict(config)
+
+
+def test_save():
+    fn = "test/delete_me_bundle.json"
+    bundle.save(create_config(), fn)
+    loaded = bundle_reader.load(fn)
+    os.remove(fn)
+    assert loaded["count"] == 3
+    assert loaded.name == "config"
+
+
+def test_publish():
+    name = f"configtree_test_bundle_{os.getpid()}"
+    with Publisher(name) as publisher:
+        assert bundle.publish(publisher, create_config()) == 1
+        with shared.attach(name) as loaded:
+            assert loaded["count"] == 3
+            assert loaded.bundle_name == "config"
@@ -0,0 +1,56 @@
+import os
+import shutil
+
+import src.model.cache as schema_cache
+import src.model.schema as schema_factory
+from src.model.cache import SchemaCache
+from src.model.config import Config
+
+
+class TestSchemaCache:
+    def test_load(self) -> None:
+        cache = SchemaCache()
+        first = cache.load("test/input_schema.json")
+        second = cache.load("./test/input_schema.json")
+        assert first == schema_factory.load("test/input_schema.json")
+        assert second == first
+        assert second.items[0] is first.items[0]
+        assert cache.info() == (1, 1, schema_cache.MAXSIZE, 1)
+
+    def test_snapshots(self) -> None:
+        cache = SchemaCache()
+        first = cache.load("test/input_schema.json")
+        first.update_item(first.items[0], desc="changed")
+        assert cache.load("test/input_schema.json").items[0].desc != "changed"
+
+    def test_file_changed(self) -> None:
+        fn = "test/delete_me_cache.json"
+        shutil.copy("test/input_schema.json", fn)
+        cache = SchemaCache()
+        schema = cache.load(fn)
+        schema.desc = "a longer description"
+        schema.save(fn)
+        reloaded = cache.load(fn)
+        os.remove(fn)
+        assert reloaded.desc == "a longer description"
+        assert cache.info().misses == 2
+
+    def test_eviction(self) -> None:
+        cache = SchemaCache(maxsize=1)
+        cache.load("test/input_schema.json")
+        cache.load("test/schema.json")
+        cache.load("test/input_schema.json")
+        assert cache.info() == (0, 3, 1, 1)
+
+    def test_clear(self) -> None:
+        cache = SchemaCache()
+        cache.load("test/input_schema.json")
+        cache.clear()
+        assert cache.info() == (0, 0, schema_cache.MAXSIZE, 0)
+
+
+def test_config_uses_cache() -> None:
+    hits = schema_cache.info().hits
+    Config("name", "desc", "test/input_schema.json")
+    Config("name", "desc", "test/input_schema.json")
+    assert schema_cache.info().hits > hits
@@ -0,0 +1,60 @@
+import json
+from test.mocking.config import MOCK_CONFIG_WITH_ITEMS
+from test.mocking.schema import MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS
+
+import src.model.codec as codec
+from src.model.config import Config
+from src.model.schema import Schema, SchemaGroup, SchemaItem, SchemaItemType
+
+
+def test_encode():
+    schema = MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS
+    assert codec.encode(schema) == schema.to_dict()
+    assert codec.encode(MOCK_CONFIG_WITH_ITEMS) == MOCK_CONFIG_WITH_ITEMS.to_dict()
+
+
+def test_dumps():
+    schema = MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS.copy()
+    for default in [None, True, 0, 1.5, float("nan"), 'é\n"', [1, {"a": []}], {}]:
+        schema.items.append(
+            SchemaItem("item", "desc", "name0", default, SchemaItemType.int)
+        )
+    assert codec.dumps(schema) == json.dumps(schema.to_dict(), indent=4)
+
+    config = MOCK_CONFIG_WITH_ITEMS
+    assert codec.dumps(config) == json.dumps(config.to_dict(), indent=4)
+
+    with open("test/schema.json") as f:
+        text = f.read().rstrip("\n")
+    assert codec.dumps(codec.decode(Schema, json.loads(text))) == text
+
+
+def test_decode():
+    data = MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS.to_dict()
+    assert codec.decode(Schema, data) == Schema.from_dict(data)
+
+    data = MOCK_CONFIG_WITH_ITEMS.to_dict()
+    assert codec.decode(Config, data) == Config.from_dict(data)
+
+
+def test_decode_fallback():
+    # values needing coercion go through JSONWizard
+    group = codec.decode(SchemaGroup, {"name": "name", "desc": "desc", "order": "3"})
+    assert group.order == 3
+
+    # snake case keys are accepted
+    config = codec.decode(Config, {"name": "n", "desc": "d", "schema_path": "p"})
+    assert config.schema_path == "p"
+
+    try:
+        codec.decode(
+            SchemaItem,
+            {"name": "a", "desc": "d", "group": "g", "default": 1, "type": "Nope"},
+        )
+        assert False
+    except ValueError as error:
+        assert "'Nope' is not a valid SchemaItemType" in str(error)
+
+
+def test_codec_for():
+    assert codec.codec_for(SchemaItem) is codec.codec_for(SchemaItem)
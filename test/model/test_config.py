@@ -1,6 +1,12 @@
+import json
+import os
+
+import pytest
+
+import src.model.config as config_factory
 import src.model.schema as schema_factory
-from src.model.config import Config, ConfigItem
-from src.model.schema import Schema
+from src.model.config import Config, ConfigItem, SchemaMismatchError
+from src.model.schema import Schema, SchemaItem, SchemaItemType
 
 
 class TestConfig:
@@ -28,6 +34,62 @@ class TestConfig:
         config.generate_items()
         config.save("test/config.json")
 
+    def test_get_item(self) -> None:
+        config = self.create_config()
+        config.generate_items()
+        assert config.get_item("name1") is config.items[1]
+        assert config.get_item("missing") is None
+        assert config.get_group_items("name2") == [config.items[2]]
+
+    def test_set_value(self) -> None:
+        config = self.create_config()
+        config.generate_items()
+        assert config.set_value("name1", "value")
+        assert config.items[1].value == "value"
+        assert not config.set_value("name1", "value")
+        assert not config.set_value("missing", "value")
+
+    def test_copy(self) -> None:
+        config = self.create_config()
+        config.generate_items()
+        snapshot = config.copy()
+        assert snapshot == config
+        assert snapshot.items[0] is config.items[0]
+
+        assert snapshot.set_value("name0", "changed")
+        assert config.items[0].value == ""
+        assert snapshot.items[0].value == "changed"
+        assert snapshot != config
+
+    def test_to_delta_dict(self) -> None:
+        config = self.create_config()
+        config.generate_items()
+        delta = config.to_delta_dict()
+        assert delta["format"] == "delta"
+        assert delta["schemaPath"] == "test/input_schema.json"
+        assert delta["schemaHash"] == config.schema.content_hash()  # type: ignore
+        assert delta["values"] == {}
+
+        config.items[1].value = "changed"
+        assert config.to_delta_dict()["values"] == {"name1": "changed"}
+
+    def test_save_delta(self) -> None:
+        fn = "test/delete_me_delta.json"
+        config = self.create_config()
+        config.generate_items()
+        config.items[0].value = "changed"
+        assert config.save_delta(fn)
+        assert not config.last_save.skipped
+        assert config.save_delta(fn)
+        assert config.last_save.skipped
+        loaded = config_factory.load(fn)
+        os.remove(fn)
+        assert loaded == config
+
+        config.name = ""
+        assert not config.save_delta(fn)
+        assert not os.path.exists(fn)
+
     def test_validate_desc(self) -> None:
         config: Config = self.create_config()
         config.desc = ""
@@ -48,3 +110,102 @@ class TestConfigItem:
         config_item = ConfigItem(schema_item, "value")
         assert config_item.schema_item == schema_item
         assert config_item.value == "value"
+
+
+def test_from_delta_dict() -> None:
+    config = Config("name", "desc", "test/input_schema.json")
+    delta = config.to_delta_dict()
+    delta["values"] = {"name2": "value"}
+    loaded = config_factory.from_json(json.dumps(delta), strict=True)
+    assert [item.value for item in loaded.items] == ["", "", "value"]
+
+    delta["schemaHash"] = "stale"
+    assert config_factory.from_delta_dict(delta).items[2].value == "value"
+    try:
+        config_factory.from_delta_dict(delta, strict=True)
+        assert False
+    except SchemaMismatchError:
+        pass
+
+    delta["values"] = {"missing": "value"}
+    try:
+        config_factory.from_delta_dict(delta)
+        assert False
+    except SchemaMismatchError as error:
+        assert "missing" in error.message
+
+    delta["schemaPath"] = "missing.json"
+    try:
+        config_factory.from_delta_dict(delta)
+        assert False
+    except FileNotFoundError:
+        pass
+
+
+def create_typed_config() -> Config:
+    schema = Schema("schema", "desc", "1.0.0")
+    schema.items = [
+        SchemaItem("text", "desc", "group", "value", SchemaItemType.str),
+        SchemaItem("count", "desc", "group", "3", SchemaItemType.int),
+        SchemaItem("ratio", "desc", "group", "0.5", SchemaItemType.float),
+        SchemaItem("enabled", "desc", "group", "true", SchemaItemType.bool),
+    ]
+    config = Config("config", "desc", "missing_schema.json", schema=schema)
+    config.generate_items()
+    return config
+
+
+def test_typed_access():
+    config = create_typed_config()
+    assert config["count"] == 3
+    assert config.get_str("text") == "value"
+    assert config.get_int("count") == 3
+    assert config.get_float("ratio") == 0.5
+    assert config.get_bool("enabled") is True
+    assert "count" in config
+    assert "missing" not in config
+    with pytest.raises(KeyError):
+        config["missing"]
+    with pytest.raises(TypeError):
+        config.get_int("ratio")
+
+    config.set_value("count", "4")
+    assert config.get_int("count") == 4
+    config["enabled"] = "0"
+    assert config["enabled"] is False
+    with pytest.raises(KeyError):
+        config["missing"] = 1
+
+    config.set_value("count", "many")
+    with pytest.raises(ValueError):
+        config["count"]
+
+
+def test_typed_access_cache():
+    config = create_typed_config()
+    assert config["count"] == 3
+    snapshot = config.copy()
+    snapshot["count"] = "5"
+    assert snapshot["count"] == 5
+    assert config["count"] == 3
+
+    config.generate_items()
+    config.items[1].value = "6"
+    assert config["count"] == 6
+
+
+def test_tree_hash():
+    config = create_typed_config()
+    config.build_hashes()
+    snapshot = config.copy()
+    assert snapshot.tree_hash() == config.tree_hash()
+
+    snapshot["count"] = "5"
+    assert snapshot.tree_hash() != config.tree_hash()
+    assert snapshot.changed_items(config) == [1]
+    snapshot["count"] = config.items[1].value
+    assert snapshot.tree_hash() == config.tree_hash()
+    assert snapshot.changed_items(config) == []
+
+    snapshot.desc = "changed"
+    assert snapshot.tree_hash() != config.tree_hash()
@@ -0,0 +1,94 @@
+from src.model.merkle import FANOUT, HashTree, digest_of
+from src.model.records import RecordList
+
+N = FANOUT * FANOUT + 10
+
+
+def key(record: list) -> bytes:
+    return digest_of(*record)
+
+
+def make_records(n: int = N) -> RecordList:
+    return RecordList([[i, f"value {i}"] for i in range(n)])
+
+
+def fresh_root(records: RecordList) -> bytes:
+    return HashTree(key).root(RecordList(list(records)))
+
+
+class TestHashTree:
+    def test_root(self):
+        records = make_records()
+        tree = HashTree(key)
+        root = tree.root(records)
+        assert root == fresh_root(make_records())
+        assert root != fresh_root(make_records(N - 1))
+        assert HashTree(key).root(RecordList()) == fresh_root(RecordList())
+
+        records.sort(reverse=True)
+        assert tree.root(records) != root
+        records.sort()
+        assert tree.root(records) == root
+
+    def test_replace(self):
+        records = make_records()
+        tree = HashTree(key)
+        root = tree.root(records)
+
+        old = records[FANOUT + 1]
+        in_sync = tree.in_sync(records)
+        new = [old[0], "changed"]
+        records.replace(old, new)
+        tree.replace(records, old, new, in_sync)
+        assert tree.in_sync(records)
+        assert tree.root(records) == fresh_root(records)
+        assert tree.root(records) != root
+
+        # an edit in place, while the tree is out of date
+        records.append([N, "last"])
+        record = records[0]
+        in_sync = tree.in_sync(records)
+        record[1] = "edited"
+        tree.replace(records, record, record, in_sync)
+        assert tree.root(records) == fresh_root(records)
+
+    def test_append(self):
+        records = make_records(FANOUT - 1)
+        tree = HashTree(key)
+        tree.sync(records)
+        for i in range(FANOUT - 1, N):
+            in_sync = tree.in_sync(records)
+            records.append([i, f"value {i}"])
+            tree.append(records, records[-1], in_sync)
+        assert tree.in_sync(records)
+        assert tree.root(records) == fresh_root(make_records())
+
+    def test_copy(self):
+        records = make_records()
+        tree = HashTree(key)
+        root = tree.root(records)
+        snapshot_records = records.copy()
+        snapshot = tree.copy(snapshot_records)
+        assert snapshot.in_sync(snapshot_records)
+
+        old = snapshot_records[5]
+        in_sync = snapshot.in_sync(snapshot_records)
+        new = [5, "changed"]
+        snapshot_records.replace(old, new)
+        snapshot.replace(snapshot_records, old, new, in_sync)
+        assert tree.root(records) == root
+        assert snapshot.root(snapshot_records) == fresh_root(snapshot_records)
+
+    def test_diff(self):
+        records = make_records()
+        tree = HashTree(key)
+        other_records = make_records()
+        other = HashTree(key)
+        assert tree.diff(records, other, other_records) == []
+
+        for position in (3, FANOUT * 7 + 2, N - 1):
+            other_records[position] = [position, "changed"]
+        assert tree.diff(records, other, other_records) == [3, FANOUT * 7 + 2, N - 1]
+
+        other_records.pop()
+        assert tree.diff(records, other, other_records) == [3, FANOUT * 7 + 2, N - 1]
@@ -0,0 +1,114 @@
+import json
+
+import pytest
+
+import src.model.patch as patch_factory
+from src.model.config import Config
+from src.model.patch import ADDED, MODIFIED, REMOVED, RENAMED, PatchError
+from src.model.schema import SchemaGroup, SchemaItem, SchemaItemType
+from test.mocking.schema import MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS
+
+
+def edited_schema():
+    schema = MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS.copy()
+    new = schema.copy()
+    new.version = "2.0.0"
+    new.update_item(new.items[0], desc="changed", type=SchemaItemType.int)
+    new.update_item(new.items[1], name="renamed")
+    new.remove_items([new.items[2].name])
+    new.add_item(SchemaItem("added", "desc", "name0", "1", SchemaItemType.int))
+    new.update_group(new.groups[1], order=7)
+    new.add_group(SchemaGroup("extra", "desc"))
+    return schema, new
+
+
+def test_diff_schema():
+    old, new = edited_schema()
+    patch = patch_factory.diff(old, new)
+    assert patch.fields == {"version": (old.version, "2.0.0")}
+    actions = {(change.action, change.name) for change in patch.items}
+    assert actions == {
+        (MODIFIED, old.items[0].name),
+        (RENAMED, "renamed"),
+        (REMOVED, old.items[2].name),
+        (ADDED, "added"),
+    }
+    modified = next(change for change in patch.items if change.action == MODIFIED)
+    assert modified.fields == {
+        "desc": (old.items[0].desc, "changed"),
+        "type": (old.items[0].type.value, "Integer"),
+    }
+    renamed = next(change for change in patch.items if change.action == RENAMED)
+    assert renamed.old_name == old.items[1].name
+    assert [(change.action, change.name) for change in patch.groups] == [
+        (MODIFIED, old.groups[1].name),
+        (ADDED, "extra"),
+    ]
+    assert len(patch.summary()) == 7
+
+    assert not patch_factory.diff(old, old.copy())
+    with pytest.raises(TypeError):
+        patch_factory.diff(old, Config("config", "desc", "missing.json"))
+
+
+def test_diff_hashed():
+    old, new = edited_schema()
+    expected = patch_factory.diff(old, new).to_dict()
+    old.build_hashes()
+    new.build_hashes()
+    assert old.is_hashed() and new.is_hashed()
+    assert patch_factory.diff(old, new).to_dict() == expected
+    assert not patch_factory.diff(new, new.copy())
+
+
+def test_apply_schema():
+    old, new = edited_schema()
+    data = json.loads(json.dumps(patch_factory.diff(old, new).to_dict()))
+    patch = patch_factory.from_dict(data)
+
+    patched = patch_factory.apply(old, patch, strict=True)
+    assert not patch_factory.diff(patched, new)
+    assert patched.tree_hash() == new.tree_hash()
+    # the original is not changed
+    assert not patch_factory.diff(old, MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS)
+
+    with pytest.raises(PatchError):
+        patch_factory.apply(patched, patch)
+    with pytest.raises(PatchError):
+        patch_factory.from_dict({"format": "other"})
+
+
+def test_apply_strict():
+    old, new = edited_schema()
+    patch = patch_factory.diff(old, new)
+    other = old.copy()
+    other.update_item(other.items[0], desc="edited elsewhere")
+
+    with pytest.raises(PatchError):
+        patch_factory.apply(other, patch, strict=True)
+    patched = patch_factory.apply(other, patch)
+    assert patched.items[0].desc == "changed"
+
+
+def test_config():
+    schema = MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS.copy()
+    old = Config("config", "desc", "missing.json", schema=schema)
+    old.generate_items()
+    new = old.copy()
+    new.set_value(old.items[0].schema_item.name, "changed")
+    new.update_item(new.items[1], name="renamed")
+    new.remove_items([old.items[2].schema_item.name])
+
+    patch = patch_factory.diff(old, new)
+    assert [change.action for change in patch.items] == [MODIFIED, RENAMED, REMOVED]
+    assert patch.items[0].fields == {"value": (old.items[0].value, "changed")}
+
+    patch = patch_factory.from_dict(json.loads(json.dumps(patch.to_dict())))
+    patched = patch_factory.apply(old, patch, strict=True)
+    assert patched.tree_hash() == new.tree_hash()
+    assert patched["renamed"] == old.items[1].value
+    assert old.items[1].schema_item is schema.items[1]
+    assert old.get_item("renamed") is None
+
+    with pytest.raises(PatchError):
+        patch_factory.apply(schema, patch)
@@ -0,0 +1,159 @@
+import copy
+import pickle
+from operator import itemgetter
+
+from src.model.records import RecordIndex, RecordList
+
+
+class TestRecordList:
+    def test_revision(self):
+        records = RecordList([1, 2, 3])
+        assert records == [1, 2, 3]
+        assert records.revision == 0
+
+        records.append(4)
+        records.extend([5])
+        records.insert(0, 0)
+        records.remove(5)
+        records.pop()
+        records.sort(reverse=True)
+        records.reverse()
+        records[0] = 0
+        del records[0]
+        records += [4]
+        records.clear()
+        assert records.revision == 11
+
+    def test_copy(self):
+        records = RecordList([1, 2, 3])
+        records.append(4)
+        assert copy.deepcopy(records) == records
+        assert isinstance(pickle.loads(pickle.dumps(records)), RecordList)
+
+    def test_copy_on_write(self):
+        original = RecordList([{"a": 1}, {"b": 2}])
+        snapshot = original.copy()
+        assert snapshot == original
+        assert snapshot._data is original._data
+        assert not snapshot.owns(original[0])
+
+        snapshot.append({"c": 3})
+        assert len(snapshot) == 3
+        assert len(original) == 2
+        assert snapshot.owns(snapshot[2])
+        assert snapshot[0] is original[0]
+
+        clone = dict(snapshot[0])
+        snapshot.replace(snapshot[0], clone)
+        assert snapshot[0] is clone
+        assert original[0] == {"a": 1}
+
+        # keeping some of the records does not make the shared ones owned
+        snapshot[:] = [record for record in snapshot if "a" not in record]
+        assert not snapshot.owns(original[1])
+        assert snapshot.owns(snapshot[1])
+
+    def test_footprint(self):
+        original = RecordList(["a", "b"])
+        assert original.footprint(lambda record: 100) == 216
+        snapshot = original.copy()
+        assert snapshot.footprint(lambda record: 100) == 0
+        snapshot.append("c")
+        assert snapshot.footprint(lambda record: 100) == 124
+
+    def test_list_interface(self):
+        records = RecordList([1, 2, 3])
+        assert list(reversed(records)) == [3, 2, 1]
+        assert 2 in records
+        assert records[1:] == [2, 3]
+        assert records.index(3) == 2
+        assert records.count(1) == 1
+        assert repr(records) == "[1, 2, 3]"
+        records[1:2] = [5, 6]
+        assert records == RecordList([1, 5, 6, 3])
+
+
+class TestRecordIndex:
+    def create(self):
+        records = RecordList(
+            [
+                {"name": "a", "group": "x"},
+                {"name": "b", "group": "y"},
+                {"name": "c", "group": "x"},
+            ]
+        )
+        return records, RecordIndex(itemgetter("name"), itemgetter("group"))
+
+    def test_get(self):
+        records, index = self.create()
+        assert index.get(records, "b") is records[1]
+        assert index.get(records, "missing") is None
+
+        records.append({"name": "d", "group": "y"})
+        assert index.get(records, "d") is records[3]
+
+    def test_in_group(self):
+        records, index = self.create()
+        assert index.in_group(records, "x") == [records[0], records[2]]
+        assert index.in_group(records, "missing") == []
+
+    def test_append(self):
+        records, index = self.create()
+        index.get(records, "a")
+        index.append(records, {"name": "d", "group": "x"})
+        assert index._in_sync(records)
+        assert index.get(records, "d") is records[3]
+        assert len(index.in_group(records, "x")) == 3
+
+    def test_remove(self):
+        records, index = self.create()
+        index.remove(records, ["a", "c"])
+        assert records == [{"name": "b", "group": "y"}]
+        assert index.get(records, "a") is None
+        assert index.in_group(records, "x") == []
+
+    def test_rekey(self):
+        records, index = self.create()
+        record = index.get(records, "a")
+        assert record is not None
+        record["name"] = "z"
+        record["group"] = "y"
+        index.rekey(records, record, "a", "x")
+        assert index.get(records, "a") is None
+        assert index.get(records, "z") is record
+        assert index.in_group(records, "y") == [records[1], record]
+
+    def test_stale_rename(self):
+        records, index = self.create()
+        records[0]["name"] = "b"
+        assert index.get(records, "a") is None
+        assert index.get(records, "b") is records[0]
+
+    def test_edit(self):
+        records, index = self.create()
+        record = index.get(records, "a")
+        assert index.edit(records, record) is record
+
+        snapshot = records.copy()
+        snapshot_index = index.copy(snapshot)
+        clone = snapshot_index.edit(snapshot, record)
+        assert clone is not record
+        assert clone == record
+        assert snapshot[0] is clone
+        assert snapshot_index.get(snapshot, "a") is clone
+        assert snapshot_index.in_group(snapshot, "x") == [clone, records[2]]
+        assert index.get(records, "a") is record
+
+        clone["name"] = "z"
+        snapshot_index.rekey(snapshot, clone, "a", None)
+        assert snapshot_index.get(snapshot, "z") is clone
+        assert snapshot_index.get(snapshot, "a") is None
+        assert index.get(records, "a") is record
+        assert index.get(records, "z") is None
+
+    def test_plain_list(self):
+        records = [{"name": "a"}]
+        index = RecordIndex(itemgetter("name"))
+        assert index.get(records, "a") is records[0]
+        records.append({"name": "b"})
+        assert index.get(records, "b") is records[1]
@@ -47,6 +47,14 @@ class TestSchemaItem:
         assert schema_item.options == ""
         assert schema_item.errors == []
 
+    def test_compact(self):
+        schema_item = self.create_schema_item()
+        assert not hasattr(schema_item, "__dict__")
+        other = SchemaItem(
+            "other", "desc", "".join(["gro", "up"]), "", SchemaItemType.str
+        )
+        assert other.group is schema_item.group
+
     def test_validate_field_type(self):
         schema_item = self.create_schema_item()
 
@@ -78,6 +86,35 @@ class TestSchemaItem:
         schema_item.__validate_field_type__("default", "not a float")
         assert len(schema_item.errors) == 1
 
+    def test_validate_across_snapshots(self):
+        # an editor validates and copies the edited snapshot after each edit
+        schema = Schema(
+            "name",
+            "desc",
+            "1.0.0",
+            [SchemaGroup("g1", "desc", 0), SchemaGroup("g2", "desc", 1)],
+            [
+                SchemaItem("a", "desc", "g1", "", SchemaItemType.str),
+                SchemaItem("c", "desc", "g3", "", SchemaItemType.str),
+            ],
+        )
+        schema.build_hashes()
+        snapshot = schema.copy()
+        snapshot.validate()
+        assert len(snapshot.get_errors()) == 1
+        snapshot = snapshot.copy()
+        snapshot.update_group(snapshot.get_group("g1"), name="g3")
+        snapshot.validate()
+        assert [error.row for error in snapshot.get_errors()] == ["a"]
+        snapshot = snapshot.copy()
+        # revalidates the items with group errors, the ones of this snapshot
+        snapshot.remove_groups(["g2"])
+        snapshot.validate()
+        assert [error.row for error in snapshot.get_errors()] == ["a"]
+        assert "['g3']" in snapshot.get_errors()[0].message
+        # the first snapshot keeps its own records
+        assert schema.get_errors() == []
+
     def test_validate_name(self):
         schema_item = self.create_schema_item()
         schema_item.validate_name()
@@ -177,6 +214,54 @@ class TestSchema:
         assert schema is not schema_copy
         assert schema == schema_copy
 
+    def test_copy_on_write(self):
+        schema = self.create_schema()
+        snapshot = schema.copy()
+        assert snapshot.items[0] is schema.items[0]
+
+        item = snapshot.update_item(snapshot.items[0], desc="changed")
+        assert item is not schema.items[0]
+        assert schema.items[0].desc == "desc0"
+        assert snapshot.get_item("name0") is item
+        assert snapshot.items[1] is schema.items[1]
+        assert snapshot != schema
+
+        snapshot.add_group(SchemaGroup("new", "desc"))
+        assert schema.get_group("new") is None
+        assert len(schema.groups) == 3
+
+    def test_tree_hash(self):
+        schema = self.create_schema()
+        schema.build_hashes()
+        snapshot = schema.copy()
+        assert snapshot.tree_hash() == schema.tree_hash()
+
+        snapshot.name = "renamed"
+        assert snapshot.tree_hash() != schema.tree_hash()
+        snapshot.name = schema.name
+        assert snapshot.tree_hash() == schema.tree_hash()
+
+        item = snapshot.update_item(snapshot.items[1], desc="changed")
+        snapshot.update_group(snapshot.groups[2], order=5)
+        assert snapshot.tree_hash() != schema.tree_hash()
+        assert snapshot.changed_items(schema) == [1]
+        assert snapshot.changed_groups(schema) == [2]
+
+        snapshot.update_item(item, desc=schema.items[1].desc)
+        snapshot.update_group(snapshot.groups[2], order=schema.groups[2].order)
+        assert snapshot.tree_hash() == schema.tree_hash()
+
+        # validation errors are not saved
+        snapshot.validate()
+        assert snapshot.tree_hash() == schema.tree_hash()
+
+        snapshot.add_item(SchemaItem("new", "desc", "name0", "", SchemaItemType.str))
+        assert snapshot.changed_items(schema) == [len(schema.items)]
+        assert (
+            snapshot.tree_hash()
+            == schema_factory.from_dict(snapshot.to_dict()).tree_hash()
+        )
+
     def test_get_group_names(self):
         schema = self.create_schema()
         assert schema.get_group_names() == [
@@ -194,6 +279,9 @@ class TestSchema:
             print(error.message)
         assert len(errors) == 0
         assert result
+        assert schema.last_save.bytes_written == os.path.getsize(fn)
+        assert schema.save(fn)
+        assert schema.last_save.skipped
         os.remove(fn)
 
         schema.version = "invalid_version"
@@ -213,6 +301,57 @@ class TestSchema:
         assert len(schema.get_errors()) == 4
         assert not os.path.exists(fn)
 
+    def test_get_item(self):
+        schema = self.create_schema()
+        assert schema.get_item("name1") is schema.items[1]
+        assert schema.get_item("missing") is None
+
+    def test_get_group(self):
+        schema = self.create_schema()
+        assert schema.get_group("name2") is schema.groups[2]
+        assert schema.get_group("missing") is None
+
+    def test_get_group_items(self):
+        schema = self.create_schema()
+        assert schema.get_group_items("name0") == [schema.items[0]]
+        assert schema.get_group_items("missing") == []
+
+    def test_add_and_remove(self):
+        schema = self.create_schema()
+        item = SchemaItem("new", "desc", "name0", "", SchemaItemType.str)
+        schema.add_item(item)
+        assert schema.get_item("new") is item
+        assert schema.get_group_items("name0") == [schema.items[0], item]
+        schema.remove_items(["new", "name0"])
+        assert schema.get_item("new") is None
+        assert schema.get_group_items("name0") == []
+        assert len(schema.items) == 2
+
+        group = SchemaGroup("new", "desc")
+        schema.add_group(group)
+        assert schema.get_group("new") is group
+        schema.remove_groups(["new"])
+        assert schema.get_group("new") is None
+        assert schema.get_group_names() == ["name0", "name1", "name2"]
+
+        schema.items.append(item)
+        assert schema.get_item("new") is item
+
+    def test_update(self):
+        schema = self.create_schema()
+        item = schema.update_item(schema.items[0], name="renamed", group="name1")
+        assert schema.items[0] is item
+        assert item.name == "renamed"
+        assert schema.get_item("name0") is None
+        assert schema.get_item("renamed") is item
+        group_items = schema.get_group_items("name1")
+        assert len(group_items) == 2 and item in group_items
+
+        group = schema.update_group(schema.groups[0], name="renamed", desc="new desc")
+        assert schema.get_group("name0") is None
+        assert schema.get_group("renamed") is group
+        assert group.desc == "new desc"
+
     def test_get_errors(self):
         schema = self.create_schema()
         assert schema.get_errors() == []
@@ -220,6 +359,49 @@ class TestSchema:
         schema.errors.append(error)
         assert schema.get_errors() == [error]
 
+    def test_validate_incremental(self, monkeypatch):
+        schema = self.create_schema()
+        assert schema.validate()
+        assert schema.get_errors() == []
+
+        validated = []
+        validate = SchemaItem.validate
+
+        def spy(item, parent):
+            validated.append(item.name)
+            return validate(item, parent)
+
+        monkeypatch.setattr(SchemaItem, "validate", spy)
+        schema.update_item(
+            schema.items[1], default="not an int", type=SchemaItemType.int
+        )
+        schema.validate()
+        assert validated == ["name1"]
+        assert [error.row for error in schema.get_errors()] == ["name1"]
+
+        validated.clear()
+        schema.update_group(schema.groups[0], name="renamed")
+        schema.validate()
+        assert validated == ["name0"]
+        assert [error.col for error in schema.get_errors()] == ["group", "default"]
+
+        validated.clear()
+        schema.items.append(
+            SchemaItem("new", "desc", "renamed", "", SchemaItemType.str)
+        )
+        schema.validate()
+        assert len(validated) == 4
+
+    def test_validate_snapshot(self):
+        schema = self.create_schema()
+        schema.validate()
+        snapshot = schema.copy()
+        snapshot.update_group(snapshot.groups[0], name="renamed")
+        snapshot.validate()
+        assert len(snapshot.get_errors()) == 1
+        assert schema.get_errors() == []
+        assert snapshot.items[1] is schema.items[1]
+
     def test_validate_name(self):
         schema = self.create_schema()
         schema.validate_name()
@@ -0,0 +1,110 @@
+import os
+import shutil
+
+import pytest
+
+import src.model.cache as schema_cache
+import src.model.config as config_factory
+import src.model.schema as schema_factory
+import src.model.sidecar as sidecar
+from src.model.config import Config
+from test.mocking.schema import MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS
+
+DIR = "test/delete_me_sidecar"
+SCHEMA_FN = os.path.join(DIR, "schema.json")
+
+
+@pytest.fixture
+def files():
+    os.makedirs(DIR, exist_ok=True)
+    assert MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS.save(SCHEMA_FN)
+    yield DIR
+    shutil.rmtree(DIR)
+
+
+def cache_files() -> list:
+    return os.listdir(os.path.join(DIR, sidecar.CACHE_DIR))
+
+
+def no_parsing(monkeypatch) -> None:
+    def fail(*args, **kwargs):
+        raise AssertionError("parsed the JSON file")
+
+    monkeypatch.setattr(schema_factory, "from_json", fail)
+    monkeypatch.setattr(config_factory, "from_dict", fail)
+
+
+def test_schema(files, monkeypatch):
+    schema = sidecar.load_schema(SCHEMA_FN)
+    assert schema == schema_factory.load(SCHEMA_FN)
+    assert len(cache_files()) == 1
+
+    no_parsing(monkeypatch)
+    cached = sidecar.load_schema(SCHEMA_FN)
+    assert cached == schema
+    assert cached.items[0].type is schema.items[0].type
+    assert cached.validate()
+
+
+def test_stale(files):
+    sidecar.load_schema(SCHEMA_FN)
+    schema = schema_factory.load(SCHEMA_FN)
+    schema.version = "2.0.0"
+    assert schema.save(SCHEMA_FN)
+    assert sidecar.load_schema(SCHEMA_FN).version == "2.0.0"
+    assert len(cache_files()) == 2
+
+    # a damaged cache file is rebuilt
+    for name in cache_files():
+        with open(os.path.join(DIR, sidecar.CACHE_DIR, name), "r+b") as f:
+            f.seek(30)
+            f.write(b"\xff\xff\xff")
+    assert sidecar.load_schema(SCHEMA_FN) == schema
+    assert sidecar.load_schema(SCHEMA_FN) == schema
+
+
+def test_config(files, monkeypatch):
+    config = Config("config", "desc", SCHEMA_FN)
+    config.generate_items()
+    config.items[0].value = "changed"
+    full_fn = os.path.join(DIR, "full.json")
+    delta_fn = os.path.join(DIR, "delta.json")
+    assert config.save(full_fn)
+    assert config.save_delta(delta_fn)
+
+    assert sidecar.load_config(full_fn) == config_factory.load(full_fn)
+    assert sidecar.load_config(delta_fn) == config_factory.load(delta_fn)
+    # delta configs depend on their schema and are not cached
+    assert len(cache_files()) == 1
+
+    no_parsing(monkeypatch)
+    cached = sidecar.load_config(full_fn)
+    assert cached.items[0].value == "changed"
+    assert cached.get_item(config.items[0].schema_item.name) is cached.items[0]
+
+
+def test_config_embedded_schema(files, monkeypatch):
+    config = Config("config", "desc", SCHEMA_FN)
+    config.generate_items()
+    full_fn = os.path.join(DIR, "full.json")
+    assert config.save(full_fn)
+    # the schema path no longer loads, the schema embedded in the file is used
+    os.remove(SCHEMA_FN)
+
+    loaded = sidecar.load_config(full_fn)
+    assert loaded.schema == MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS
+    no_parsing(monkeypatch)
+    cached = sidecar.load_config(full_fn)
+    assert cached.schema == loaded.schema
+    assert cached == loaded
+
+
+def test_schema_cache(files, monkeypatch):
+    monkeypatch.setattr(sidecar, "enabled", True)
+    schema_cache.clear()
+    schema_cache.load(SCHEMA_FN)
+    schema_cache.clear()
+    assert len(cache_files()) == 1
+    no_parsing(monkeypatch)
+    assert schema_cache.load(SCHEMA_FN) == MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS
+    schema_cache.clear()
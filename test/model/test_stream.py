@@ -0,0 +1,72 @@
+import io
+import json
+
+import src.model.schema as schema_factory
+import src.model.stream as stream
+from src.model.schema import Schema, SchemaGroup, SchemaItem
+
+
+def test_load():
+    expected = schema_factory.load("test/schema.json")
+    for chunk_size in [1, 7, 1024, stream.CHUNK_SIZE]:
+        schema = stream.load("test/schema.json", chunk_size)
+        assert isinstance(schema, Schema)
+        assert schema == expected
+
+
+def test_iter_items():
+    expected = schema_factory.load("test/schema.json").items
+    items = stream.iter_items("test/schema.json", chunk_size=16)
+    assert not isinstance(items, list)
+    assert list(items) == expected
+
+
+def test_iter_schema():
+    text = json.dumps(
+        [
+            {
+                "version": "0.1.0",
+                "extra": [1, [2, 3]],
+                "groups": [{"name": "g", "desc": "d", "order": 2}],
+                "items": [],
+                "name": "name",
+            }
+        ]
+    )
+    records = list(stream.iter_schema(io.StringIO(text), chunk_size=3))
+    assert records == [
+        ("version", "0.1.0"),
+        ("extra", [1, [2, 3]]),
+        ("groups", SchemaGroup("g", "d", 2)),
+        ("name", "name"),
+    ]
+
+    records = list(stream.iter_schema(io.StringIO(text), groups=False, items=False))
+    assert [key for key, _ in records] == ["version", "extra", "name"]
+
+
+def test_iter_schema_errors():
+    for text in [
+        '{"name": 1,, }',
+        '{"groups": [{"name": "g", "desc": "d"} {}]}',
+        '{"name"',
+    ]:
+        try:
+            list(stream.iter_schema(io.StringIO(text), chunk_size=2))
+            assert False
+        except json.JSONDecodeError:
+            pass
+
+
+def test_iter_schema_items():
+    text = '{"items": [{"name": "a", "desc": "d", "group": "g", "default": 12345, "type": "Integer"}]}'
+    records = list(stream.iter_schema(io.StringIO(text), chunk_size=4))
+    assert len(records) == 1
+    assert isinstance(records[0][1], SchemaItem)
+    assert records[0][1].default == 12345
+
+
+def test_load_table():
+    expected = schema_factory.load("test/schema.json").items
+    table = stream.load_table("test/schema.json", chunk_size=16)
+    assert list(table) == expected
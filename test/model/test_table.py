@@ -0,0 +1,60 @@
+import pytest
+
+import src.model.schema as schema_factory
+import src.model.table as table_factory
+from src.model.schema import SchemaItem, SchemaItemType
+from src.model.table import ItemTable
+
+
+def create_table():
+    return table_factory.from_schema(schema_factory.load("test/schema.json"))
+
+
+class TestItemTable:
+    def test_init(self):
+        schema = schema_factory.load("test/schema.json")
+        table = ItemTable(schema.items)
+        assert len(table) == len(schema.items)
+        assert list(table) == schema.items
+        assert table.names == [item.name for item in schema.items]
+
+    def test_getitem(self):
+        schema = schema_factory.load("test/schema.json")
+        table = ItemTable(schema.items)
+        assert table[0] == schema.items[0]
+        assert table[-1] == schema.items[-1]
+        assert table[1:] == schema.items[1:]
+        with pytest.raises(IndexError):
+            table[len(table)]
+
+    def test_append(self):
+        table = ItemTable()
+        table.append(SchemaItem("a", "desc", "group", "1", SchemaItemType.int))
+        table.append(SchemaItem("b", "desc", "group", "x", SchemaItemType.str, "x y"))
+        assert len(table) == 2
+        assert table.type_of(0) == SchemaItemType.int
+        assert table[1].options == "x y"
+        assert table.groups[0] is table.groups[1]
+        assert table.get("b") == table[1]
+        assert table.get("missing") is None
+
+    def test_lookups(self):
+        schema = schema_factory.load("test/schema.json")
+        table = ItemTable(schema.items)
+        item = schema.items[0]
+        assert table.row(item.name) == 0
+        assert table.get(item.name) == item
+        assert table.in_group(item.group) == schema.get_group_items(item.group)
+
+    def test_read_only(self):
+        table = create_table()
+        item = table[0]
+        item.desc = "changed"
+        assert table[0].desc != "changed"
+
+
+def test_to_schema():
+    schema = schema_factory.load("test/schema.json")
+    header = schema.copy()
+    header.items = []
+    assert table_factory.to_schema(ItemTable(schema.items), header) == schema
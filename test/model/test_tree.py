@@ -0,0 +1,88 @@
+import pytest
+
+import src.model.schema as schema_factory
+from src.model.config import Config
+from src.model.tree import ConfigTree
+
+
+def create_tree() -> ConfigTree:
+    tree = ConfigTree(schema_factory.load("test/input_schema.json"))
+    tree.add("site", values={"name0": "site"})
+    tree.add("project", "site", {"name1": "project"})
+    tree.add("run", "project")
+    tree.add("other_run", "project", {"name0": "other"})
+    return tree
+
+
+class TestConfigTree:
+    def test_add(self):
+        tree = create_tree()
+        assert len(tree) == 4
+        assert "run" in tree
+        assert tree.parent("run") == "project"
+        assert tree.parent("site") is None
+        assert tree.children("project") == ["run", "other_run"]
+        assert tree.overrides("project") == {"name1": "project"}
+        with pytest.raises(ValueError):
+            tree.add("run")
+        with pytest.raises(KeyError):
+            tree.add("orphan", "missing")
+        with pytest.raises(KeyError):
+            tree.add("unknown_item", values={"missing": 1})
+
+    def test_resolve(self):
+        tree = create_tree()
+        assert tree.resolve("run") == {
+            "name0": "site",
+            "name1": "project",
+            "name2": "",
+        }
+        assert tree.get("other_run", "name0") == "other"
+        assert tree.get("site", "name1") == ""
+        with pytest.raises(KeyError, match="Config missing is not in the tree"):
+            tree.get("missing", "name0")
+
+    def test_set_value(self):
+        tree = create_tree()
+        run = tree.resolve("run")
+        other_run = tree.resolve("other_run")
+        tree.set_value("site", "name0", "changed")
+        assert run["name0"] == "changed"
+        assert other_run["name0"] == "other"
+
+        tree.set_value("run", "name1", "run")
+        assert tree.get("run", "name1") == "run"
+        tree.set_value("project", "name1", "changed")
+        assert tree.get("run", "name1") == "run"
+        assert tree.get("other_run", "name1") == "changed"
+
+    def test_unset_value(self):
+        tree = create_tree()
+        tree.resolve("other_run")
+        tree.unset_value("other_run", "name0")
+        assert tree.get("other_run", "name0") == "site"
+        tree.unset_value("site", "name0")
+        assert tree.get("other_run", "name0") == ""
+        tree.unset_value("site", "name0")
+
+    def test_remove(self):
+        tree = create_tree()
+        tree.resolve("run")
+        tree.remove("project")
+        assert tree.parent("run") == "site"
+        assert tree.get("run", "name1") == ""
+        assert "project" not in tree
+
+    def test_configs(self):
+        config = Config("site", "desc", "test/input_schema.json")
+        config.generate_items()
+        config.set_value("name2", "site")
+        tree = ConfigTree(config.schema)
+        tree.add_config(config)
+        tree.add("run", "site", {"name0": "run"})
+
+        run = Config("run", "desc", "test/input_schema.json")
+        run.generate_items()
+        tree.apply("run", run)
+        assert run.get_item("name0").value == "run"
+        assert run.get_item("name2").value == "site"
@@ -0,0 +1,154 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from src.model.config import Config
+from src.model.workspace import Change, Workspace, find_files, schema_path_of
+from test.mocking.schema import MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS
+
+DIR = "test/delete_me_workspace"
+
+
+def touch(path: str) -> None:
+    """Moves the modification time on, as a file written in the same tick may
+    otherwise look unchanged"""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+@pytest.fixture
+def files():
+    os.makedirs(DIR, exist_ok=True)
+    schema_fn = os.path.join(DIR, "schema.json")
+    assert MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS.save(schema_fn)
+    for i in range(2):
+        config = Config(f"config{i}", "desc", schema_fn)
+        config.generate_items()
+        assert config.save_delta(os.path.join(DIR, f"config{i}.json"))
+    yield os.path.realpath(DIR)
+    shutil.rmtree(DIR)
+
+
+def test_find_files(files):
+    assert sorted(os.path.basename(f) for f in find_files([DIR])) == [
+        "config0.json",
+        "config1.json",
+        "schema.json",
+    ]
+    assert schema_path_of(os.path.join(DIR, "config0.json")) == os.path.join(
+        DIR, "schema.json"
+    )
+    assert schema_path_of(os.path.join(DIR, "schema.json")) == ""
+
+
+def test_scan(files):
+    workspace = Workspace(DIR)
+    changes = workspace.scan()
+    assert sorted((os.path.basename(c.path), c.kind, c.action) for c in changes) == [
+        ("config0.json", "config", "added"),
+        ("config1.json", "config", "added"),
+        ("schema.json", "schema", "added"),
+    ]
+    assert len(workspace) == 3
+    assert workspace.dependents(os.path.join(DIR, "schema.json")) == [
+        os.path.join(files, "config0.json"),
+        os.path.join(files, "config1.json"),
+    ]
+    assert workspace.refresh() == []
+
+
+def test_refresh(files):
+    workspace = Workspace(DIR)
+    workspace.scan()
+    events = []
+    unsubscribe = workspace.subscribe(events.append)
+
+    config_fn = os.path.join(DIR, "config0.json")
+    touch(config_fn)
+    assert workspace.refresh() == [
+        Change(os.path.realpath(config_fn), "config", "changed")
+    ]
+
+    # a schema change reloads the configs resolved against it
+    schema_fn = os.path.realpath(os.path.join(DIR, "schema.json"))
+    schema = workspace.schema(schema_fn)
+    schema.version = "9.9.9"
+    assert schema.save(schema_fn)
+    touch(schema_fn)
+    changes = workspace.refresh([schema_fn])
+    assert changes[0] == Change(schema_fn, "schema", "changed")
+    assert sorted(c.path for c in changes[1:]) == workspace.dependents(schema_fn)
+    assert all(c.cause == schema_fn for c in changes[1:])
+    assert workspace.config(config_fn).schema.version == "9.9.9"
+
+    os.remove(config_fn)
+    assert workspace.refresh() == [
+        Change(os.path.realpath(config_fn), "config", "removed")
+    ]
+    assert len(events) == 5
+
+    unsubscribe()
+    touch(schema_fn)
+    workspace.refresh()
+    assert len(events) == 5
+
+
+def test_follow(files):
+    workspace = Workspace(DIR, discover=False)
+    assert workspace.refresh() == []
+    config_fn = os.path.join(DIR, "config0.json")
+    schema_fn = os.path.join(DIR, "schema.json")
+    workspace.config(config_fn)
+    # the config and its schema are followed, not the other files
+    assert workspace.follows(config_fn) and workspace.follows(schema_fn)
+    assert not workspace.follows(os.path.join(DIR, "config1.json"))
+    assert workspace.directories() == {files}
+
+    touch(schema_fn)
+    assert [c.path for c in workspace.refresh()] == [os.path.realpath(config_fn)]
+    assert len(workspace) == 1
+
+
+def test_access(files):
+    workspace = Workspace(DIR)
+    config_fn = os.path.join(DIR, "config0.json")
+    config = workspace.config(config_fn)
+    assert config.name == "config0"
+    # snapshots are independent
+    config.name = "other"
+    assert workspace.config(config_fn).name == "config0"
+
+    with open(config_fn) as f:
+        data = json.load(f)
+    data["name"] = "renamed"
+    with open(config_fn, "w") as f:
+        json.dump(data, f)
+    touch(config_fn)
+    assert workspace.config(config_fn).name == "renamed"
+
+    with pytest.raises(ValueError):
+        workspace.schema(config_fn)
+    with pytest.raises(FileNotFoundError):
+        workspace.config(os.path.join(DIR, "nope.json"))
+
+    with open(config_fn, "w") as f:
+        f.write("{")
+    touch(config_fn)
+    with pytest.raises(json.JSONDecodeError):
+        workspace.config(config_fn)
+    # a file that does not load is not loaded again until it changes
+    changes = workspace.refresh()
+    assert sorted(os.path.basename(c.path) for c in changes) == [
+        "config1.json",
+        "schema.json",
+    ]
+
+
+def test_warm(files):
+    workspace = Workspace(DIR)
+    workspace.scan()
+    assert workspace.warm() == 3
+    assert workspace.schema(os.path.join(DIR, "schema.json")).is_hashed()
+    assert workspace.config(os.path.join(DIR, "config0.json")).is_hashed()
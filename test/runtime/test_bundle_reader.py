@@ -0,0 +1,59 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+import src.runtime.bundle as bundle_reader
+from src.runtime.bundle import Bundle, BundleError
+
+DATA = {
+    "format": bundle_reader.FORMAT,
+    "version": bundle_reader.VERSION,
+    "name": "config",
+    "schema": "schema",
+    "schemaVersion": "1.0.0",
+    "types": {"count": "Integer", "enabled": "Boolean"},
+    "values": {"count": 3, "enabled": True},
+}
+
+
+class TestBundle:
+    def test_init(self):
+        bundle = Bundle(dict(DATA))
+        assert bundle.name == "config"
+        assert bundle.schema == "schema"
+        assert bundle.schema_version == "1.0.0"
+        assert bundle.types["count"] == "Integer"
+        assert len(bundle) == 2
+        assert dict(bundle) == {"count": 3, "enabled": True}
+        assert "count" in bundle
+        assert bundle.get("missing") is None
+
+    def test_read_only(self):
+        bundle = Bundle(dict(DATA))
+        with pytest.raises(TypeError):
+            bundle["count"] = 4  # type: ignore[index]
+        with pytest.raises(TypeError):
+            bundle.types["count"] = "Float"  # type: ignore[index]
+
+    def test_format(self):
+        with pytest.raises(BundleError):
+            Bundle({**DATA, "format": "other"})
+        with pytest.raises(BundleError):
+            Bundle({**DATA, "version": bundle_reader.VERSION + 1})
+
+
+def test_loads():
+    assert bundle_reader.loads(json.dumps(DATA))["count"] == 3
+
+
+def test_no_heavy_imports():
+    code = (
+        "import sys, src.runtime.bundle; "
+        "print([m for m in ('dash', 'pandas', 'dataclass_wizard') if m in sys.modules])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
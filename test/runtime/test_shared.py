@@ -0,0 +1,71 @@
+import os
+from multiprocessing import Pool
+
+import pytest
+
+import src.runtime.shared as shared
+from src.runtime.shared import Publisher, SharedBundleError
+
+NAME = f"configtree_test_{os.getpid()}"
+
+BUNDLE = {
+    "name": "config",
+    "schema": "schema",
+    "schemaVersion": "1.0.0",
+    "types": {"count": "Integer", "ratio": "Float", "enabled": "Boolean"},
+    "values": {
+        "count": 3,
+        "ratio": 0.5,
+        "enabled": True,
+        "text": "héllo",
+        "unset": None,
+        "big": 2**70,
+    },
+}
+
+
+def read(name: str) -> dict:
+    with shared.attach(name) as bundle:
+        return dict(bundle)
+
+
+class TestSharedBundle:
+    def test_attach(self):
+        with Publisher(NAME) as publisher:
+            assert publisher.publish(BUNDLE) == 1
+            with shared.attach(NAME) as bundle:
+                assert dict(bundle) == BUNDLE["values"]
+                assert bundle.version == 1
+                assert bundle.bundle_name == "config"
+                assert bundle.schema_version == "1.0.0"
+                assert bundle.types["count"] == "Integer"
+                assert "count" in bundle
+                assert len(bundle) == 6
+
+    def test_versions(self):
+        with Publisher(NAME) as publisher:
+            publisher.publish(BUNDLE)
+            bundle = shared.attach(NAME)
+            assert not bundle.is_stale()
+            assert not bundle.refresh()
+
+            publisher.publish({**BUNDLE, "values": {"count": 4}})
+            assert bundle.is_stale()
+            assert bundle["count"] == 3
+            assert bundle.refresh()
+            assert bundle["count"] == 4
+            assert bundle.version == 2
+            bundle.close()
+
+    def test_workers(self):
+        with Publisher(NAME) as publisher:
+            publisher.publish(BUNDLE)
+            with Pool(2) as pool:
+                assert pool.map(read, [NAME] * 2) == [BUNDLE["values"]] * 2
+
+    def test_errors(self):
+        with pytest.raises(SharedBundleError):
+            shared.attach(NAME)
+        with Publisher(NAME):
+            with pytest.raises(SharedBundleError):
+                shared.attach(NAME)
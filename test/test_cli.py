@@ -0,0 +1,81 @@
+import io
+import os
+import shutil
+
+import src.cli as cli
+import src.runtime.bundle as bundle_reader
+from src.model.config import Config
+from test.mocking.schema import MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS
+
+DIR = "test/delete_me_cli"
+
+
+def create_files() -> None:
+    os.makedirs(DIR, exist_ok=True)
+    schema_fn = os.path.join(DIR, "schema.json")
+    assert MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS.save(schema_fn)
+    for i in range(4):
+        config = Config(f"config{i}", "desc", schema_fn)
+        config.generate_items()
+        assert config.save_delta(os.path.join(DIR, f"config{i}.json"))
+    with open(os.path.join(DIR, "broken.json"), "w") as f:
+        f.write("{")
+    with open(os.path.join(DIR, "missing.json"), "w") as f:
+        f.write('{"format": "delta", "name": "n", "desc": "d", "schemaPath": "nope"}')
+
+
+def run(*args: str) -> tuple:
+    out = io.StringIO()
+    status = cli.main(["validate", *args], out)
+    return status, out.getvalue()
+
+
+def test_validate():
+    create_files()
+    try:
+        status, output = run(os.path.join(DIR, "schema.json"), "-j", "1")
+        assert status == 0
+        assert output == "1 files checked, 0 invalid\n"
+
+        status, output = run(DIR, "-j", "1")
+        assert status == 1
+        lines = output.splitlines()
+        assert lines[0].startswith(f"{DIR}/broken.json: JSONDecodeError")
+        assert lines[1].startswith(f"{DIR}/missing.json: FileNotFoundError")
+        assert lines[-1] == "7 files checked, 2 invalid"
+
+        assert run(DIR, "-j", "2") == (status, output)
+    finally:
+        shutil.rmtree(DIR)
+
+
+def test_validate_file():
+    result = cli.validate_file("test/schema.json")
+    assert result.kind == "schema"
+    assert result.errors == []
+
+
+def test_find_files():
+    create_files()
+    try:
+        files = cli.find_files([DIR, "test/schema.json"])
+        assert len(files) == 8
+        assert "test/schema.json" in files
+    finally:
+        shutil.rmtree(DIR)
+
+
+def test_compile():
+    create_files()
+    try:
+        config_fn = os.path.join(DIR, "config0.json")
+        bundle_fn = os.path.join(DIR, "config0.bundle")
+        assert cli.main(["compile", config_fn, bundle_fn], io.StringIO()) == 0
+        assert bundle_reader.load(bundle_fn).name == "config0"
+
+        out = io.StringIO()
+        missing_fn = os.path.join(DIR, "missing.json")
+        assert cli.main(["compile", missing_fn, bundle_fn], out) == 1
+        assert out.getvalue().startswith(f"{missing_fn}: ")
+    finally:
+        shutil.rmtree(DIR)
@@ -0,0 +1,125 @@
+import http.client
+import os
+import shutil
+import threading
+import time
+
+import pytest
+
+import src.service as service
+from src.model.config import Config
+from src.runtime.client import ConfigClient, ServiceError
+from test.mocking.schema import MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS
+
+DIR = "test/delete_me_service"
+
+
+def create_files() -> Config:
+    os.makedirs(DIR, exist_ok=True)
+    schema_fn = os.path.join(DIR, "schema.json")
+    assert MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS.save(schema_fn)
+    config = Config("config", "desc", schema_fn)
+    config.generate_items()
+    assert config.save(os.path.join(DIR, "config.json"))
+    return config
+
+
+def touch(config: Config, value: str) -> None:
+    """Changes a config file, making sure its modification time changes too"""
+    name = config.items[0].schema_item.name
+    config.set_value(name, value)
+    fn = os.path.join(DIR, "config.json")
+    assert config.save(fn)
+    os.utime(fn, ns=(time.time_ns(), time.time_ns() + 10**9))
+
+
+@pytest.fixture
+def files():
+    config = create_files()
+    yield config
+    shutil.rmtree(DIR)
+
+
+def start(address: str) -> service.ServiceServer:
+    server = service.make_server(service.ConfigService(DIR), address)
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    return server
+
+
+def test_get(files):
+    configs = service.ConfigService(DIR)
+    entry = configs.get("config.json")
+    assert configs.get("config.json") is entry
+    assert (configs.hits, configs.misses) == (1, 1)
+    assert entry.etag.startswith('"')
+
+    touch(files, "other")
+    changed = configs.get("config.json")
+    assert changed.etag != entry.etag
+    assert configs.misses == 2
+
+    with pytest.raises(FileNotFoundError):
+        configs.get("nope.json")
+    with pytest.raises(FileNotFoundError):
+        configs.get("../test_cli.py")
+
+
+def test_http(files):
+    server = start("127.0.0.1:0")
+    try:
+        connection = http.client.HTTPConnection(*server.server_address)
+        connection.request("GET", "/configs/config.json")
+        response = connection.getresponse()
+        body = response.read()
+        etag = response.getheader("ETag")
+        assert response.status == 200
+        assert b'"name":"config"' in body
+
+        # the same connection is reused
+        connection.request(
+            "GET", "/configs/config.json", headers={"If-None-Match": etag}
+        )
+        response = connection.getresponse()
+        assert response.read() == b""
+        assert response.status == 304
+
+        touch(files, "other")
+        connection.request(
+            "GET", "/configs/config.json", headers={"If-None-Match": etag}
+        )
+        response = connection.getresponse()
+        response.read()
+        assert response.status == 200
+        assert response.getheader("ETag") != etag
+
+        connection.request("GET", "/configs/schema.json")
+        response = connection.getresponse()
+        response.read()
+        assert response.status == 422
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_client(files):
+    address = os.path.join(DIR, "service.sock")
+    server = start(address)
+    try:
+        with ConfigClient(address) as client:
+            bundle = client.get("config.json")
+            assert bundle.name == "config"
+            assert client.get("config.json") is bundle
+
+            touch(files, "other")
+            changed = client.get("config.json")
+            assert changed is not bundle
+            assert "other" in changed.values()
+
+            with pytest.raises(ServiceError) as e:
+                client.get("nope.json")
+            assert e.value.status == 404
+        assert server.service.misses == 2
+    finally:
+        server.shutdown()
+        server.server_close()
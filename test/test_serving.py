@@ -0,0 +1,87 @@
+import gzip
+import os
+import shutil
+
+import flask
+from dash import Dash, html
+
+import src.serving as serving
+from src.model.workspace import Workspace
+from test.mocking.schema import MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS
+
+ASSETS = os.path.abspath("assets")
+TEXT = "configtree " * 100
+
+
+def make_app() -> flask.Flask:
+    app = flask.Flask(__name__, static_folder=ASSETS, static_url_path="/assets")
+    serving.compress(app)
+    serving.cache_assets(app)
+
+    @app.route("/text")
+    def text():
+        return TEXT
+
+    @app.route("/small")
+    def small():
+        return "small"
+
+    return app
+
+
+def test_compress():
+    client = make_app().test_client()
+    response = client.get("/text", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert gzip.decompress(response.data).decode() == TEXT
+
+    response = client.get("/text")
+    assert "Content-Encoding" not in response.headers
+    assert response.get_data(as_text=True) == TEXT
+
+    response = client.get("/text", headers={"Accept-Encoding": "gzip;q=0"})
+    assert "Content-Encoding" not in response.headers
+
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+
+
+def test_static_files():
+    client = make_app().test_client()
+    with open(os.path.join(ASSETS, "dashAgGridFunctions.js"), "rb") as f:
+        data = f.read()
+    for _ in range(2):
+        response = client.get(
+            "/assets/dashAgGridFunctions.js?m=1", headers={"Accept-Encoding": "gzip"}
+        )
+        assert response.status_code == 200
+        assert gzip.decompress(response.data) == data
+        assert response.headers["ETag"].startswith("W/")
+        assert "immutable" in response.headers["Cache-Control"]
+        assert "Accept-Ranges" not in response.headers
+
+    response = client.get("/assets/style.css")
+    assert response.cache_control.max_age == serving.ASSET_MAX_AGE
+    assert response.cache_control.public
+
+
+def test_preload():
+    directory = "test/delete_me_serving"
+    os.makedirs(os.path.join(directory, "sub"), exist_ok=True)
+    try:
+        for name in ("schema.json", "other.json", "sub/more.json"):
+            assert MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS.save(os.path.join(directory, name))
+        app = Dash(__name__)
+        app.layout = html.Div()
+
+        # only the documents asked for
+        workspace = Workspace(directory, discover=False)
+        paths = [os.path.join(directory, "schema.json"), os.path.join(directory, "sub")]
+        assert serving.preload(app, workspace, paths) == 2
+        assert os.path.join(directory, "other.json") not in workspace
+
+        # or every document of a workspace that discovers them
+        assert serving.preload(app, Workspace(directory)) == 3
+    finally:
+        shutil.rmtree(directory)
@@ -0,0 +1,172 @@
+import os
+import shutil
+
+import flask
+import pytest
+
+import src.sessions as sessions
+from src.app_state import EditorState, Root, store, workspace
+from src.sessions import SessionStore
+from test.mocking.schema import MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS
+
+DIR = "test/delete_me_sessions"
+SESSION_A = "a" * 32
+SESSION_B = "b" * 32
+
+
+@pytest.fixture
+def directory():
+    os.makedirs(DIR, exist_ok=True)
+    assert MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS.save(os.path.join(DIR, "schema.json"))
+    yield DIR
+    shutil.rmtree(DIR)
+
+
+def edit(state: EditorState, filename: str) -> None:
+    """Loads a schema into a session and edits it, like the schema editor"""
+    state.schema_filename = filename
+    state.schema = MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS.copy()
+    state.schema.build_hashes()
+    state.next_schema = state.schema.copy()
+    state.next_schema.update_item(state.next_schema.get_item("name0"), desc="edited")
+    state.next_schema.name = "renamed"
+
+
+def test_sessions_are_separate():
+    sessions = SessionStore(EditorState)
+    sessions.get(SESSION_A).schema_filename = "a.json"
+    assert sessions.get(SESSION_B).schema_filename is None
+    assert sessions.get(SESSION_A).schema_filename == "a.json"
+    # and keeps its own caches
+    cache = sessions.get(SESSION_A).cache("rows", dict)
+    assert sessions.get(SESSION_A).cache("rows", dict) is cache
+    assert sessions.get(SESSION_B).cache("rows", dict) is not cache
+
+
+def test_lru_eviction():
+    sessions = SessionStore(EditorState, max_sessions=2)
+    sessions.get("1")
+    sessions.get("2")
+    sessions.get("1")
+    sessions.get("3")
+    assert "1" in sessions and "3" in sessions
+    assert "2" not in sessions
+
+    sessions = SessionStore(EditorState, idle_seconds=0)
+    sessions.get("1")
+    sessions.get("2")
+    assert len(sessions) == 1
+
+
+def test_memory_accounting():
+    sessions = SessionStore(EditorState, max_bytes=1)
+    edit(sessions.get(SESSION_A), "schema.json")
+    sessions.commit(SESSION_A)
+    # only the edited item and the item list are held by the session alone
+    assert 0 < sessions.memory() < 2000
+    assert sessions.stats()[0]["bytes"] == sessions.memory()
+
+    sessions.get(SESSION_B)
+    assert SESSION_A not in sessions
+    assert SESSION_B in sessions
+
+
+def test_session_files(directory):
+    filename = os.path.join(directory, "schema.json")
+    writer = SessionStore(EditorState, os.path.join(directory, "sessions"))
+    edit(writer.get(SESSION_A), filename)
+    writer.commit(SESSION_A)
+
+    # another process reads the session from its file
+    reader = SessionStore(EditorState, os.path.join(directory, "sessions"))
+    state = reader.get(SESSION_A)
+    assert state.next_schema.name == "renamed"
+    assert state.next_schema.get_item("name0").desc == "edited"
+    assert state.schema.tree_hash() == MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS.tree_hash()
+
+    # and sees later changes to it
+    state.next_schema.name = "again"
+    reader.commit(SESSION_A)
+    assert writer.get(SESSION_A, refresh=True).next_schema.name == "again"
+
+
+def test_prune_files(directory):
+    filename = os.path.join(directory, "schema.json")
+    sessions_dir = os.path.join(directory, "sessions")
+    store = SessionStore(EditorState, sessions_dir, idle_seconds=0)
+    for session_id in (SESSION_A, SESSION_B):
+        edit(store.get(session_id), filename)
+        store.commit(session_id)
+    # a request of session A holds its lock
+    fd = store._lock_file(SESSION_A)
+    assert sorted(os.listdir(sessions_dir)) == [
+        SESSION_A + ".json",
+        SESSION_A + ".lock",
+        SESSION_B + ".json",
+    ]
+
+    assert store.prune_files() == 1
+    assert sorted(os.listdir(sessions_dir)) == [
+        SESSION_A + ".json",
+        SESSION_A + ".lock",
+    ]
+    os.close(fd)
+    assert store.prune_files() == 1
+    assert os.listdir(sessions_dir) == []
+
+
+def test_file_changed_on_disk(directory):
+    filename = os.path.join(directory, "schema.json")
+    state = store.get(SESSION_A)
+    state.schema_filename = filename
+    state.schema = workspace.schema(filename)
+    state.loaded("schema")
+
+    # the session's own save is not a change
+    schema = MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS.copy()
+    schema.version = "9.9.9"
+    assert schema.save(filename)
+    state.loaded("schema")
+    workspace.refresh([filename])
+    assert not state.schema_changed_on_disk
+
+    # another one is
+    schema.version = "8.8.8"
+    assert schema.save(filename)
+    st = os.stat(filename)
+    os.utime(filename, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    workspace.refresh([filename])
+    assert state.schema_changed_on_disk
+    assert EditorState.from_dict(state.to_dict()).schema_changed_on_disk
+
+    state.loaded("schema")
+    assert not state.schema_changed_on_disk
+    store.discard(SESSION_A)
+
+
+def test_requests():
+    app = flask.Flask(__name__)
+    store.init_app(app)
+
+    @app.route("/_dash-update-component", methods=["POST"])
+    def update():
+        if Root.schema_filename is None:
+            Root.schema_filename = flask.request.get_data(as_text=True)
+        return Root.schema_filename
+
+    client = app.test_client()
+    response = client.post("/_dash-update-component", data="a.json")
+    assert response.get_data(as_text=True) == "a.json"
+    cookie = client.get_cookie(sessions.COOKIE)
+    assert cookie is not None and cookie.http_only
+
+    # the same browser keeps its state, another one gets its own
+    response = client.post("/_dash-update-component", data="b.json")
+    assert response.get_data(as_text=True) == "a.json"
+    response = app.test_client().post("/_dash-update-component", data="b.json")
+    assert response.get_data(as_text=True) == "b.json"
+
+    # outside a request, Root is the local session
+    assert store.current() is store.get(sessions.LOCAL)
+    assert store.current() is not store.get(cookie.value)
+    store.discard(cookie.value)
@@ -0,0 +1,91 @@
+import os
+import shutil
+import threading
+
+import pytest
+
+import src.watch as watch
+from src.model.workspace import Workspace
+from test.mocking.schema import MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS
+
+DIR = "test/delete_me_watch"
+
+
+@pytest.fixture
+def workspace():
+    os.makedirs(DIR, exist_ok=True)
+    assert MOCK_SCHEMA_WITH_GROUPS_AND_ITEMS.save(os.path.join(DIR, "schema.json"))
+    workspace = Workspace(DIR)
+    workspace.scan()
+    yield workspace
+    shutil.rmtree(DIR)
+
+
+def wait_for_changes(workspace: Workspace, fn, count: int) -> list:
+    """Runs fn and waits until the workspace reported `count` changes"""
+    changes = []
+    done = threading.Event()
+
+    def on_change(change) -> None:
+        changes.append(change)
+        if len(changes) >= count:
+            done.set()
+
+    unsubscribe = workspace.subscribe(on_change)
+    fn()
+    assert done.wait(5)
+    unsubscribe()
+    return changes
+
+
+def write_files(workspace: Workspace) -> None:
+    schema = workspace.schema(os.path.join(DIR, "schema.json"))
+    os.makedirs(os.path.join(DIR, "sub"))
+    assert schema.save(os.path.join(DIR, "sub", "other.json"))
+    os.remove(os.path.join(DIR, "schema.json"))
+
+
+WATCHERS = [
+    watch.InotifyWatcher,
+    lambda workspace: watch.PollingWatcher(workspace, 0.05),
+]
+
+
+@pytest.mark.parametrize("watcher", WATCHERS)
+def test_watch(workspace, watcher):
+    with watcher(workspace).start():
+        changes = wait_for_changes(workspace, lambda: write_files(workspace), 2)
+    assert sorted((os.path.basename(c.path), c.action) for c in changes) == [
+        ("other.json", "added"),
+        ("schema.json", "removed"),
+    ]
+
+
+@pytest.mark.parametrize("watcher", WATCHERS)
+def test_watch_followed(workspace, watcher):
+    # a workspace that only follows the files it loaded
+    followed = Workspace(DIR, discover=False)
+    schema_fn = os.path.join(DIR, "schema.json")
+    schema = followed.schema(schema_fn)
+    schema.version = "9.9.9"
+
+    def write() -> None:
+        assert schema.save(os.path.join(DIR, "other.json"))
+        assert schema.save(schema_fn)
+
+    with watcher(followed).start():
+        changes = wait_for_changes(followed, write, 1)
+    assert [(os.path.basename(c.path), c.action) for c in changes] == [
+        ("schema.json", "changed")
+    ]
+    assert len(followed) == 1
+
+
+def test_watcher_is_abstract(workspace):
+    with pytest.raises(TypeError):
+        watch.Watcher(workspace)  # type: ignore[abstract]
+
+
+def test_start(workspace):
+    watcher = watch.start(workspace)
+    watcher.stop()